@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Agentic UI Benchmark - index build, query latency, memory and cold start
+
+Runs offline against synthetic catalogs (see synthetic.py). Each size is
+measured in its own worker process pointed at the catalog through
+$AGENTIC_UI_DATA_DIR, so peak RSS and caches never leak between sizes.
+
+Per size it records:
+    build      streaming BM25.fit over components.csv (single process and sharded over
+               one worker per CPU), full warm() (parse + fit every domain,
+               federated index, rules), build_snapshot(), warm() from the snapshot
+    latency    p50/p95/p99 per call of BM25.score, BM25.top_k, search(domain),
+               search() with routing, search_all, match_reasoning_rule and
+               DesignSystemGenerator.generate (result cache off), and search()
+               answered from the result cache
+    memory     peak RSS of the worker
+    cold start median wall time of `search.py QUERY -d component` in a fresh
+               interpreter, without and with the snapshot
+
+Usage:
+    python bench.py                              # 10, 1k, 100k 三档
+    python bench.py --sizes 10,1k,100k,1m        # 包含 100 万行 (耗时较长)
+    python bench.py --save results.json          # 保存机器可读结果
+    python bench.py --baseline results.json      # 与基线比较 (回退超过阈值时退出码为 1)
+"""
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import synthetic
+
+# ============ CONFIGURATION ============
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent / "scripts"
+DEFAULT_SIZES = "10,1k,100k"
+QUERY_COUNT = 200          # queries per operation ...
+OPERATION_BUDGET = 10.0    # ... or fewer, once an operation has run this many seconds
+MIN_CALLS = 5
+COLD_START_RUNS = 3
+REGRESSION_THRESHOLD = 0.25
+# Changes smaller than this are timer noise, whatever the ratio
+NOISE_FLOOR = {"_ms": 0.05, "_s": 0.005}
+
+
+def percentiles(samples: List[float]) -> Dict[str, float]:
+    """p50/p95/p99 (nearest rank) and mean of per-call times, in milliseconds"""
+    ordered = sorted(samples)
+    pick = lambda p: ordered[min(len(ordered) - 1, max(0, int(round(p / 100 * len(ordered))) - 1))]
+    return {"calls": len(ordered), "p50_ms": pick(50) * 1000, "p95_ms": pick(95) * 1000,
+            "p99_ms": pick(99) * 1000, "mean_ms": statistics.fmean(ordered) * 1000}
+
+
+def time_calls(fn: Callable[[str], Any], queries: List[str]) -> Dict[str, float]:
+    samples = []
+    started = time.perf_counter()
+    for query in queries:
+        t = time.perf_counter()
+        fn(query)
+        samples.append(time.perf_counter() - t)
+        if len(samples) >= MIN_CALLS and time.perf_counter() - started > OPERATION_BUDGET:
+            break
+    return percentiles(samples)
+
+
+def timed(fn: Callable[[], Any]) -> float:
+    t = time.perf_counter()
+    fn()
+    return time.perf_counter() - t
+
+
+def _peak_rss_mb() -> Optional[float]:
+    try:
+        import resource
+    except ImportError:  # not available on Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+# ============ WORKER ============
+def run_worker(rows: int, seed: int) -> Dict[str, Any]:
+    """Measure build and query costs in this process (AGENTIC_UI_DATA_DIR is set by the parent)"""
+    sys.path.insert(0, str(SCRIPTS_DIR))
+    import core
+    from design_system import DesignSystemGenerator
+
+    config = core.CSV_CONFIG["component"]
+    components = core.DATA_DIR / config["file"]
+    workload = synthetic.queries(QUERY_COUNT, seed)
+
+    # Latencies measure the computation; the cached path is timed separately below
+    core.configure_result_cache(max_entries=0)
+    build: Dict[str, float] = {}
+    bm25 = core.BM25()
+    # Streaming build: rows are read, analyzed and indexed one at a time
+    build["fit_s"] = timed(lambda: bm25.fit(core._documents(core.iter_csv(components), config["search_cols"])))
+    workers = max(2, os.cpu_count() or 1)
+    build["fit_parallel_s"] = timed(lambda: core.BM25().fit(
+        core._documents(core.iter_csv(components), config["search_cols"]), workers=workers))
+    del bm25
+
+    build["warm_s"] = timed(core.warm)
+    build["snapshot_s"] = timed(core.build_snapshot)
+    build["snapshot_bytes"] = core.SNAPSHOT_FILE.stat().st_size
+    core.invalidate()
+    build["warm_snapshot_s"] = timed(core.warm)
+
+    index = core._domain_index(components, config["search_cols"])
+    generator = DesignSystemGenerator()
+    operations = {
+        "bm25.score": lambda q: index.bm25.score(q),
+        "bm25.top_k": lambda q: index.bm25.top_k(q, core.MAX_RESULTS),
+        "search": lambda q: core.search(q, "component"),
+        "search.routed": lambda q: core.search(q),
+        "search_all": core.search_all,
+        "match_reasoning_rule": core.match_reasoning_rule,
+        "generate": generator.generate,
+    }
+    latency = {name: time_calls(fn, workload) for name, fn in operations.items()}
+    core.configure_result_cache()
+    repeated = workload[:QUERY_COUNT // 4]
+    for query in repeated:
+        core.search(query)
+    latency["search.cached"] = time_calls(core.search, repeated)
+    return {"rows": rows, "build": build, "latency": latency, "peak_rss_mb": _peak_rss_mb()}
+
+
+# ============ DRIVER ============
+def _cold_start(data_dir: Path, query: str) -> float:
+    """Median wall time (ms) of one CLI search in a fresh interpreter"""
+    env = dict(os.environ, AGENTIC_UI_DATA_DIR=str(data_dir))
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    command = [sys.executable, str(SCRIPTS_DIR / "search.py"), query, "-d", "component", "-f", "json"]
+    samples = []
+    for _ in range(COLD_START_RUNS):
+        t = time.perf_counter()
+        subprocess.run(command, env=env, stdout=subprocess.DEVNULL, check=True)
+        samples.append((time.perf_counter() - t) * 1000)
+    return statistics.median(samples)
+
+
+def measure_size(size: str, seed: int, workdir: Path) -> Dict[str, Any]:
+    rows = synthetic.parse_size(size)
+    data_dir = workdir / f"catalog-{size}"
+    generate_s = timed(lambda: synthetic.generate(rows, data_dir, seed))
+    query = synthetic.queries(1, seed)[0]
+
+    cold = {"no_snapshot_ms": _cold_start(data_dir, query)}
+    env = dict(os.environ, AGENTIC_UI_DATA_DIR=str(data_dir))
+    proc = subprocess.run([sys.executable, str(Path(__file__).resolve()), "--worker", str(rows),
+                           "--seed", str(seed)], env=env, stdout=subprocess.PIPE, check=True, text=True)
+    result = json.loads(proc.stdout)
+    # The worker left a fresh snapshot in the catalog directory
+    cold["snapshot_ms"] = _cold_start(data_dir, query)
+
+    result["size"] = size
+    result["generate_s"] = generate_s
+    result["cold_start"] = cold
+    return result
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """Regressions (build times, p50/p95 latency, cold start) beyond `threshold`"""
+    regressions = []
+    for size, result in results["sizes"].items():
+        base = baseline.get("sizes", {}).get(size)
+        if not base:
+            continue
+        pairs = [(f"build.{k}", v, base["build"].get(k)) for k, v in result["build"].items() if k.endswith("_s")]
+        for op, stats in result["latency"].items():
+            base_stats = base["latency"].get(op, {})
+            pairs += [(f"{op}.{p}", stats[p], base_stats.get(p)) for p in ("p50_ms", "p95_ms")]
+        pairs += [(f"cold_start.{k}", v, base["cold_start"].get(k)) for k, v in result["cold_start"].items()]
+        for metric, value, old in pairs:
+            floor = NOISE_FLOOR["_ms" if metric.endswith("_ms") else "_s"]
+            if old and value > old * (1 + threshold) and value - old > floor:
+                regressions.append(f"[{size}] {metric}: {old:.4g} -> {value:.4g} (+{(value / old - 1) * 100:.0f}%)")
+    return regressions
+
+
+def format_report(results: Dict[str, Any]) -> str:
+    lines = [f"Agentic UI benchmark ({results['python']}, seed {results['seed']})"]
+    for size, r in results["sizes"].items():
+        b, c = r["build"], r["cold_start"]
+        rss = f"{r['peak_rss_mb']:.0f} MB" if r["peak_rss_mb"] is not None else "n/a"
+        lines.append("")
+        lines.append(f"== {size} rows: fit {b['fit_s']:.3f}s (sharded {b.get('fit_parallel_s', 0):.3f}s) | warm {b['warm_s']:.3f}s | "
+                     f"snapshot {b['snapshot_s']:.3f}s ({b['snapshot_bytes'] / 1e6:.1f} MB) | "
+                     f"warm from snapshot {b['warm_snapshot_s']:.3f}s | peak RSS {rss}")
+        lines.append(f"   cold start: {c['no_snapshot_ms']:.0f} ms, with snapshot {c['snapshot_ms']:.0f} ms")
+        lines.append(f"   {'operation':<22}{'calls':>7}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+        for op, s in r["latency"].items():
+            lines.append(f"   {op:<22}{s['calls']:>7}{s['p50_ms']:>10.3f}{s['p95_ms']:>10.3f}{s['p99_ms']:>10.3f}")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline benchmark for core and design_system")
+    parser.add_argument("--sizes", type=str, default=DEFAULT_SIZES,
+                        help=f"Comma-separated catalog sizes (default: {DEFAULT_SIZES}; 1m is also available)")
+    parser.add_argument("--seed", type=int, default=synthetic.DEFAULT_SEED, help="Catalog and workload seed")
+    parser.add_argument("--json", action="store_true", help="Print machine-readable results")
+    parser.add_argument("--save", type=str, default=None, metavar="FILE", help="Write results to FILE")
+    parser.add_argument("--baseline", type=str, default=None, metavar="FILE",
+                        help="Compare against saved results; exit 1 on regressions")
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD,
+                        help=f"Allowed slowdown before failing (default: {REGRESSION_THRESHOLD})")
+    parser.add_argument("--keep", type=str, default=None, metavar="DIR",
+                        help="Generate catalogs in DIR and keep them (default: temporary directory)")
+    parser.add_argument("--worker", type=int, default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker is not None:
+        print(json.dumps(run_worker(args.worker, args.seed)))
+        return
+
+    workdir = Path(args.keep) if args.keep else Path(tempfile.mkdtemp(prefix="agentic-ui-bench-"))
+    try:
+        results = {
+            "python": f"{sys.implementation.name} {sys.version.split()[0]}",
+            "seed": args.seed,
+            "sizes": {size: measure_size(size, args.seed, workdir)
+                      for size in (s.strip() for s in args.sizes.split(",")) if size},
+        }
+    finally:
+        if not args.keep:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    regressions: List[str] = []
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            regressions = compare(results, json.load(f), args.threshold)
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+
+    print(json.dumps(results, ensure_ascii=False, indent=2) if args.json else format_report(results))
+    if regressions:
+        print("\nRegressions:\n  " + "\n  ".join(regressions), file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
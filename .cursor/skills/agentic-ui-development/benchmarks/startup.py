@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Agentic UI Startup Benchmark - cold-start cost of each search.py subcommand
+
+Every subcommand is run in a fresh interpreter with ``-X importtime``; the
+report lists the median wall time, the median time spent importing and the
+heaviest imports. Modules a subcommand is not supposed to load (e.g.
+design_system for a plain lookup) are reported as violations.
+
+Usage:
+    python startup.py                          # 打印各子命令的冷启动耗时
+    python startup.py --runs 15 --json         # JSON 输出
+    python startup.py --save baseline.json     # 保存基线
+    python startup.py --baseline baseline.json # 与基线比较 (回退超过阈值时退出码为 1)
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+# ============ CONFIGURATION ============
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent / "scripts"
+SEARCH_SCRIPT = SCRIPTS_DIR / "search.py"
+DEFAULT_RUNS = 7
+REGRESSION_THRESHOLD = 0.20   # 20% slower than the baseline fails --baseline
+
+# name -> (search.py arguments, modules the command must not import)
+SUBCOMMANDS = {
+    "search": (["chat bubble", "--domain", "hook"], ["design_system", "datetime", "subprocess", "tempfile"]),
+    "search-all": (["chat bubble"], ["design_system", "datetime", "subprocess", "tempfile"]),
+    "recommend": (["ai chat assistant", "--recommend"], ["design_system", "datetime", "subprocess"]),
+    "design-system": (["ai chat assistant", "--design-system"], ["subprocess"]),
+}
+
+
+def _parse_importtime(stderr: str) -> Dict[str, Any]:
+    """Import records from -X importtime output: total µs and top-level modules"""
+    imports: Dict[str, int] = {}
+    top_level: Dict[str, int] = {}
+    total = 0
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative, name = line[len("import time:"):].split("|")
+        if not self_us.strip().isdigit():
+            continue  # header line
+        module = name.rstrip()
+        depth = (len(module) - len(module.lstrip())) // 2
+        module = module.strip()
+        imports[module] = int(cumulative)
+        total += int(self_us)
+        if depth == 0:
+            top_level[module] = int(cumulative)
+    return {"total_us": total, "modules": imports, "top_level": top_level}
+
+
+def run_once(args: List[str]) -> Dict[str, Any]:
+    """One cold start: wall time and import profile of `search.py args`"""
+    env = dict(os.environ)
+    env.pop("PYTHONDONTWRITEBYTECODE", None)   # measure the usual .pyc-backed start
+    start = time.perf_counter()
+    proc = subprocess.run([sys.executable, "-X", "importtime", str(SEARCH_SCRIPT)] + args,
+                          cwd=str(SCRIPTS_DIR), env=env, stdout=subprocess.DEVNULL,
+                          stderr=subprocess.PIPE, text=True)
+    wall = time.perf_counter() - start
+    if proc.returncode != 0:
+        raise RuntimeError(f"search.py {' '.join(args)} exited with {proc.returncode}")
+    record = _parse_importtime(proc.stderr)
+    record["wall_ms"] = wall * 1000
+    return record
+
+
+def measure(name: str, runs: int) -> Dict[str, Any]:
+    """Median cold-start figures for one subcommand (after one warm-up run)"""
+    args, forbidden = SUBCOMMANDS[name]
+    run_once(args)   # writes .pyc files and warms the OS file cache
+    records = [run_once(args) for _ in range(runs)]
+    last = records[-1]
+    heaviest = sorted(last["top_level"].items(), key=lambda x: -x[1])[:5]
+    return {
+        "args": args,
+        "runs": runs,
+        "wall_ms": statistics.median(r["wall_ms"] for r in records),
+        "import_ms": statistics.median(r["total_us"] for r in records) / 1000,
+        "modules": len(last["modules"]),
+        "heaviest": [{"module": m, "ms": us / 1000} for m, us in heaviest],
+        "violations": sorted(m for m in forbidden if m in last["modules"]),
+    }
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """Regressions of `results` against `baseline` (median wall time per subcommand)"""
+    regressions = []
+    for name, result in results["commands"].items():
+        base = baseline.get("commands", {}).get(name)
+        if not base:
+            continue
+        ratio = result["wall_ms"] / base["wall_ms"] if base["wall_ms"] else 1.0
+        result["baseline_wall_ms"] = base["wall_ms"]
+        result["change"] = ratio - 1
+        if ratio - 1 > threshold:
+            regressions.append(f"{name}: {base['wall_ms']:.1f} ms -> {result['wall_ms']:.1f} ms "
+                               f"(+{(ratio - 1) * 100:.0f}%)")
+    return regressions
+
+
+def format_report(results: Dict[str, Any]) -> str:
+    lines = [f"Cold start ({results['python']}, median of {results['runs']} runs, "
+             f"snapshot: {'yes' if results['snapshot'] else 'no'})", ""]
+    lines.append(f"{'command':<15}{'wall ms':>10}{'import ms':>11}{'modules':>9}{'vs base':>9}  heaviest imports")
+    for name, r in results["commands"].items():
+        change = f"{r['change'] * 100:+.0f}%" if "change" in r else "-"
+        heaviest = ", ".join(f"{h['module']} {h['ms']:.1f}" for h in r["heaviest"][:3])
+        lines.append(f"{name:<15}{r['wall_ms']:>10.1f}{r['import_ms']:>11.1f}{r['modules']:>9}{change:>9}  {heaviest}")
+        if r["violations"]:
+            lines.append(f"{'':<15}unexpected imports: {', '.join(r['violations'])}")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold-start benchmark for search.py subcommands")
+    parser.add_argument("commands", nargs="*", metavar="COMMAND",
+                        help=f"Subcommands to measure: {', '.join(SUBCOMMANDS)} (default: all)")
+    parser.add_argument("--runs", "-n", type=int, default=DEFAULT_RUNS, help="Runs per subcommand")
+    parser.add_argument("--json", action="store_true", help="Print machine-readable results")
+    parser.add_argument("--save", type=str, default=None, metavar="FILE", help="Write results to FILE")
+    parser.add_argument("--baseline", type=str, default=None, metavar="FILE",
+                        help="Compare against saved results; exit 1 on regressions")
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD,
+                        help=f"Allowed slowdown before failing (default: {REGRESSION_THRESHOLD})")
+    args = parser.parse_args()
+
+    names = args.commands or list(SUBCOMMANDS)
+    unknown = [name for name in names if name not in SUBCOMMANDS]
+    if unknown:
+        parser.error(f"unknown subcommand: {', '.join(unknown)}")
+    results = {
+        "python": f"{sys.implementation.name} {sys.version.split()[0]}",
+        "runs": args.runs,
+        "snapshot": (SCRIPTS_DIR.parent / "data" / "search-index.bin").exists(),
+        "commands": {name: measure(name, args.runs) for name in names},
+    }
+
+    regressions: List[str] = []
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            regressions = compare(results, json.load(f), args.threshold)
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+
+    print(json.dumps(results, ensure_ascii=False, indent=2) if args.json else format_report(results))
+    violations = any(r["violations"] for r in results["commands"].values())
+    if regressions:
+        print("\nRegressions:\n  " + "\n  ".join(regressions), file=sys.stderr)
+    sys.exit(1 if regressions or violations else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Agentic UI Synthetic Catalog - deterministic benchmark corpora
+
+Writes a data directory shaped like ../data (components.csv, plugins.csv,
+hooks.csv, tokens.csv and reasoning-rules.json) with mixed Chinese and
+English text. components.csv, tokens.csv and the rule list get `rows`
+entries each; plugins and hooks get a twentieth of that (at least 5).
+The same size and seed always produce byte-identical files.
+
+Usage:
+    python synthetic.py 1k /tmp/catalog-1k        # 生成 1000 行的合成目录
+    python synthetic.py 100k /tmp/catalog --seed 7
+"""
+
+import csv
+import json
+import random
+from pathlib import Path
+from typing import Any, Dict, List
+
+# ============ CONFIGURATION ============
+DEFAULT_SEED = 42
+SIZES = {"10": 10, "1k": 1_000, "100k": 100_000, "1m": 1_000_000}
+
+EN_WORDS = [
+    "chat", "bubble", "message", "assistant", "thought", "chain", "stream", "markdown",
+    "editor", "input", "layout", "history", "tool", "call", "agent", "task", "list",
+    "file", "upload", "preview", "image", "video", "audio", "voice", "speech", "chart",
+    "graph", "table", "code", "formula", "diagram", "mermaid", "card", "panel", "drawer",
+    "modal", "toolbar", "button", "icon", "avatar", "badge", "status", "loading", "error",
+    "success", "warning", "scroll", "virtual", "search", "filter", "sort", "select",
+    "menu", "tab", "step", "progress", "timeline", "tree", "form", "field", "token",
+    "theme", "dark", "color", "spacing", "radius", "shadow", "motion", "font", "size",
+    "welcome", "prompt", "suggestion", "feedback", "rating", "copy", "share", "export",
+    "workspace", "session", "context", "memory", "plugin", "hook", "locale", "language",
+]
+ZH_WORDS = [
+    "对话", "气泡", "消息", "助手", "思维", "链路", "流式", "编辑", "输入", "布局",
+    "历史", "工具", "调用", "任务", "列表", "文件", "上传", "预览", "图片", "视频",
+    "语音", "图表", "表格", "代码", "公式", "卡片", "面板", "抽屉", "弹窗", "按钮",
+    "图标", "头像", "状态", "加载", "错误", "成功", "警告", "滚动", "搜索", "筛选",
+    "排序", "菜单", "步骤", "进度", "时间", "表单", "主题", "颜色", "间距", "圆角",
+    "阴影", "动画", "字体", "欢迎", "提示", "建议", "反馈", "评分", "复制", "分享",
+]
+CATEGORIES = ["ai-core", "input", "display", "layout", "feedback", "navigation", "data", "media"]
+TOKEN_CATEGORIES = ["color", "spacing", "radius", "shadow", "motion", "typography"]
+
+
+def parse_size(size: str) -> int:
+    """'10', '1k', '100k', '1m' or a plain integer"""
+    key = str(size).strip().lower()
+    if key in SIZES:
+        return SIZES[key]
+    if key.endswith("k"):
+        return int(key[:-1]) * 1_000
+    if key.endswith("m"):
+        return int(key[:-1]) * 1_000_000
+    return int(key)
+
+
+def _camel(words: List[str]) -> str:
+    return "".join(w.capitalize() for w in words)
+
+
+class CatalogGenerator:
+    """Seeded generator for catalog rows and reasoning rules"""
+
+    def __init__(self, seed: int = DEFAULT_SEED):
+        self.rng = random.Random(seed)
+
+    def _en(self, k: int) -> List[str]:
+        return self.rng.sample(EN_WORDS, k)
+
+    def _zh(self, k: int) -> List[str]:
+        return self.rng.sample(ZH_WORDS, k)
+
+    def _description(self) -> str:
+        # Mostly Chinese prose with embedded English terms, like the real catalog
+        return "".join(self._zh(self.rng.randint(2, 4))) + self.rng.choice(["支持", "用于", "提供"]) + \
+            " ".join(self._en(self.rng.randint(1, 2))) + "".join(self._zh(self.rng.randint(1, 3)))
+
+    def component(self, i: int) -> Dict[str, Any]:
+        words = self._en(self.rng.randint(1, 3))
+        name = f"{_camel(words)}{i}"
+        return {
+            "id": i + 1,
+            "name": name,
+            "name_cn": "".join(self._zh(self.rng.randint(1, 2))) + "组件",
+            "category": self.rng.choice(CATEGORIES),
+            "keywords": ",".join(words + self._en(self.rng.randint(1, 4))),
+            "source_path": f"src/{name}/",
+            "description": self._description(),
+            "props_summary": ",".join(self.rng.sample(["content", "status", "onChange", "value",
+                                                       "loading", "items", "style", "className"], 3)),
+        }
+
+    def plugin(self, i: int) -> Dict[str, Any]:
+        words = self._en(2)
+        return {
+            "id": i + 1,
+            "name": f"{words[0]}{i}",
+            "name_cn": "".join(self._zh(1)) + "插件",
+            "keywords": ",".join(words + self._en(3)),
+            "source_path": f"src/Plugins/{words[0]}{i}/",
+            "description": self._description(),
+            "dependencies": f"{words[1]}-lib",
+        }
+
+    def hook(self, i: int) -> Dict[str, Any]:
+        words = self._en(self.rng.randint(1, 2))
+        name = f"use{_camel(words)}{i}"
+        return {
+            "id": i + 1,
+            "name": name,
+            "keywords": " ".join(words + self._en(3)),
+            "source_path": f"src/Hooks/{name}.ts",
+            "description": self._description(),
+            "returns": ",".join(self._en(2)),
+        }
+
+    def token(self, i: int) -> Dict[str, Any]:
+        category = self.rng.choice(TOKEN_CATEGORIES)
+        return {
+            "category": category,
+            "token": f"{category}{_camel(self._en(1))}{i}",
+            "type": "color" if category == "color" else "number",
+            "description": "".join(self._zh(2)),
+            "example_value": f"#{self.rng.randrange(0x1000000):06x}" if category == "color"
+                             else str(self.rng.randint(1, 64)),
+        }
+
+    def rule(self, i: int, components: int, hooks: int, plugins: int, tokens: int) -> Dict[str, Any]:
+        words = self._en(self.rng.randint(2, 5)) + self._zh(self.rng.randint(0, 2))
+        return {
+            "id": f"{words[0]}-{i}",
+            "trigger_keywords": words,
+            "recommended_components": [f"C{self.rng.randrange(components)}" for _ in range(3)],
+            "recommended_hooks": [f"H{self.rng.randrange(hooks)}" for _ in range(self.rng.randint(0, 2))],
+            "recommended_plugins": [f"P{self.rng.randrange(plugins)}" for _ in range(self.rng.randint(0, 2))],
+            "style_priority": self._en(3),
+            "key_tokens": [f"T{self.rng.randrange(tokens)}" for _ in range(3)],
+            "anti_patterns": [" ".join(self._en(3)).capitalize() for _ in range(2)],
+        }
+
+    def query(self) -> str:
+        """A search query: one to three terms, English, Chinese or mixed"""
+        kind = self.rng.random()
+        if kind < 0.5:
+            return " ".join(self._en(self.rng.randint(1, 3)))
+        if kind < 0.75:
+            return "".join(self._zh(self.rng.randint(1, 2)))
+        return " ".join(self._en(1)) + " " + "".join(self._zh(1))
+
+
+def _write_csv(path: Path, rows) -> None:
+    rows = iter(rows)
+    first = next(rows)
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=list(first.keys()))
+        writer.writeheader()
+        writer.writerow(first)
+        writer.writerows(rows)
+
+
+def generate(rows: int, out_dir: Path, seed: int = DEFAULT_SEED) -> Dict[str, int]:
+    """Write a synthetic catalog with `rows` components/tokens/rules into out_dir.
+
+    Returns:
+        row counts per written file
+    """
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    gen = CatalogGenerator(seed)
+    small = max(rows // 20, 5)
+    counts = {"components.csv": rows, "plugins.csv": small, "hooks.csv": small, "tokens.csv": rows}
+
+    # Rows are streamed to disk; only the names are kept so that rules can
+    # recommend real entities
+    names: Dict[str, List[str]] = {"C": [], "H": [], "P": [], "T": []}
+
+    def collect(kind: str, key: str, rows_iter):
+        for row in rows_iter:
+            names[kind].append(row[key])
+            yield row
+
+    _write_csv(out_dir / "components.csv", collect("C", "name", (gen.component(i) for i in range(rows))))
+    _write_csv(out_dir / "plugins.csv", collect("P", "name", (gen.plugin(i) for i in range(small))))
+    _write_csv(out_dir / "hooks.csv", collect("H", "name", (gen.hook(i) for i in range(small))))
+    _write_csv(out_dir / "tokens.csv", collect("T", "token", (gen.token(i) for i in range(rows))))
+
+    header = {
+        "version": "1.0.0",
+        "description": f"Synthetic catalog ({rows} rows, seed {seed})",
+    }
+    footer = {
+        "anti_patterns_global": [{"id": "hardcoded-colors", "description": "使用硬编码颜色值而非 token",
+                                  "bad_example": "color: '#1890ff'", "good_example": "color: token.colorPrimary"}],
+        "pre_delivery_checklist": ["All colors from token system", "Streaming states handled"],
+    }
+    with open(out_dir / "reasoning-rules.json", "w", encoding="utf-8") as f:
+        f.write(json.dumps(header, ensure_ascii=False)[:-1] + ', "rules": [')
+        for i in range(rows):
+            rule = gen.rule(i, rows, small, small, rows)
+            for key in ("recommended_components", "recommended_hooks", "recommended_plugins", "key_tokens"):
+                rule[key] = [names[ref[0]][int(ref[1:])] for ref in rule[key]]
+            f.write(("," if i else "") + json.dumps(rule, ensure_ascii=False))
+        f.write("], " + json.dumps(footer, ensure_ascii=False)[1:])
+    counts["reasoning-rules.json"] = rows
+    return counts
+
+
+def queries(count: int, seed: int = DEFAULT_SEED) -> List[str]:
+    """A reproducible query workload over the synthetic vocabulary"""
+    gen = CatalogGenerator(seed + 1)
+    return [gen.query() for _ in range(count)]
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Generate a synthetic Agentic UI catalog")
+    parser.add_argument("size", type=str, help="Rows: 10, 1k, 100k, 1m or an integer")
+    parser.add_argument("out_dir", type=str, help="Output data directory")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="Random seed")
+    args = parser.parse_args()
+
+    for name, count in generate(parse_size(args.size), Path(args.out_dir), args.seed).items():
+        print(f"{name}: {count} rows")
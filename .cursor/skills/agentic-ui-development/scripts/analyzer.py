@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Agentic UI Analyzer - text analysis chain for the BM25 index
+
+An analyzer is a tokenizer followed by a chain of token filters. Documents
+go through INDEX_ANALYZER once when the index is built; queries go through
+QUERY_ANALYZER, which is memoized because agents repeat the same queries.
+
+    对话气泡组件支持AI和用户模式
+    -> index: 对, 话, 对话, 气, 话气, 泡, 气泡, ..., ai, 和, 用, 和用, ...
+    -> query "气泡组件": 气泡, 泡组, 组件
+"""
+
+import re
+from functools import lru_cache
+from typing import Callable, Iterable, List, Sequence, Tuple
+
+# ============ CONFIGURATION ============
+QUERY_CACHE_SIZE = 4096
+
+# Runs of CJK ideographs, or runs of other word characters
+_TOKEN_RE = re.compile(r'[\u4e00-\u9fff]+|[^\W\u4e00-\u9fff]+')
+
+
+def _is_cjk(token: str) -> bool:
+    return '\u4e00' <= token[0] <= '\u9fff'
+
+
+# ============ TOKEN FILTERS ============
+TokenFilter = Callable[[List[str]], List[str]]
+
+
+def lowercase(tokens: List[str]) -> List[str]:
+    """ASCII (and other cased scripts) to lower case"""
+    return [t.lower() for t in tokens]
+
+
+def drop_short(tokens: List[str]) -> List[str]:
+    """Drop single-character non-CJK tokens ("a", "x", "1")"""
+    return [t for t in tokens if len(t) > 1 or _is_cjk(t)]
+
+
+def light_stem(tokens: List[str]) -> List[str]:
+    """Conservative English stemming: plural -s/-ies and -ing.
+
+    Only suffixes that leave a stem of four or more characters are removed,
+    so short words such as "string", "class" or "status" stay intact.
+    """
+    stemmed = []
+    for t in tokens:
+        if _is_cjk(t) or not t.isascii():
+            stemmed.append(t)
+        elif t.endswith("ies") and len(t) > 5:
+            stemmed.append(t[:-3] + "y")
+        elif t.endswith("ing") and len(t) > 6:
+            stemmed.append(t[:-3])
+        elif t.endswith("s") and len(t) > 4 and not t.endswith(("ss", "us", "is")):
+            stemmed.append(t[:-1])
+        else:
+            stemmed.append(t)
+    return stemmed
+
+
+class _CJKNgrams:
+    """Token filter built by cjk_ngrams(); a class so analyzers can be pickled to worker processes"""
+
+    __slots__ = ("unigrams", "bigrams", "__name__")
+
+    def __init__(self, unigrams: bool, bigrams: bool):
+        self.unigrams = unigrams
+        self.bigrams = bigrams
+        self.__name__ = f"cjk_ngrams(unigrams={unigrams},bigrams={bigrams})"
+
+    def __call__(self, tokens: List[str]) -> List[str]:
+        unigrams, bigrams = self.unigrams, self.bigrams
+        out = []
+        for t in tokens:
+            if not _is_cjk(t):
+                out.append(t)
+            elif len(t) == 1:
+                out.append(t)
+            else:
+                for i, ch in enumerate(t):
+                    if unigrams:
+                        out.append(ch)
+                    if bigrams and i + 1 < len(t):
+                        out.append(t[i:i + 2])
+        return out
+
+
+def cjk_ngrams(unigrams: bool = True, bigrams: bool = True) -> TokenFilter:
+    """Split CJK runs into character unigrams and/or bigrams.
+
+    A run of one character always yields its unigram so that single-character
+    queries still match.
+    """
+    return _CJKNgrams(unigrams, bigrams)
+
+
+# ============ ANALYZER ============
+class Analyzer:
+    """Tokenizer plus a chain of token filters"""
+
+    def __init__(self, filters: Sequence[TokenFilter] = ()):
+        self.filters = tuple(filters)
+
+    @property
+    def signature(self) -> str:
+        """Identifies the analysis chain; indexes built with another chain are stale"""
+        return "|".join(f.__name__ for f in self.filters)
+
+    def __call__(self, text: str) -> List[str]:
+        tokens = _TOKEN_RE.findall(str(text))
+        for f in self.filters:
+            tokens = f(tokens)
+        return tokens
+
+    def analyze_all(self, texts: Iterable[str]) -> List[List[str]]:
+        return [self(text) for text in texts]
+
+
+class QueryAnalyzer(Analyzer):
+    """Analyzer whose results are memoized in an LRU (returns tuples)"""
+
+    def __init__(self, filters: Sequence[TokenFilter] = (), cache_size: int = QUERY_CACHE_SIZE):
+        super().__init__(filters)
+        self._cached = lru_cache(maxsize=cache_size)(self._analyze)
+
+    def _analyze(self, text: str) -> Tuple[str, ...]:
+        return tuple(super().__call__(text))
+
+    def __call__(self, text: str) -> Tuple[str, ...]:
+        return self._cached(str(text))
+
+    def cache_info(self):
+        return self._cached.cache_info()
+
+
+INDEX_ANALYZER = Analyzer([lowercase, drop_short, light_stem, cjk_ngrams(unigrams=True, bigrams=True)])
+QUERY_ANALYZER = QueryAnalyzer([lowercase, drop_short, light_stem, cjk_ngrams(unigrams=False, bigrams=True)])
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Agentic UI Async API - asyncio entry points for async agent servers
+
+The synchronous functions in core and design_system parse data files and
+score queries on the calling thread. The coroutines here run the same
+functions in an executor (the event loop's default thread pool unless one
+is configured), so the event loop keeps serving other requests while data
+is loaded and queries are scored.
+
+Concurrent identical requests are coalesced: while a computation for the
+same arguments is in flight, later callers await its result instead of
+starting another one, and all of them receive the same result object
+(treat it as read-only). A caller that is cancelled does not cancel the
+computation the others are waiting for. max_concurrency caps how many
+computations run in the executor at once.
+
+Usage:
+    from async_api import aload, asearch, asearch_all, agenerate_design_system
+
+    await aload()                                      # 启动时加载索引 (不阻塞事件循环)
+    result = await asearch("chat bubble", "component")
+    results = await asearch_all("chart")
+    text = await agenerate_design_system("ai chat", "My AI App")
+
+    # 限制同时在执行器中运行的计算数，或使用自己的执行器
+    from async_api import configure
+    configure(max_concurrency=4)
+"""
+
+import asyncio
+import weakref
+from concurrent.futures import Executor
+from functools import partial
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional, Tuple
+
+import telemetry
+from core import MAX_RESULTS, search, search_all, warm
+
+# ============ CONFIGURATION ============
+# Computations running at once per event loop (None: limited by the executor only)
+MAX_CONCURRENCY: Optional[int] = None
+
+
+class _LoopState:
+    """In-flight computations and the concurrency limit of one event loop"""
+
+    __slots__ = ("inflight", "semaphore")
+
+    def __init__(self, max_concurrency: Optional[int]):
+        self.inflight: Dict[Hashable, asyncio.Future] = {}
+        self.semaphore = asyncio.Semaphore(max_concurrency) if max_concurrency else None
+
+
+# ============ ASYNC SEARCH ============
+class AsyncSearch:
+    """Coalescing, concurrency-limited async front end over core and design_system.
+
+    Args:
+        max_concurrency: Computations running in the executor at once (None: no limit)
+        executor: Executor for loading and scoring (None: the event loop's default)
+    """
+
+    def __init__(self, max_concurrency: Optional[int] = MAX_CONCURRENCY,
+                 executor: Optional[Executor] = None):
+        if max_concurrency is not None and max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        self.max_concurrency = max_concurrency
+        self.executor = executor
+        # Futures and semaphores belong to one event loop
+        self._states: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _LoopState]" = \
+            weakref.WeakKeyDictionary()
+
+    def _state(self, loop: asyncio.AbstractEventLoop) -> _LoopState:
+        state = self._states.get(loop)
+        if state is None:
+            state = self._states[loop] = _LoopState(self.max_concurrency)
+        return state
+
+    async def _run(self, key: Hashable, fn: Callable[..., Any], *args: Any) -> Any:
+        """Result of fn(*args) in the executor, shared with identical in-flight calls"""
+        loop = asyncio.get_running_loop()
+        state = self._state(loop)
+        task = state.inflight.get(key)
+        if task is None:
+            task = state.inflight[key] = loop.create_task(self._compute(loop, state, fn, args))
+            task.add_done_callback(partial(self._finished, state, key))
+        else:
+            telemetry.count("async_coalesced")
+        return await asyncio.shield(task)
+
+    async def _compute(self, loop: asyncio.AbstractEventLoop, state: _LoopState,
+                       fn: Callable[..., Any], args: Tuple[Any, ...]) -> Any:
+        if state.semaphore is None:
+            return await loop.run_in_executor(self.executor, partial(fn, *args))
+        async with state.semaphore:
+            return await loop.run_in_executor(self.executor, partial(fn, *args))
+
+    @staticmethod
+    def _finished(state: _LoopState, key: Hashable, task: asyncio.Future) -> None:
+        if state.inflight.get(key) is task:
+            del state.inflight[key]
+        if not task.cancelled():
+            task.exception()   # retrieved here in case every waiter was cancelled
+
+    async def load(self, domains: Optional[Iterable[str]] = None) -> None:
+        """core.warm() off the event loop: parse or read the snapshot and index the domains"""
+        domains = tuple(domains) if domains is not None else None
+        await self._run(("warm", domains), warm, domains)
+
+    async def search(self, query: str, domain: Optional[str] = None, max_results: int = MAX_RESULTS,
+                     fuzzy: bool = False) -> Dict[str, Any]:
+        """core.search() off the event loop"""
+        return await self._run(("search", query, domain, max_results, fuzzy),
+                               search, query, domain, max_results, fuzzy)
+
+    async def search_all(self, query: str, max_results: int = MAX_RESULTS,
+                         fuzzy: bool = False) -> Dict[str, Any]:
+        """core.search_all() off the event loop"""
+        return await self._run(("search_all", query, max_results, fuzzy),
+                               search_all, query, max_results, fuzzy)
+
+    async def generate_design_system(self, query: str, project_name: Optional[str] = None,
+                                     output_format: str = "ascii", persist: bool = False,
+                                     page: Optional[str] = None, output_dir: Optional[str] = None,
+                                     deterministic: bool = False) -> str:
+        """design_system.generate_design_system() off the event loop"""
+        from design_system import generate_design_system
+        return await self._run(("generate_design_system", query, project_name, output_format,
+                                persist, page, output_dir, deterministic),
+                               generate_design_system, query, project_name, output_format,
+                               persist, page, output_dir, deterministic)
+
+
+# ============ MODULE API ============
+_default: Optional[AsyncSearch] = None
+
+
+def _searcher() -> AsyncSearch:
+    global _default
+    if _default is None:
+        _default = AsyncSearch()
+    return _default
+
+
+def configure(max_concurrency: Optional[int] = MAX_CONCURRENCY, executor: Optional[Executor] = None) -> None:
+    """Set the concurrency limit and executor used by the module-level coroutines"""
+    global _default
+    _default = AsyncSearch(max_concurrency, executor)
+
+
+async def aload(domains: Optional[Iterable[str]] = None) -> None:
+    """Load and index the given domains (all by default) without blocking the event loop"""
+    await _searcher().load(domains)
+
+
+async def asearch(query: str, domain: Optional[str] = None, max_results: int = MAX_RESULTS,
+                  fuzzy: bool = False) -> Dict[str, Any]:
+    """Async core.search(); identical concurrent calls share one computation"""
+    return await _searcher().search(query, domain, max_results, fuzzy)
+
+
+async def asearch_all(query: str, max_results: int = MAX_RESULTS, fuzzy: bool = False) -> Dict[str, Any]:
+    """Async core.search_all(); identical concurrent calls share one computation"""
+    return await _searcher().search_all(query, max_results, fuzzy)
+
+
+async def agenerate_design_system(query: str, project_name: Optional[str] = None,
+                                  output_format: str = "ascii", persist: bool = False,
+                                  page: Optional[str] = None, output_dir: Optional[str] = None,
+                                  deterministic: bool = False) -> str:
+    """Async design_system.generate_design_system(); identical concurrent calls share one computation"""
+    return await _searcher().generate_design_system(query, project_name, output_format,
+                                                    persist, page, output_dir, deterministic)
@@ -4,191 +4,1443 @@
 Agentic UI Core - BM25 search engine for Agentic UI components
 """
 
-import csv
-import re
-import json
+import heapq
+from bisect import bisect_left, bisect_right
+import os
+import sys
+import marshal
+import threading
+from array import array
 from pathlib import Path
 from math import log
-from collections import defaultdict
-from typing import List, Dict, Any, Optional
+from collections import defaultdict, deque
+from functools import partial
+from itertools import islice
+from typing import List, Dict, Any, Optional, Callable, Iterable, Iterator, Sequence, Tuple, Union
+
+import telemetry
+from analyzer import Analyzer, INDEX_ANALYZER, QUERY_ANALYZER
+from postings import DEFAULT_MEMORY_BUDGET, PostingList, PostingsBuilder, merge_shards
+from resultcache import DEFAULT_MAX_ENTRIES, DEFAULT_TTL, DISK_DIR_ENV, MISS, ResultCache, normalize_query
+from rowstore import RowStore
 
 # ============ CONFIGURATION ============
-DATA_DIR = Path(__file__).parent.parent / "data"
+# Catalog directory; $AGENTIC_UI_DATA_DIR points the tools at another catalog (e.g. benchmarks)
+DATA_DIR = Path(os.environ.get("AGENTIC_UI_DATA_DIR") or Path(__file__).parent.parent / "data")
 MAX_RESULTS = 5
+# Domains whose routing confidence reaches this share are searched by search(domain=None)
+ROUTE_THRESHOLD = 0.25
+# Routing mass a domain's route_hints add to a query term (data-derived masses are IDF-sized)
+ROUTE_HINT_WEIGHT = 0.5
+RULES_FILE = "reasoning-rules.json"
+# An in-memory domain index is updated incrementally unless more than this share of its rows changed
+INCREMENTAL_MAX_CHANGE = 0.5
+
+# Documents per shard of a parallel index build (`search.py --build-index --workers N`)
+SHARD_DOCS = 20000
+
+# Compiled index snapshot written by `search.py --build-index`
+SNAPSHOT_FILE = DATA_DIR / "search-index.bin"
+SNAPSHOT_VERSION = 8
 
 CSV_CONFIG = {
     "component": {
         "file": "components.csv",
         "search_cols": ["name", "name_cn", "category", "keywords", "description"],
-        "output_cols": ["id", "name", "name_cn", "category", "keywords", "source_path", "description", "props_summary"]
+        "output_cols": ["id", "name", "name_cn", "category", "keywords", "source_path", "description", "props_summary"],
+        "lookup_cols": ["name", "name_cn", "id", "source_path"],
+        "complete_cols": ["name", "name_cn", "keywords"],
+        "rule_key": "recommended_components",
+        "key_col": "id",
+        "aliases": ["component", "components", "组件"],
+        "route_hints": ["bubble", "chat", "message", "layout", "editor", "markdown",
+                        "thought", "thinking", "task", "list", "workspace", "history",
+                        "loading", "robot", "welcome", "suggestion", "alert", "tool",
+                        "气泡", "对话", "布局", "编辑器", "思维", "任务", "工作区", "历史"]
     },
     "plugin": {
         "file": "plugins.csv",
         "search_cols": ["name", "name_cn", "keywords", "description"],
-        "output_cols": ["id", "name", "name_cn", "keywords", "source_path", "description", "dependencies"]
+        "output_cols": ["id", "name", "name_cn", "keywords", "source_path", "description", "dependencies"],
+        "lookup_cols": ["name", "name_cn", "id", "source_path"],
+        "complete_cols": ["name", "name_cn", "keywords"],
+        "rule_key": "recommended_plugins",
+        "key_col": "id",
+        "aliases": ["plugin", "plugins", "插件"],
+        "route_hints": ["chart", "code", "katex", "mermaid", "syntax", "highlight", "formula",
+                        "diagram", "图表", "代码", "公式"]
     },
     "hook": {
         "file": "hooks.csv",
         "search_cols": ["name", "keywords", "description"],
-        "output_cols": ["id", "name", "keywords", "source_path", "description", "returns"]
+        "output_cols": ["id", "name", "keywords", "source_path", "description", "returns"],
+        "lookup_cols": ["name", "id", "source_path"],
+        "complete_cols": ["name", "keywords"],
+        "rule_key": "recommended_hooks",
+        "key_col": "id",
+        "aliases": ["hook", "hooks", "钩子"],
+        "route_hints": ["use", "scroll", "size", "speech", "click", "language", "滚动", "尺寸", "语音"]
     },
     "token": {
         "file": "tokens.csv",
         "search_cols": ["token", "category", "description"],
-        "output_cols": ["token", "category", "type", "description", "example_value"]
+        "output_cols": ["token", "category", "type", "description", "example_value"],
+        "lookup_cols": ["token"],
+        "complete_cols": ["token"],
+        "rule_key": "key_tokens",
+        "key_col": "token",
+        "aliases": ["token", "tokens", "令牌"],
+        "route_hints": ["color", "padding", "margin", "font", "border", "shadow", "motion",
+                        "颜色", "间距", "字体", "边框", "阴影"]
     }
 }
 
+# Scoring engine: "python", "numpy", or "auto" (numpy for large corpora when installed)
+BM25_ENGINE = os.environ.get("AGENTIC_UI_BM25_ENGINE", "auto")
+NUMPY_MIN_DOCS = 5000
+# Analyzed queries whose typo corrections are remembered per index
+CORRECTIONS_CACHE_SIZE = 1024
+# Upper bound on queries x documents per vectorized batch (memory for score matrix)
+NUMPY_BATCH_CELLS = 1 << 22
+# Slack for comparing summed upper bounds with exact scores (different rounding order)
+SCORE_EPSILON = 1e-9
+
+_numpy_module: Any = None
+
+
+def _numpy() -> Any:
+    """NumPy module if installed, else None (imported on first use only)"""
+    global _numpy_module
+    if _numpy_module is None:
+        try:
+            import numpy
+            _numpy_module = numpy
+        except ImportError:
+            _numpy_module = False
+    return _numpy_module or None
+
+
+def _index_shard(analyzer: Analyzer, documents: List[str], first_id: int,
+                 memory_budget: Optional[int]) -> Tuple[bytes, List[Tuple[str, bytes, bytes]]]:
+    """Process pool task of a sharded BM25.fit: analyze and index one shard of documents"""
+    if memory_budget is None:
+        memory_budget = DEFAULT_MEMORY_BUDGET
+    builder = PostingsBuilder(memory_budget, first_id=first_id)
+    for text in documents:
+        builder.add(analyzer(text))
+    return builder.finish_shard()
+
+
 # ============ BM25 IMPLEMENTATION ============
 class BM25:
-    """BM25 ranking algorithm for text search"""
+    """BM25 ranking algorithm backed by an inverted index"""
+
+    ENGINES = ("auto", "python", "numpy")
 
-    def __init__(self, k1: float = 1.5, b: float = 0.75):
+    def __init__(self, k1: float = 1.5, b: float = 0.75, engine: Optional[str] = None,
+                 analyzer: Optional[Analyzer] = None, query_analyzer: Optional[Analyzer] = None):
+        engine = engine or BM25_ENGINE
+        if engine not in self.ENGINES:
+            raise ValueError(f"Unknown BM25 engine: {engine}")
         self.k1 = k1
         self.b = b
-        self.corpus: List[List[str]] = []
-        self.doc_lengths: List[int] = []
+        self.engine = engine
+        self.analyzer = analyzer or INDEX_ANALYZER
+        self.query_analyzer = query_analyzer or QUERY_ANALYZER
+        self.doc_lengths: Sequence[int] = array("i")
+        self.doc_norms: List[float] = []
         self.avgdl: float = 0
         self.idf: Dict[str, float] = {}
         self.doc_freqs: Dict[str, int] = defaultdict(int)
+        # term -> PostingList (doc ids ascending, term frequencies)
+        self.postings: Dict[str, PostingList] = {}
+        # term -> highest single-occurrence contribution, the MaxScore upper bound
+        self.term_max: Dict[str, float] = {}
         self.N: int = 0
+        # NumPy engine: term-major (CSC) doc-term matrix of precomputed BM25 weights
+        self._matrix: Optional[Tuple[Dict[str, int], Any, Any, Any]] = None
+        # Typo correction over the vocabulary, built on first fuzzy query
+        self._fuzzy = None
+        # analyzed query -> its corrections; a fuzzy search asks for them several times
+        self._corrected: Dict[Tuple[str, ...], Dict[str, str]] = {}
 
     def tokenize(self, text: str) -> List[str]:
-        """Lowercase, split, remove punctuation, filter short words"""
-        text = re.sub(r'[^\w\s\u4e00-\u9fff]', ' ', str(text).lower())
-        tokens = []
-        for w in text.split():
-            # Keep Chinese characters regardless of length
-            if len(w) > 1 or '\u4e00' <= w <= '\u9fff':
-                tokens.append(w)
-        return tokens
-
-    def fit(self, documents: List[str]) -> None:
-        """Build BM25 index from documents"""
-        self.corpus = [self.tokenize(doc) for doc in documents]
-        self.N = len(self.corpus)
+        """Analyze document text with the index-time analyzer"""
+        return self.analyzer(text)
+
+    def analyze_query(self, query: str) -> Sequence[str]:
+        """Analyze a query with the (memoized) query-time analyzer"""
+        return self.query_analyzer(query)
+
+    @property
+    def fuzzy_index(self):
+        """SymSpell index over the vocabulary, weighted by document frequency"""
+        if self._fuzzy is None:
+            from fuzzy import SymSpellIndex
+            self._fuzzy = SymSpellIndex(dict(self.doc_freqs))
+        return self._fuzzy
+
+    def corrections(self, query: str) -> Dict[str, str]:
+        """{query term: vocabulary term} for query terms missing from the index"""
+        tokens = tuple(self.analyze_query(query))
+        fixes = self._corrected.get(tokens)
+        if fixes is None:
+            fixes = self.fuzzy_index.correct(tokens, self.postings)
+            if len(self._corrected) >= CORRECTIONS_CACHE_SIZE:
+                self._corrected = {}
+            self._corrected[tokens] = fixes
+        return dict(fixes)
+
+    def query_tokens(self, query: str, fuzzy: bool = False) -> Sequence[str]:
+        """Analyzed query terms, with unknown terms replaced by their corrections if fuzzy"""
+        tokens = self.analyze_query(query)
+        if not fuzzy:
+            return tokens
+        fixes = self.corrections(query)
+        return tuple(fixes.get(token, token) for token in tokens) if fixes else tokens
+
+    def fit(self, documents: Iterable[str], memory_budget: Optional[int] = None, workers: int = 1) -> None:
+        """Analyze documents one at a time and build the index from their token streams.
+
+        `documents` may be any iterable (e.g. a generator over a streamed CSV);
+        it is consumed once and never held in memory as a whole.
+
+        With workers > 1 the documents are cut into shards of SHARD_DOCS that
+        are analyzed and indexed in a process pool (each worker with its own
+        memory_budget); the merged index is identical to a single-process fit.
+        """
+        with telemetry.span("bm25.fit", workers=workers):
+            if workers > 1:
+                self._fit_sharded(documents, memory_budget, workers)
+            else:
+                self.fit_tokens((self.tokenize(doc) for doc in documents), memory_budget)
+        telemetry.count("docs_indexed", self.N)
+
+    def _fit_sharded(self, documents: Iterable[str], memory_budget: Optional[int], workers: int) -> None:
+        documents = iter(documents)
+        shard = list(islice(documents, SHARD_DOCS))
+        if len(shard) < SHARD_DOCS:
+            # A single shard is not worth a process pool
+            self.fit_tokens((self.tokenize(doc) for doc in shard), memory_budget)
+            return
+
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            def submitted() -> Iterator[Any]:
+                # Keep at most two shards per worker in flight so the input stays streamed
+                pending: deque = deque()
+                start, batch = 0, shard
+                while batch:
+                    pending.append(pool.submit(_index_shard, self.analyzer, batch, start, memory_budget))
+                    start += len(batch)
+                    batch = list(islice(documents, SHARD_DOCS))
+                    while len(pending) > 2 * workers or (pending and not batch):
+                        yield pending.popleft().result()
+
+            doc_lengths, postings = merge_shards(submitted())
+        telemetry.count("index_shards", -(-len(doc_lengths) // SHARD_DOCS))
+        self._finish_fit(postings, doc_lengths)
+
+    def fit_tokens(self, token_streams: Iterable[Sequence[str]],
+                   memory_budget: Optional[int] = None) -> None:
+        """Build the inverted index: term -> PostingList, plus per-doc length norms.
+
+        Args:
+            token_streams: Analyzed documents, in doc id order
+            memory_budget: Build buffer bytes before postings are spilled to
+                sorted runs on disk (default: postings.DEFAULT_MEMORY_BUDGET)
+        """
+        builder = PostingsBuilder() if memory_budget is None else PostingsBuilder(memory_budget)
+        try:
+            for tokens in token_streams:
+                builder.add(tokens)
+            postings = builder.finish()
+        finally:
+            builder.close()
+
+        self._finish_fit(postings, builder.doc_lengths)
+
+    def _finish_fit(self, postings: Dict[str, PostingList], doc_lengths: array) -> None:
+        """Install built postings and derive length norms, document frequencies, IDF and bounds"""
+        self.postings = postings
+        self.doc_lengths = doc_lengths
+        self.N = len(doc_lengths)
         if self.N == 0:
             return
-        self.doc_lengths = [len(doc) for doc in self.corpus]
-        self.avgdl = sum(self.doc_lengths) / self.N
+        self.avgdl = sum(doc_lengths) / self.N
 
-        for doc in self.corpus:
-            seen = set()
-            for word in doc:
-                if word not in seen:
-                    self.doc_freqs[word] += 1
-                    seen.add(word)
+        # Length normalisation is query independent, so pay for it once here
+        k1, b, avgdl = self.k1, self.b, self.avgdl
+        self.doc_norms = [k1 * (1 - b + b * dl / avgdl) for dl in doc_lengths]
+
+        for word, plist in postings.items():
+            freq = len(plist)
+            self.doc_freqs[word] = freq
+            self.idf[word] = self._idf_of(freq)
+
+        self.term_max = self._compute_term_max()
+        self._prepare_engine()
+
+    def _idf_of(self, freq: int) -> float:
+        return log((self.N - freq + 0.5) / (freq + 0.5) + 1)
+
+    def _term_bound(self, word: str, plist: PostingList) -> float:
+        """Highest single-occurrence contribution of a term (its MaxScore upper bound)"""
+        idf = self.idf[word]
+        k1_plus_1 = self.k1 + 1
+        doc_norms = self.doc_norms
+        return max(idf * (tf * k1_plus_1) / (tf + doc_norms[doc_id]) for doc_id, tf in plist.items())
+
+    def _compute_term_max(self) -> Dict[str, float]:
+        return {word: self._term_bound(word, plist) for word, plist in self.postings.items()}
+
+    # ---- engine selection ----
+    def _uses_numpy(self) -> bool:
+        # Cheap checks first: importing NumPy costs more than a small table's whole query
+        if self.engine == "python" or (self.engine == "auto" and self.N < NUMPY_MIN_DOCS):
+            return False
+        return _numpy() is not None
+
+    def _prepare_engine(self) -> None:
+        self._matrix = self._build_matrix() if self._uses_numpy() else None
+
+    def _build_matrix(self) -> Tuple[Dict[str, int], Any, Any, Any]:
+        """Compress postings into (term_ids, indptr, doc_ids, weights) arrays.
+
+        Column j of the doc-term matrix holds the documents of term j and their
+        BM25 weights, computed with the same operation order as the Python
+        engine so both produce bit-identical scores.
+        """
+        np = _numpy()
+        term_ids: Dict[str, int] = {}
+        indptr = np.zeros(len(self.postings) + 1, dtype=np.int64)
+        doc_ids = np.empty(sum(len(plist) for plist in self.postings.values()), dtype=np.int64)
+        tfs = np.empty(len(doc_ids), dtype=np.int64)
+        idfs = np.empty(len(doc_ids), dtype=np.float64)
+        pos = 0
+        for j, (word, plist) in enumerate(self.postings.items()):
+            term_ids[word] = j
+            end = pos + len(plist)
+            doc_ids[pos:end] = plist.keys()
+            tfs[pos:end] = plist.values()
+            idfs[pos:end] = self.idf[word]
+            indptr[j + 1] = end
+            pos = end
+        norms = np.asarray(self.doc_norms, dtype=np.float64)
+        weights = idfs * (tfs * (self.k1 + 1)) / (tfs + norms[doc_ids])
+        return term_ids, indptr, doc_ids, weights
+
+    def _query_columns(self, tokens: Sequence[str]) -> Tuple[Any, Any]:
+        """Concatenated (doc_ids, weights) of the query terms' columns, in query order"""
+        np = _numpy()
+        term_ids, indptr, doc_ids, weights = self._matrix
+        spans = [(indptr[term_ids[t]], indptr[term_ids[t] + 1]) for t in tokens if t in term_ids]
+        if not spans:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)
+        return (np.concatenate([doc_ids[a:b] for a, b in spans]),
+                np.concatenate([weights[a:b] for a, b in spans]))
+
+    def _rank_array(self, scores: Any, k: Optional[int]) -> List[tuple]:
+        """(doc_id, score) pairs with score > 0, best first, ties by doc id"""
+        np = _numpy()
+        if k is not None and k <= 0:
+            return []
+        candidates = np.flatnonzero(scores > 0)
+        if k is not None and len(candidates) > k:
+            values = scores[candidates]
+            # Keep everything tied with the k-th best so tie-breaking matches a full sort
+            kth = np.partition(values, len(values) - k)[len(values) - k]
+            candidates = candidates[values >= kth]
+        order = np.lexsort((candidates, -scores[candidates]))
+        ranked = candidates[order]
+        if k is not None:
+            ranked = ranked[:k]
+        return list(zip(ranked.tolist(), scores[ranked].tolist()))
+
+    def _score_arrays(self, tokens_list: List[Sequence[str]]) -> Iterator[Any]:
+        """Dense score vector per query, computed in blocks of queries"""
+        np = _numpy()
+        n = self.N
+        chunk = max(1, NUMPY_BATCH_CELLS // max(n, 1))
+        for start in range(0, len(tokens_list), chunk):
+            block = tokens_list[start:start + chunk]
+            bins, values = [], []
+            for row, tokens in enumerate(block):
+                docs, weights = self._query_columns(tokens)
+                bins.append(docs + row * n)
+                values.append(weights)
+            # One sparse (queries x terms) @ (terms x docs) product via bincount
+            scores = np.bincount(np.concatenate(bins), weights=np.concatenate(values),
+                                 minlength=len(block) * n).reshape(len(block), n)
+            if telemetry.enabled:
+                telemetry.count("postings_touched", sum(len(docs) for docs in bins))
+                telemetry.count("docs_scored", int(np.count_nonzero(scores)))
+            for row in range(len(block)):
+                yield scores[row]
+
+    def _score_numpy(self, tokens_list: List[Sequence[str]], k: Optional[int]) -> List[List[tuple]]:
+        return [self._rank_array(scores, k) for scores in self._score_arrays(tokens_list)]
+
+    def _term_contributions(self, token: str) -> List[Tuple[int, float]]:
+        """BM25 contribution of one query term to every document containing it"""
+        plist = self.postings.get(token)
+        if not plist:
+            return []
+        telemetry.count("postings_touched", len(plist))
+        idf = self.idf[token]
+        k1_plus_1 = self.k1 + 1
+        doc_norms = self.doc_norms
+        return [(doc_id, idf * (tf * k1_plus_1) / (tf + doc_norms[doc_id]))
+                for doc_id, tf in plist.items()]
+
+    @staticmethod
+    def _accumulate(tokens: Sequence[str], contributions: Dict[str, List[Tuple[int, float]]],
+                    k: Optional[int] = None) -> List[tuple]:
+        scores: Dict[int, float] = {}
+        for token in tokens:
+            for doc_id, value in contributions[token]:
+                scores[doc_id] = scores.get(doc_id, 0.0) + value
+        telemetry.count("docs_scored", len(scores))
+        if k is None:
+            return sorted(scores.items(), key=lambda x: (-x[1], x[0]))
+        return heapq.nsmallest(k, scores.items(), key=lambda x: (-x[1], x[0]))
+
+    def _doc_score(self, tokens: Sequence[str], doc_id: int) -> float:
+        """Exact score of one document, summed in query order like _accumulate"""
+        k1_plus_1 = self.k1 + 1
+        norm = self.doc_norms[doc_id]
+        score = 0.0
+        for token in tokens:
+            plist = self.postings.get(token)
+            tf = plist.get(doc_id) if plist else None
+            if tf:
+                score += self.idf[token] * (tf * k1_plus_1) / (tf + norm)
+        return score
+
+    def _top_k_maxscore(self, tokens: Sequence[str], k: int) -> List[tuple]:
+        """Document-at-a-time MaxScore top-k over a bounded heap.
 
-        for word, freq in self.doc_freqs.items():
-            self.idf[word] = log((self.N - freq + 0.5) / (freq + 0.5) + 1)
+        Query terms are ordered by their upper bound (term_max x occurrences).
+        Once the heap is full, the longest prefix of low-bound terms whose
+        bounds sum to no more than the current k-th score becomes
+        "non-essential": their postings are no longer walked, and a document
+        is fully scored only if its bound can still beat the k-th score.
+        """
+        if k <= 0:
+            return []
+        counts: Dict[str, int] = {}
+        for token in tokens:
+            if token in self.postings:
+                counts[token] = counts.get(token, 0) + 1
+        if not counts:
+            return []
+
+        terms = sorted(counts, key=lambda t: self.term_max[t] * counts[t])
+        bounds = [self.term_max[t] * counts[t] for t in terms]
+        prefix = []
+        total = 0.0
+        for bound in bounds:
+            total += bound
+            prefix.append(total)
+
+        cursors = []
+        for i, term in enumerate(terms):
+            it = iter(self.postings[term])
+            cursors.append((next(it), i, it))
+        heapq.heapify(cursors)
+
+        top: List[Tuple[float, int]] = []   # min-heap of (score, -doc_id)
+        theta = 0.0
+        first_essential = 0
+        touched = scored = 0
+        while cursors:
+            if cursors[0][1] < first_essential:
+                heapq.heappop(cursors)
+                continue
+            doc_id = cursors[0][0]
+            bound = prefix[first_essential - 1] if first_essential else 0.0
+            while cursors and cursors[0][0] == doc_id:
+                _, i, it = heapq.heappop(cursors)
+                if i < first_essential:
+                    continue
+                touched += 1
+                bound += bounds[i]
+                nxt = next(it, None)
+                if nxt is not None:
+                    heapq.heappush(cursors, (nxt, i, it))
+
+            # Docs arrive in id order, so a tie with the k-th score never wins
+            if len(top) == k and bound + SCORE_EPSILON < theta:
+                continue
+            score = self._doc_score(tokens, doc_id)
+            scored += 1
+            if len(top) < k:
+                heapq.heappush(top, (score, -doc_id))
+            elif (score, -doc_id) > top[0]:
+                heapq.heapreplace(top, (score, -doc_id))
+            else:
+                continue
+            if len(top) == k:
+                theta = top[0][0]
+                while first_essential < len(terms) and prefix[first_essential] + SCORE_EPSILON < theta:
+                    first_essential += 1
+
+        telemetry.count("postings_touched", touched)
+        telemetry.count("docs_scored", scored)
+        return sorted(((-neg, score) for score, neg in top), key=lambda x: (-x[1], x[0]))
 
     def score(self, query: str) -> List[tuple]:
-        """Score all documents against query"""
-        query_tokens = self.tokenize(query)
-        scores = []
+        """Score documents matching the query, best first.
 
-        for idx, doc in enumerate(self.corpus):
-            score = 0.0
-            doc_len = self.doc_lengths[idx]
-            term_freqs: Dict[str, int] = defaultdict(int)
-            for word in doc:
-                term_freqs[word] += 1
+        Only the postings of the query terms are visited, so documents that
+        share no term with the query are not returned (their score is 0).
+        """
+        return self.score_many([query])[0]
 
-            for token in query_tokens:
-                if token in self.idf:
-                    tf = term_freqs[token]
-                    idf = self.idf[token]
-                    numerator = tf * (self.k1 + 1)
-                    denominator = tf + self.k1 * (1 - self.b + self.b * doc_len / self.avgdl)
-                    score += idf * numerator / denominator
+    def top_k(self, query: str, k: int, fuzzy: bool = False) -> List[tuple]:
+        """The k best (doc_id, score) pairs with score > 0, without ranking every match"""
+        if self._matrix is not None:
+            return self.score_many([query], k, fuzzy)[0]
+        with telemetry.span("bm25.score"):
+            return self._top_k_maxscore(self.query_tokens(query, fuzzy), k)
 
-            scores.append((idx, score))
+    def score_many(self, queries: List[str], k: Optional[int] = None,
+                   fuzzy: bool = False) -> List[List[tuple]]:
+        """Score a batch of queries, walking each distinct term's postings once.
 
-        return sorted(scores, key=lambda x: x[1], reverse=True)
+        Args:
+            queries: Query strings
+            k: Keep only the k best documents per query (all matches when None)
+            fuzzy: Replace query terms missing from the index by close vocabulary terms
+        """
+        with telemetry.span("bm25.score", queries=len(queries)):
+            token_lists = [self.query_tokens(query, fuzzy) for query in queries]
+            if self._matrix is not None:
+                return self._score_numpy(token_lists, k)
 
+            contributions: Dict[str, List[Tuple[int, float]]] = {}
+            for tokens in token_lists:
+                for token in tokens:
+                    if token not in contributions:
+                        contributions[token] = self._term_contributions(token)
+            k = None if k is None else max(k, 0)
+            return [self._accumulate(tokens, contributions, k) for tokens in token_lists]
 
-# ============ SEARCH FUNCTIONS ============
-def _load_csv(filepath: Path) -> List[Dict[str, str]]:
-    """Load CSV and return list of dicts"""
+    def top_k_grouped(self, query: str, k: int, starts: List[int],
+                      fuzzy: bool = False) -> Tuple[List[List[tuple]], List[tuple]]:
+        """Top k per contiguous doc-id group plus the merged top k, in one pass"""
+        return self.top_k_grouped_many([query], k, starts, fuzzy)[0]
+
+    def top_k_grouped_many(self, queries: List[str], k: int, starts: List[int],
+                           fuzzy: bool = False) -> List[Tuple[List[List[tuple]], List[tuple]]]:
+        """Batch top_k_grouped(): group i owns doc ids starts[i] <= id < starts[i + 1]"""
+        with telemetry.span("bm25.score", queries=len(queries)):
+            return self._top_k_grouped_many(queries, k, starts, fuzzy)
+
+    def _top_k_grouped_many(self, queries: List[str], k: int, starts: List[int],
+                            fuzzy: bool) -> List[Tuple[List[List[tuple]], List[tuple]]]:
+        token_lists = [self.query_tokens(query, fuzzy) for query in queries]
+        bounds = list(zip(starts, starts[1:] + [self.N]))
+        results = []
+
+        if self._matrix is not None:
+            for scores in self._score_arrays(token_lists):
+                groups = [[(doc_id + lo, score) for doc_id, score in self._rank_array(scores[lo:hi], k)]
+                          for lo, hi in bounds]
+                results.append((groups, self._rank_array(scores, k)))
+            return results
+
+        contributions: Dict[str, List[Tuple[int, float]]] = {}
+        for tokens in token_lists:
+            for token in tokens:
+                if token not in contributions:
+                    contributions[token] = self._term_contributions(token)
+
+        rank_key = lambda x: (-x[1], x[0])
+        for tokens in token_lists:
+            scores: Dict[int, float] = {}
+            for token in tokens:
+                for doc_id, value in contributions[token]:
+                    scores[doc_id] = scores.get(doc_id, 0.0) + value
+            telemetry.count("docs_scored", len(scores))
+            buckets: List[List[tuple]] = [[] for _ in starts]
+            for item in scores.items():
+                buckets[bisect_right(starts, item[0]) - 1].append(item)
+            groups = [heapq.nsmallest(k, bucket, key=rank_key) for bucket in buckets]
+            results.append((groups, heapq.nsmallest(k, scores.items(), key=rank_key)))
+        return results
+
+    def memory_stats(self) -> Dict[str, int]:
+        """Approximate resident bytes of the fitted index (postings, vocabulary, per-doc arrays)"""
+        postings_bytes = sum(plist.nbytes() for plist in self.postings.values())
+        vocabulary = sum(sys.getsizeof(term) for term in self.postings)
+        tables = sum(sys.getsizeof(table) for table in (self.postings, self.idf, self.term_max, self.doc_freqs))
+        floats = sys.getsizeof(0.0) * (len(self.idf) + len(self.term_max) + len(self.doc_norms))
+        per_doc = sys.getsizeof(self.doc_lengths) + sys.getsizeof(self.doc_norms)
+        matrix = sum(a.nbytes for a in self._matrix[1:]) if self._matrix is not None else 0
+        return {
+            "docs": self.N,
+            "terms": len(self.postings),
+            "postings": sum(len(plist) for plist in self.postings.values()),
+            "postings_bytes": postings_bytes,
+            "bytes": postings_bytes + vocabulary + tables + floats + per_doc + matrix,
+        }
+
+    def to_state(self) -> Dict[str, Any]:
+        """Export the fitted index as plain builtins (for the on-disk snapshot).
+
+        Packed arrays are stored as raw bytes in native byte order, which the
+        snapshot header records.
+        """
+        return {
+            "k1": self.k1,
+            "b": self.b,
+            "N": self.N,
+            "avgdl": self.avgdl,
+            "doc_lengths": array("i", self.doc_lengths).tobytes(),
+            "doc_norms": array("d", self.doc_norms).tobytes(),
+            "idf": self.idf,
+            "postings": {term: plist.to_bytes() for term, plist in self.postings.items()},
+            "term_max": self.term_max,
+            "analyzer": self.analyzer.signature,
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any], engine: Optional[str] = None) -> "BM25":
+        """Rebuild a fitted index from `to_state()` output without re-tokenizing"""
+        bm25 = cls(state["k1"], state["b"], engine)
+        bm25.N = state["N"]
+        bm25.avgdl = state["avgdl"]
+        bm25.doc_lengths = array("i", state["doc_lengths"])
+        bm25.doc_norms = array("d", state["doc_norms"]).tolist()
+        bm25.idf = state["idf"]
+        bm25.postings = {term: PostingList.from_bytes(doc_ids, tfs)
+                         for term, (doc_ids, tfs) in state["postings"].items()}
+        for word, plist in bm25.postings.items():
+            bm25.doc_freqs[word] = len(plist)
+        bm25.term_max = state.get("term_max") or bm25._compute_term_max()
+        bm25._prepare_engine()
+        return bm25
+
+
+# ============ DATA LOADING ============
+def iter_csv(filepath: Path) -> Iterator[Dict[str, str]]:
+    """Stream the rows of a CSV file as dicts, one at a time (nothing if it is missing)"""
     if not filepath.exists():
-        return []
+        return
+    if telemetry.enabled:
+        telemetry.count("bytes_read", filepath.stat().st_size)
+    import csv  # only needed when parsing, not when serving from the snapshot
     with open(filepath, 'r', encoding='utf-8') as f:
-        return list(csv.DictReader(f))
+        yield from csv.DictReader(f)
+
+
+@telemetry.traced("core.load_csv")
+def _load_csv(filepath: Path) -> RowStore:
+    """Load CSV rows into a columnar RowStore (streamed, no list of dicts in between)"""
+    return RowStore.from_rows(iter_csv(filepath))
 
 
+@telemetry.traced("core.load_json")
 def _load_json(filepath: Path) -> Dict[str, Any]:
     """Load JSON file"""
     if not filepath.exists():
         return {}
+    if telemetry.enabled:
+        telemetry.count("bytes_read", filepath.stat().st_size)
+    import json
     with open(filepath, 'r', encoding='utf-8') as f:
         return json.load(f)
 
 
-def _search_csv(filepath: Path, search_cols: List[str], output_cols: List[str], 
-                query: str, max_results: int) -> List[Dict[str, str]]:
-    """Core search function using BM25"""
-    if not filepath.exists():
-        return []
+# ============ INDEX CACHE ============
+def _file_fingerprint(filepath: Path) -> Optional[Tuple[int, int]]:
+    """Cheap change detector for a data file: (mtime_ns, size), or None if missing"""
+    try:
+        st = filepath.stat()
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
 
-    data = _load_csv(filepath)
-    if not data:
-        return []
 
-    # Build documents from search columns
-    documents = [" ".join(str(row.get(col, "")) for col in search_cols) for row in data]
+class DataCache:
+    """Process-wide cache of values derived from data files.
+
+    Entries are keyed by (file path, kind) and remember the fingerprint of the
+    file they were built from; a lookup rebuilds the value only when the file
+    has changed since. A tuple of paths keys a value derived from several
+    files, which is rebuilt when any of them changes. Cached values are shared
+    and must not be mutated.
+    """
+
+    def __init__(self):
+        self._entries: Dict[Tuple[Any, Any], Tuple[Any, Any]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(filepath: Union[Path, Tuple[Path, ...]], kind: Any) -> Tuple[Any, Any]:
+        if isinstance(filepath, tuple):
+            return (tuple(str(p) for p in filepath), kind)
+        return (str(filepath), kind)
+
+    def get(self, filepath: Union[Path, Tuple[Path, ...]], kind: Any, build: Callable[[Any], Any]) -> Any:
+        """Return the cached value for (filepath, kind), building it if missing or stale"""
+        key = self._key(filepath, kind)
+        if isinstance(filepath, tuple):
+            fingerprint = tuple(_file_fingerprint(p) for p in filepath)
+        else:
+            fingerprint = _file_fingerprint(filepath)
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is not None and entry[0] == fingerprint:
+            return entry[1]
+
+        value = build(filepath)
+        with self._lock:
+            self._entries[key] = (fingerprint, value)
+        return value
+
+    def peek(self, filepath: Union[Path, Tuple[Path, ...]], kind: Any) -> Any:
+        """The value cached for (filepath, kind) even if the file changed since, or None"""
+        with self._lock:
+            entry = self._entries.get(self._key(filepath, kind))
+        return entry[1] if entry is not None else None
+
+    def holds(self, filepath: Path) -> bool:
+        """True if any value derived from filepath is cached, current or stale"""
+        path = str(filepath)
+        with self._lock:
+            return any(k[0] == path or (isinstance(k[0], tuple) and path in k[0]) for k in self._entries)
+
+    def invalidate(self, filepath: Optional[Path] = None) -> None:
+        """Drop cached values for one file, or for every file when filepath is None"""
+        with self._lock:
+            if filepath is None:
+                self._entries.clear()
+                return
+            path = str(filepath)
+            stale = [k for k in self._entries
+                     if k[0] == path or (isinstance(k[0], tuple) and path in k[0])]
+            for key in stale:
+                del self._entries[key]
+
+
+class DomainIndex:
+    """Stored rows of a domain CSV together with their fitted BM25 index.
+
+    After an incremental update doc ids no longer equal row positions:
+    doc_rows maps doc id -> row (-1 for deleted documents) and documents
+    maps each row key to its (doc_id, content hash).
+    """
+
+    __slots__ = ("rows", "bm25", "doc_rows", "documents")
+
+    def __init__(self, rows: RowStore, bm25: BM25, doc_rows: Optional[array] = None,
+                 documents: Optional[Dict[Any, Tuple[int, int]]] = None):
+        self.rows = rows
+        self.bm25 = bm25
+        self.doc_rows = doc_rows
+        self.documents = documents
+
+    def row_ranked(self, ranked: List[tuple], k: int, rank: Callable[[int], List[tuple]]) -> List[tuple]:
+        """The k best (doc_id, score) pairs of `ranked` as (row, score) pairs, ties in row order.
+
+        The scorers break ties by doc id, which is the row order of a fresh fit
+        but not after an update. When the k-th score is tied, rank(n) is asked
+        for more candidates until every document with that score is included,
+        so the result equals that of a fresh fit over the same rows.
+        """
+        if self.doc_rows is None:
+            return ranked
+        n = k
+        while ranked and len(ranked) == n and ranked[-1][1] == ranked[k - 1][1]:
+            n *= 2
+            ranked = rank(n)
+        doc_rows = self.doc_rows
+        return sorted(((doc_rows[doc_id], score) for doc_id, score in ranked), key=lambda x: (-x[1], x[0]))[:k]
+
+
+_cache = DataCache()
+
+
+def _load_rows(filepath: Path) -> RowStore:
+    """Rows of a CSV file in a columnar store, from the compiled snapshot when it is current"""
+    entry = _snapshot_entry(filepath)
+    if entry is not None:
+        return RowStore.from_state(entry["table"]["store"])
+    return _load_csv(filepath)
+
+
+def _cached_rows(filepath: Path) -> RowStore:
+    """Rows of a CSV file, parsed once per file version"""
+    return _cache.get(filepath, "rows", _load_rows)
+
+
+def _documents(rows: Iterable[Dict[str, str]], search_cols: List[str]) -> Iterator[str]:
+    """Searchable text of each row, generated one row at a time"""
+    for row in rows:
+        yield " ".join(str(row.get(col, "")) for col in search_cols)
+
+
+def _build_domain_index(filepath: Path, search_cols: List[str]) -> DomainIndex:
+    """Parse a CSV and fit a BM25 index over its search columns"""
+    rows = _cached_rows(filepath)
+    entry = _snapshot_entry(filepath)
+    if entry is not None and entry["table"]["search_cols"] == list(search_cols):
+        return DomainIndex(rows, BM25.from_state(entry["table"]["bm25"]))
+
+    bm25 = BM25()
+    bm25.fit(_documents(rows, search_cols))
+    return DomainIndex(rows, bm25)
+
+
+def _keyed_documents(rows: RowStore, search_cols: List[str],
+                     key_col: Optional[str]) -> Iterator[Tuple[Tuple[Any, int], str]]:
+    """((row key, occurrence), document text) per row; rows without a key column are keyed by text"""
+    seen: Dict[Any, int] = {}
+    for row, text in zip(rows, _documents(rows, search_cols)):
+        key = row.get(key_col) if key_col else text
+        occurrence = seen.get(key, 0)
+        seen[key] = occurrence + 1
+        yield (key, occurrence), text
+
+
+def _key_column(filepath: Path) -> Optional[str]:
+    for config in CSV_CONFIG.values():
+        if config["file"] == filepath.name:
+            return config.get("key_col")
+    return None
+
+
+def _update_domain_index(previous: DomainIndex, filepath: Path, search_cols: List[str]) -> DomainIndex:
+    """Bring an in-memory domain index up to date with its changed CSV.
+
+    Rows are matched to indexed documents by key column and a hash of their
+    searchable text. Unchanged rows keep their doc ids; new and edited rows
+    are analyzed and added as one delta segment; removed and edited rows are
+    tombstoned (see segments.SegmentedBM25). Only the changed rows are
+    analyzed. When more than INCREMENTAL_MAX_CHANGE of the rows changed the
+    index is rebuilt from scratch instead.
+    """
+    from segments import SegmentedBM25
+
+    rows = _cached_rows(filepath)
+    key_col = _key_column(filepath)
+    documents = previous.documents
+    if documents is None:
+        documents = {key: (doc_id, hash(text)) for doc_id, (key, text)
+                     in enumerate(_keyed_documents(previous.rows, search_cols, key_col))}
+
+    current: Dict[Any, Tuple[int, int]] = {}
+    kept: List[Tuple[int, int]] = []
+    added: List[Tuple[Any, int, int, str]] = []
+    removed: List[int] = []
+    stale = dict(documents)
+    for row, (key, text) in enumerate(_keyed_documents(rows, search_cols, key_col)):
+        digest = hash(text)
+        known = stale.pop(key, None)
+        if known is not None and known[1] == digest:
+            current[key] = known
+            kept.append((known[0], row))
+            continue
+        if known is not None:
+            removed.append(known[0])
+        added.append((key, row, digest, text))
+    removed.extend(doc_id for doc_id, _ in stale.values())
+
+    if len(added) + len(removed) > INCREMENTAL_MAX_CHANGE * max(len(rows), len(documents), 1):
+        return _build_domain_index(filepath, search_cols)
+
+    with telemetry.span("core.update_index", added=len(added), removed=len(removed)):
+        bm25 = previous.bm25
+        new_ids: List[int] = []
+        if added or removed:
+            if not isinstance(bm25, SegmentedBM25):
+                bm25 = SegmentedBM25.from_bm25(bm25)
+            # Deleted documents are re-analyzed from the previous rows to lower their terms' df
+            old_rows = [doc_id if previous.doc_rows is None else previous.doc_rows[doc_id] for doc_id in removed]
+            deleted = [(doc_id, bm25.tokenize(text)) for doc_id, text
+                       in zip(removed, _documents([previous.rows[row] for row in old_rows], search_cols))]
+            bm25, new_ids = bm25.updated([bm25.tokenize(text) for _, _, _, text in added], deleted)
+
+        doc_rows = array("i", [-1]) * len(bm25.doc_lengths)
+        for doc_id, row in kept:
+            doc_rows[doc_id] = row
+        for (key, row, digest, _), doc_id in zip(added, new_ids):
+            doc_rows[doc_id] = row
+            current[key] = (doc_id, digest)
+    telemetry.count("docs_indexed", len(added))
+    return DomainIndex(rows, bm25, doc_rows, current)
+
+
+def _domain_index(filepath: Path, search_cols: List[str]) -> DomainIndex:
+    """Fitted index for a CSV file, rebuilt only when the file changes.
+
+    A process that already holds an index for an older version of the file
+    updates it incrementally (see _update_domain_index) instead of refitting.
+    """
+    kind = ("bm25",) + tuple(search_cols)
+
+    def build(path: Path) -> DomainIndex:
+        previous = _cache.peek(path, kind)
+        if previous is not None:
+            return _update_domain_index(previous, path, search_cols)
+        return _build_domain_index(path, search_cols)
+
+    return _cache.get(filepath, kind, build)
+
+
+class FederatedIndex:
+    """Every domain table indexed as one corpus with global IDF and avgdl.
+
+    Documents are laid out domain after domain, so domain i owns the doc ids
+    starts[i] <= doc_id < starts[i + 1].
+    """
+
+    __slots__ = ("domains", "starts", "rows", "bm25", "_router")
+
+    def __init__(self, domains: List[str], starts: List[int],
+                 rows: Dict[str, RowStore], bm25: BM25):
+        self.domains = domains
+        self.starts = starts
+        self.rows = rows
+        self.bm25 = bm25
+        self._router: Optional["DomainRouter"] = None
+
+    @property
+    def router(self) -> "DomainRouter":
+        if self._router is None:
+            self._router = DomainRouter(self)
+        return self._router
+
+
+class DomainRouter:
+    """Routes queries to domains using statistics of the federated index.
+
+    Each vocabulary term's IDF is split across the domains in proportion to
+    how many of the term's documents each domain holds. Routing a query sums
+    those precomputed masses per domain, a few dict lookups per query term.
+
+    Two priors from CSV_CONFIG cover words the data does not reflect: a
+    domain's route_hints add ROUTE_HINT_WEIGHT to that domain, and its
+    aliases (the domain's own name) put the highest IDF of the index
+    entirely on it, so "plugin" or "token" always route to their domain.
+    """
+
+    def __init__(self, index: FederatedIndex):
+        self.domains = list(index.domains)
+        bm25 = index.bm25
+        self.mass: Dict[str, Tuple[float, ...]] = {}
+        for term, plist in bm25.postings.items():
+            counts = [0] * len(self.domains)
+            for doc_id in plist:
+                counts[bisect_right(index.starts, doc_id) - 1] += 1
+            idf, df = bm25.idf[term], len(plist)
+            self.mass[term] = tuple(idf * c / df for c in counts)
+
+        alias_mass = max(bm25.idf.values(), default=1.0)
+        for i, domain in enumerate(self.domains):
+            for hint in CSV_CONFIG[domain]["route_hints"]:
+                for term in bm25.analyze_query(hint):
+                    mass = list(self.mass.get(term, (0.0,) * len(self.domains)))
+                    mass[i] += ROUTE_HINT_WEIGHT
+                    self.mass[term] = tuple(mass)
+        for i, domain in enumerate(self.domains):
+            for alias in CSV_CONFIG[domain]["aliases"]:
+                for term in bm25.analyze_query(alias):
+                    self.mass[term] = tuple(alias_mass if j == i else 0.0 for j in range(len(self.domains)))
+        self._tokens = bm25.query_tokens
+
+    def route(self, query: str, fuzzy: bool = False) -> List[Tuple[str, float]]:
+        """(domain, confidence) pairs, best first; confidences sum to 1.
+
+        Returns an empty list when no query term occurs in any domain.
+        """
+        totals = [0.0] * len(self.domains)
+        for token in self._tokens(query, fuzzy):
+            mass = self.mass.get(token)
+            if mass:
+                for i, value in enumerate(mass):
+                    totals[i] += value
+        total = sum(totals)
+        if total <= 0:
+            return []
+        routes = [(domain, value / total) for domain, value in zip(self.domains, totals) if value > 0]
+        return sorted(routes, key=lambda x: -x[1])
+
+
+def _federated_documents(tables: Dict[str, RowStore]) -> Tuple[List[str], List[int], Iterator[str]]:
+    """(domains, start offsets, documents) for the domains present in `tables`.
+
+    Documents are generated lazily, domain after domain.
+    """
+    domains = [domain for domain in CSV_CONFIG if domain in tables]
+    starts, total = [], 0
+    for domain in domains:
+        starts.append(total)
+        total += len(tables[domain])
+    documents = (doc for domain in domains
+                 for doc in _documents(tables[domain], CSV_CONFIG[domain]["search_cols"]))
+    return domains, starts, documents
+
+
+def _federated_paths() -> Tuple[Path, ...]:
+    return tuple(DATA_DIR / config["file"] for config in CSV_CONFIG.values())
+
+
+def _build_federated_index(paths: Tuple[Path, ...]) -> FederatedIndex:
+    tables = {domain: _cached_rows(path)
+              for domain, path in zip(CSV_CONFIG.keys(), paths) if path.exists()}
+    domains, starts, documents = _federated_documents(tables)
+
+    entry = _snapshot_federated(paths)
+    if entry is not None and entry["domains"] == domains:
+        return FederatedIndex(domains, starts, tables, BM25.from_state(entry["bm25"]))
 
-    # BM25 search
     bm25 = BM25()
     bm25.fit(documents)
-    ranked = bm25.score(query)
+    return FederatedIndex(domains, starts, tables, bm25)
+
+
+def _federated_index() -> FederatedIndex:
+    """One index over all domains, rebuilt when any domain file changes"""
+    return _cache.get(_federated_paths(), "federated", _build_federated_index)
+
+
+def invalidate(domain: Optional[str] = None) -> None:
+    """Forget cached rows and indexes for a domain (or everything when domain is None).
+
+    Data files are re-checked on every lookup anyway; this is for hosts that
+    want to force a reload, e.g. after replacing files within the same mtime tick.
+    """
+    if domain is None:
+        _cache.invalidate()
+        _results.clear()
+        return
+    config = CSV_CONFIG.get(domain)
+    if config is None:
+        raise ValueError(f"Unknown domain: {domain}")
+    _cache.invalidate(DATA_DIR / config["file"])
+    _results.clear()
+
+
+def warm(domains: Optional[Iterable[str]] = None) -> None:
+    """Load and index the given domains (all by default) plus the reasoning rules.
+
+    Embedding hosts can call this once at startup so that the first query does
+    not pay the parsing and fitting cost.
+    """
+    for domain in (CSV_CONFIG.keys() if domains is None else domains):
+        config = CSV_CONFIG.get(domain)
+        if config is None:
+            raise ValueError(f"Unknown domain: {domain}")
+        filepath = DATA_DIR / config["file"]
+        if filepath.exists():
+            _domain_index(filepath, config["search_cols"])
+    if domains is None:
+        _federated_index()
+    get_reasoning_rules()
+
+
+def index_stats() -> Dict[str, Any]:
+    """Resident memory of the stored rows (per column) and BM25 indexes of every domain.
+
+    Loads whatever is not loaded yet, so the figures describe a warm process.
+
+    Returns:
+        {"domains": {domain: {"file", "rows", "rows_bytes", "columns": [{"column",
+        "encoding", "distinct", "bytes"}], "index": BM25.memory_stats()}},
+        "federated": BM25.memory_stats(), "total_bytes", "result_cache": result_cache_stats()}
+    """
+    domains: Dict[str, Any] = {}
+    total = 0
+    for domain, config in CSV_CONFIG.items():
+        filepath = DATA_DIR / config["file"]
+        if not filepath.exists():
+            continue
+        index = _domain_index(filepath, config["search_cols"])
+        columns = index.rows.stats()
+        rows_bytes = sum(column["bytes"] for column in columns)
+        memory = index.bm25.memory_stats()
+        domains[domain] = {"file": config["file"], "rows": len(index.rows), "rows_bytes": rows_bytes,
+                           "columns": columns, "index": memory}
+        total += rows_bytes + memory["bytes"]
+    federated = _federated_index().bm25.memory_stats()
+    total += federated["bytes"]
+    return {"domains": domains, "federated": federated, "total_bytes": total,
+            "result_cache": result_cache_stats()}
+
+
+def _data_version_of(paths: Tuple[Path, ...]) -> str:
+    import hashlib
+    digest = hashlib.sha256()
+    for path in paths:
+        digest.update(f"{path.name}:{_sha256(path) if path.exists() else '-'}\n".encode())
+    return digest.hexdigest()[:12]
+
+
+def data_version() -> str:
+    """Short hash of the content of every data file; unlike mtimes it changes only with the data"""
+    names = [config["file"] for config in CSV_CONFIG.values()] + [RULES_FILE]
+    return _cache.get(tuple(DATA_DIR / name for name in names), "data_version", _data_version_of)
+
+
+# ============ INDEX SNAPSHOT ============
+_SNAPSHOT_MAGIC = b"AUIX"
+
+
+def _snapshot_header() -> bytes:
+    # marshal output is only stable within one Python minor version, packed
+    # postings are stored in native byte order, and the stored postings are
+    # only valid for the analyzer chain that produced them
+    python = f"py{sys.version_info[0]}.{sys.version_info[1]}"
+    return _SNAPSHOT_MAGIC + (f" v{SNAPSHOT_VERSION} {python} {sys.byteorder} "
+                              f"{INDEX_ANALYZER.signature}\n").encode("ascii")
+
+
+def _sha256(filepath: Path) -> str:
+    import hashlib
+    return hashlib.sha256(filepath.read_bytes()).hexdigest()
+
+
+def _source_record(filepath: Path) -> List[Any]:
+    """[mtime_ns, size, sha256] of a source file, as recorded in the snapshot"""
+    mtime_ns, size = _file_fingerprint(filepath)
+    return [mtime_ns, size, _sha256(filepath)]
+
+
+def _source_is_current(filepath: Path, record: List[Any]) -> bool:
+    """True when a source file still matches its snapshot record.
+
+    mtime and size are trusted when they match; otherwise the content hash
+    decides, so a touched-but-identical file does not invalidate the snapshot.
+    """
+    fingerprint = _file_fingerprint(filepath)
+    if fingerprint is None:
+        return False
+    if list(fingerprint) == record[:2]:
+        return True
+    return fingerprint[1] == record[1] and _sha256(filepath) == record[2]
+
+
+def _snapshot_sources() -> Dict[str, Path]:
+    sources = {config["file"]: DATA_DIR / config["file"] for config in CSV_CONFIG.values()}
+    sources[RULES_FILE] = DATA_DIR / RULES_FILE
+    return sources
+
+
+def _compile_snapshot(workers: int = 1) -> Dict[str, Any]:
+    """Parse and index every source file straight from disk (BM25 fits sharded over `workers` processes)"""
+    payload: Dict[str, Any] = {"sources": {}, "tables": {}, "rules": None}
+    for name, filepath in _snapshot_sources().items():
+        if filepath.exists():
+            payload["sources"][name] = _source_record(filepath)
+
+    tables: Dict[str, RowStore] = {}
+    for domain, config in CSV_CONFIG.items():
+        name = config["file"]
+        if name not in payload["sources"]:
+            continue
+        rows = tables[domain] = _load_csv(DATA_DIR / name)
+        bm25 = BM25()
+        bm25.fit(_documents(rows, config["search_cols"]), workers=workers)
+        payload["tables"][name] = {
+            "store": rows.to_state(),
+            "search_cols": list(config["search_cols"]),
+            "bm25": bm25.to_state(),
+        }
+
+    # The federated index reuses the parsed rows instead of reading every CSV again
+    domains, _, documents = _federated_documents(tables)
+    bm25 = BM25()
+    bm25.fit(documents, workers=workers)
+    payload["federated"] = {"domains": domains, "bm25": bm25.to_state()}
+
+    if RULES_FILE in payload["sources"]:
+        payload["rules"] = _load_json(DATA_DIR / RULES_FILE)
+    payload["completions"] = CompletionIndex.build(tables, payload["rules"] or {}).to_state()
+    return payload
+
+
+def build_snapshot(path: Optional[Path] = None, workers: int = 1) -> Dict[str, Any]:
+    """Compile all data files into a versioned binary snapshot.
+
+    The snapshot holds the stored rows, vocabulary, IDF table, postings and
+    document lengths of every domain plus the reasoning rules, each tagged with
+    the hash of the source file it came from. Later processes load it with a
+    single read instead of re-parsing and re-fitting everything.
 
-    # Get top results with score > 0
+    With workers > 1 large indexes are built in a process pool; the
+    snapshot is byte-identical to a single-process build.
+
+    Returns:
+        dict with the snapshot path, its size in bytes and row counts per file
+    """
+    path = Path(path) if path else SNAPSHOT_FILE
+    payload = _compile_snapshot(workers)
+    blob = _snapshot_header() + marshal.dumps(payload)
+
+    # Write to a sibling temp file and rename, so readers never see a partial file
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp_path.write_bytes(blob)
+    os.replace(tmp_path, path)
+    _cache.invalidate(path)
+
+    return {
+        "path": str(path),
+        "bytes": len(blob),
+        "tables": {name: table["store"]["n"] for name, table in payload["tables"].items()},
+    }
+
+
+@telemetry.traced("core.read_snapshot")
+def _read_snapshot(path: Path) -> Optional[Dict[str, Any]]:
+    """Load a snapshot payload, or None if it is missing or was written by another version"""
+    try:
+        blob = path.read_bytes()
+    except OSError:
+        return None
+    telemetry.count("bytes_read", len(blob))
+    header = _snapshot_header()
+    if not blob.startswith(header):
+        return None
+    try:
+        return marshal.loads(memoryview(blob)[len(header):])
+    except (EOFError, ValueError, TypeError):
+        return None
+
+
+def _snapshot_payload() -> Optional[Dict[str, Any]]:
+    return _cache.get(SNAPSHOT_FILE, "snapshot", _read_snapshot)
+
+
+def _snapshot_entry(filepath: Path) -> Optional[Dict[str, Any]]:
+    """Snapshot record ({"source", "table"/"rules"}) for a data file, if it is current.
+
+    A stale snapshot is recompiled in place (best effort) so that only the
+    first process after a data change pays for the rebuild.
+    """
+    if filepath.parent != DATA_DIR or not filepath.exists():
+        return None
+    payload = _snapshot_payload()
+    if payload is None and not SNAPSHOT_FILE.exists():
+        return None
+
+    name = filepath.name
+    record = payload["sources"].get(name) if payload is not None else None
+    if record is None or not _source_is_current(filepath, record):
+        if _cache.holds(filepath):
+            # A long-lived process refreshes what it holds from the file itself
+            # (incrementally where possible); the next cold start recompiles
+            return None
+        try:
+            build_snapshot()
+        except OSError:
+            return None
+        payload = _snapshot_payload()
+        if payload is None or name not in payload["sources"]:
+            return None
+
+    if name == RULES_FILE:
+        return {"rules": payload["rules"]}
+    table = payload["tables"].get(name)
+    return {"table": table} if table is not None else None
+
+
+def _snapshot_federated(paths: Tuple[Path, ...]) -> Optional[Dict[str, Any]]:
+    """Federated index record of the snapshot, if every domain file is current"""
+    for path in paths:
+        if path.exists() and _snapshot_entry(path) is None:
+            return None
+    payload = _snapshot_payload()
+    return payload.get("federated") if payload is not None else None
+
+
+def _snapshot_completions(paths: Tuple[Path, ...]) -> Optional[Dict[str, Any]]:
+    """Completion index record of the snapshot, if every source file is current"""
+    for path in paths:
+        if path.exists() and _snapshot_entry(path) is None:
+            return None
+    payload = _snapshot_payload()
+    return payload.get("completions") if payload is not None else None
+
+
+# ============ RESULT CACHE ============
+# Results of search, search_all and match_reasoning_rule; disk tier shared
+# across processes when $AGENTIC_UI_RESULT_CACHE_DIR is set
+_results = ResultCache(disk_dir=os.environ.get(DISK_DIR_ENV) or None)
+
+
+def _data_fingerprint() -> Tuple[Any, ...]:
+    """Fingerprint of every data file a query result can depend on"""
+    names = [config["file"] for config in CSV_CONFIG.values()] + [RULES_FILE]
+    return (str(DATA_DIR),) + tuple(_file_fingerprint(DATA_DIR / name) for name in names)
+
+
+def _cached_result(key: Tuple[Any, ...], query: str, compute: Callable[[], Any]) -> Any:
+    """compute() through the result cache; a hit echoes the caller's own query string"""
+    fingerprint = _data_fingerprint()
+    value = _results.get(key, fingerprint)
+    if value is MISS:
+        telemetry.count("result_cache_misses")
+        value = compute()
+        _results.put(key, fingerprint, value)
+        return value
+    telemetry.count("result_cache_hits")
+    if isinstance(value, dict) and "query" in value:
+        value["query"] = query
+    return value
+
+
+def configure_result_cache(max_entries: int = DEFAULT_MAX_ENTRIES, ttl: Optional[float] = DEFAULT_TTL,
+                           disk_dir: Optional[str] = None) -> None:
+    """Replace the query result cache (max_entries=0 disables it; disk_dir enables the shared disk tier)"""
+    global _results
+    _results = ResultCache(max_entries, ttl, disk_dir)
+
+
+def result_cache_stats() -> Dict[str, Any]:
+    """Hit, miss, eviction and invalidation counters of the query result cache"""
+    return _results.stats()
+
+
+# ============ SEARCH FUNCTIONS ============
+def _collect_results(rows: RowStore, ranked: List[tuple], output_cols: List[str],
+                     max_results: int) -> List[Dict[str, str]]:
+    """Materialize the top ranked rows with score > 0 (the only rows decoded into dicts)"""
     results = []
     for idx, score in ranked[:max_results]:
         if score > 0:
-            row = data[idx]
+            row = rows[idx]
             result = {col: row.get(col, "") for col in output_cols if col in row}
             result["_score"] = score
             results.append(result)
-
     return results
 
 
+def _search_csv(filepath: Path, search_cols: List[str], output_cols: List[str], 
+                query: str, max_results: int, fuzzy: bool = False) -> List[Dict[str, str]]:
+    """Core search function using BM25"""
+    if not filepath.exists():
+        return []
+
+    index = _domain_index(filepath, search_cols)
+    if not index.rows:
+        return []
+
+    top_k = partial(index.bm25.top_k, query, fuzzy=fuzzy)
+    ranked = index.row_ranked(top_k(max_results), max_results, top_k)
+    return _collect_results(index.rows, ranked, output_cols, max_results)
+
+
+def _search_csv_many(filepath: Path, search_cols: List[str], output_cols: List[str],
+                     queries: List[str], max_results: int,
+                     fuzzy: bool = False) -> List[List[Dict[str, str]]]:
+    """Batch variant of _search_csv: one scoring pass for all queries"""
+    if not filepath.exists():
+        return [[] for _ in queries]
+
+    index = _domain_index(filepath, search_cols)
+    if not index.rows:
+        return [[] for _ in queries]
+
+    unique = list(dict.fromkeys(queries))
+    ranked = dict(zip(unique, index.bm25.score_many(unique, max_results, fuzzy)))
+    ranked = {query: index.row_ranked(hits, max_results, partial(index.bm25.top_k, query, fuzzy=fuzzy))
+              for query, hits in ranked.items()}
+    return [_collect_results(index.rows, ranked[query], output_cols, max_results) for query in queries]
+
+
+def route_domains(query: str, fuzzy: bool = False) -> List[Tuple[str, float]]:
+    """Rank domains for a query by the indexed data: [(domain, confidence), ...]"""
+    return _federated_index().router.route(query, fuzzy)
+
+
+def corrections(query: str, domain: Optional[str] = None) -> Dict[str, str]:
+    """Typo corrections fuzzy search would apply: {query term: indexed term}.
+
+    Uses the vocabulary of `domain`, or of every domain when None.
+    """
+    if domain is None:
+        return _federated_index().bm25.corrections(query)
+    config = CSV_CONFIG.get(domain, CSV_CONFIG["component"])
+    filepath = DATA_DIR / config["file"]
+    if not filepath.exists():
+        return {}
+    return _domain_index(filepath, config["search_cols"]).bm25.corrections(query)
+
+
 def detect_domain(query: str) -> str:
-    """Auto-detect the most relevant domain from query"""
-    query_lower = query.lower()
-
-    domain_keywords = {
-        "component": [
-            "bubble", "chat", "message", "layout", "editor", "markdown", 
-            "thought", "thinking", "task", "list", "workspace", "history",
-            "loading", "robot", "welcome", "suggestion", "alert", "tool",
-            "气泡", "对话", "布局", "编辑器", "思维", "任务", "工作区", "历史"
-        ],
-        "plugin": [
-            "plugin", "chart", "code", "katex", "mermaid", "syntax",
-            "highlight", "formula", "diagram", "图表", "代码", "公式", "插件"
-        ],
-        "hook": [
-            "hook", "use", "scroll", "size", "speech", "click", "language",
-            "钩子", "滚动", "尺寸", "语音"
-        ],
-        "token": [
-            "token", "color", "padding", "margin", "font", "border", 
-            "shadow", "motion", "颜色", "间距", "字体", "边框", "阴影"
-        ]
+    """Most relevant domain for the query ("component" when nothing matches)"""
+    routes = route_domains(query)
+    return routes[0][0] if routes else "component"
+
+
+def _routed_result(index: FederatedIndex, query: str, groups: List[List[tuple]],
+                   max_results: int, fuzzy: bool = False) -> Dict[str, Any]:
+    """search() result for domain=None: merged hits from every domain routed above threshold"""
+    routes = index.router.route(query, fuzzy)
+    selected = [domain for domain, confidence in routes if confidence >= ROUTE_THRESHOLD]
+    # Nothing routes: fall back to component, like detect_domain()
+    selected = selected or [domain for domain, _ in routes[:1]] or ["component"]
+
+    hits = []
+    for domain in selected:
+        if domain not in index.domains:
+            continue
+        i = index.domains.index(domain)
+        hits.extend((doc_id, score, i) for doc_id, score in groups[i])
+    hits.sort(key=lambda x: (-x[1], x[0]))
+
+    results = []
+    for doc_id, score, i in hits[:max_results]:
+        domain = index.domains[i]
+        result = _collect_results(index.rows[domain], [(doc_id - index.starts[i], score)],
+                                  CSV_CONFIG[domain]["output_cols"], 1)[0]
+        result["_domain"] = domain
+        results.append(result)
+
+    result = {
+        "domain": selected[0],
+        "domains": selected,
+        "routes": [{"domain": domain, "confidence": confidence} for domain, confidence in routes],
+        "query": query,
+        "file": CSV_CONFIG[selected[0]]["file"],
+        "count": len(results),
+        "results": results
     }
+    if fuzzy:
+        result["corrections"] = index.bm25.corrections(query)
+    return result
+
+
+@telemetry.traced("core.search")
+def search(query: str, domain: Optional[str] = None, max_results: int = MAX_RESULTS,
+           fuzzy: bool = False) -> Dict[str, Any]:
+    """Main search function with auto-domain routing.
+
+    With domain=None the query is routed from index statistics and fans out to
+    every domain whose confidence reaches ROUTE_THRESHOLD (at least the best
+    one). Hits are merged by score and tagged with `_domain`; `routes` lists
+    all candidate domains with their confidences. A query that routes nowhere
+    is answered from the component domain.
 
-    scores = {domain: sum(1 for kw in keywords if kw in query_lower) 
-              for domain, keywords in domain_keywords.items()}
-    best = max(scores, key=scores.get)
-    return best if scores[best] > 0 else "component"
+    With fuzzy=True, query terms that do not occur in the index are replaced
+    by the closest vocabulary term (edit distance <= 2) and the applied
+    replacements are returned under `corrections`.
 
+    Results are served from the result cache while the data files are unchanged.
+    """
+    return _cached_result(("search", normalize_query(query), domain, max_results, fuzzy), query,
+                          lambda: _search(query, domain, max_results, fuzzy))
 
-def search(query: str, domain: Optional[str] = None, max_results: int = MAX_RESULTS) -> Dict[str, Any]:
-    """Main search function with auto-domain detection"""
+
+def _search(query: str, domain: Optional[str], max_results: int, fuzzy: bool) -> Dict[str, Any]:
     if domain is None:
-        domain = detect_domain(query)
+        index = _federated_index()
+        groups, _ = index.bm25.top_k_grouped(query, max_results, index.starts, fuzzy)
+        return _routed_result(index, query, groups, max_results, fuzzy)
 
     config = CSV_CONFIG.get(domain, CSV_CONFIG["component"])
     filepath = DATA_DIR / config["file"]
@@ -196,109 +1448,550 @@ def search(query: str, domain: Optional[str] = None, max_results: int = MAX_RESU
     if not filepath.exists():
         return {"error": f"File not found: {filepath}", "domain": domain}
 
-    results = _search_csv(filepath, config["search_cols"], config["output_cols"], query, max_results)
+    results = _search_csv(filepath, config["search_cols"], config["output_cols"], query,
+                          max_results, fuzzy)
 
-    return {
+    result = {
         "domain": domain,
         "query": query,
         "file": config["file"],
         "count": len(results),
         "results": results
     }
+    if fuzzy:
+        result["corrections"] = corrections(query, domain)
+    return result
 
 
-def search_all(query: str, max_results: int = MAX_RESULTS) -> Dict[str, Any]:
-    """Search across all domains"""
-    all_results = {}
-    
-    for domain in CSV_CONFIG.keys():
-        result = search(query, domain, max_results)
-        all_results[domain] = result.get("results", [])
-    
+def _federated_results(index: FederatedIndex, groups: List[List[tuple]], merged: List[tuple],
+                       max_results: int) -> Tuple[Dict[str, List[Dict[str, str]]], List[Dict[str, str]]]:
+    """Per-domain result lists plus the merged list tagged with `_domain`"""
+    all_results: Dict[str, List[Dict[str, str]]] = {domain: [] for domain in CSV_CONFIG}
+    for domain, start, ranked in zip(index.domains, index.starts, groups):
+        all_results[domain] = _collect_results(
+            index.rows[domain], [(doc_id - start, score) for doc_id, score in ranked],
+            CSV_CONFIG[domain]["output_cols"], max_results)
+
+    top_results = []
+    for doc_id, score in merged[:max_results]:
+        if score <= 0:
+            continue
+        i = bisect_right(index.starts, doc_id) - 1
+        domain = index.domains[i]
+        result = _collect_results(index.rows[domain], [(doc_id - index.starts[i], score)],
+                                  CSV_CONFIG[domain]["output_cols"], 1)[0]
+        result["_domain"] = domain
+        top_results.append(result)
+    return all_results, top_results
+
+
+@telemetry.traced("core.search_all")
+def search_all(query: str, max_results: int = MAX_RESULTS, fuzzy: bool = False) -> Dict[str, Any]:
+    """Search across all domains with one traversal of the federated index.
+
+    Scores share global statistics, so they are comparable across domains;
+    `top_results` is the merged ranking over every domain.
+    """
+    return _cached_result(("search_all", normalize_query(query), max_results, fuzzy), query,
+                          lambda: _search_all(query, max_results, fuzzy))
+
+
+def _search_all(query: str, max_results: int, fuzzy: bool) -> Dict[str, Any]:
+    index = _federated_index()
+    groups, merged = index.bm25.top_k_grouped(query, max_results, index.starts, fuzzy)
+    all_results, top_results = _federated_results(index, groups, merged, max_results)
+
     total = sum(len(v) for v in all_results.values())
     
-    return {
+    result = {
         "query": query,
         "total_count": total,
-        "results": all_results
+        "results": all_results,
+        "top_results": top_results
     }
+    if fuzzy:
+        result["corrections"] = index.bm25.corrections(query)
+    return result
 
 
-def get_reasoning_rules() -> Dict[str, Any]:
-    """Load reasoning rules from JSON"""
-    filepath = DATA_DIR / "reasoning-rules.json"
+@telemetry.traced("core.search_many")
+def search_many(queries: List[str], domain: Optional[str] = None,
+                max_results: int = MAX_RESULTS, fuzzy: bool = False) -> List[Dict[str, Any]]:
+    """Run many queries at once, returning results in input order.
+
+    Queries are grouped per domain and each group is scored in a single pass
+    over the postings of its distinct terms.
+
+    Args:
+        queries: Query strings
+        domain: A domain name, None to route each query (like search()),
+            or "all" for search_all()-shaped results
+        max_results: Maximum results per query and domain
+        fuzzy: Correct query terms missing from the index (see search())
+    """
+    queries = list(queries)
+    if domain == "all":
+        index = _federated_index()
+        unique = list(dict.fromkeys(queries))
+        ranked = dict(zip(unique, index.bm25.top_k_grouped_many(unique, max_results, index.starts, fuzzy)))
+        batch = []
+        for query in queries:
+            all_results, top_results = _federated_results(index, *ranked[query], max_results)
+            batch.append({
+                "query": query,
+                "total_count": sum(len(v) for v in all_results.values()),
+                "results": all_results,
+                "top_results": top_results
+            })
+            if fuzzy:
+                batch[-1]["corrections"] = index.bm25.corrections(query)
+        return batch
+
+    if domain is None:
+        index = _federated_index()
+        unique = list(dict.fromkeys(queries))
+        ranked = dict(zip(unique, index.bm25.top_k_grouped_many(unique, max_results, index.starts, fuzzy)))
+        return [_routed_result(index, query, ranked[query][0], max_results, fuzzy) for query in queries]
+
+    config = CSV_CONFIG.get(domain, CSV_CONFIG["component"])
+    filepath = DATA_DIR / config["file"]
+    if not filepath.exists():
+        return [{"error": f"File not found: {filepath}", "domain": domain} for _ in queries]
+
+    group_results = _search_csv_many(filepath, config["search_cols"], config["output_cols"],
+                                     queries, max_results, fuzzy)
+    batch = [{
+        "domain": domain,
+        "query": query,
+        "file": config["file"],
+        "count": len(results),
+        "results": results
+    } for query, results in zip(queries, group_results)]
+    if fuzzy:
+        for result in batch:
+            result["corrections"] = corrections(result["query"], domain)
+    return batch
+
+
+def _load_rules(filepath: Path) -> Dict[str, Any]:
+    entry = _snapshot_entry(filepath)
+    if entry is not None and entry["rules"] is not None:
+        return entry["rules"]
     return _load_json(filepath)
 
 
+def get_reasoning_rules() -> Dict[str, Any]:
+    """Load reasoning rules from JSON (cached until the file changes; do not mutate)"""
+    filepath = DATA_DIR / RULES_FILE
+    return _cache.get(filepath, "json", _load_rules)
+
+
+# ============ RULE MATCHING ============
+class KeywordMatcher:
+    """Compiled trigger-keyword index for the reasoning rules.
+
+    A query term hits a keyword when either contains the other. "keyword in
+    term" is answered by an Aho-Corasick automaton run once over the term;
+    "term in keyword" by a table of every keyword substring. Each hit maps to
+    the rules listing that keyword, so matching costs one scan of the query
+    regardless of how many rules exist.
+    """
+
+    def __init__(self, rules: List[Dict[str, Any]]):
+        self.rules = rules
+        # keyword -> index of every rule listing it (repeats count repeatedly)
+        self._keyword_rules: Dict[str, List[int]] = {}
+        for i, rule in enumerate(rules):
+            for keyword in rule.get("trigger_keywords", []):
+                self._keyword_rules.setdefault(keyword.lower(), []).append(i)
+
+        self._substrings: Dict[str, List[str]] = {}
+        for keyword in self._keyword_rules:
+            seen = set()
+            for start in range(len(keyword)):
+                for end in range(start + 1, len(keyword) + 1):
+                    part = keyword[start:end]
+                    if part not in seen:
+                        seen.add(part)
+                        self._substrings.setdefault(part, []).append(keyword)
+
+        self._build_automaton([kw for kw in self._keyword_rules if kw])
+        # The empty keyword is contained in every term
+        self._always = [""] if "" in self._keyword_rules else []
+
+    def _build_automaton(self, keywords: List[str]) -> None:
+        goto: List[Dict[str, int]] = [{}]
+        output: List[List[str]] = [[]]
+        for keyword in keywords:
+            state = 0
+            for ch in keyword:
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[state][ch] = nxt
+                    goto.append({})
+                    output.append([])
+                state = nxt
+            output[state].append(keyword)
+
+        # Breadth-first failure links; depth-one states fail to the root
+        fail = [0] * len(goto)
+        queue = list(goto[0].values())
+        for state in queue:
+            for ch, nxt in goto[state].items():
+                queue.append(nxt)
+                f = fail[state]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                fail[nxt] = goto[f].get(ch, 0)
+                output[nxt] = output[nxt] + output[fail[nxt]]
+
+        self._goto, self._fail, self._output = goto, fail, output
+
+    def _keywords_in(self, term: str) -> set:
+        """Keywords occurring inside `term` (single Aho-Corasick pass)"""
+        goto, fail, output = self._goto, self._fail, self._output
+        found = set(self._always)
+        state = 0
+        for ch in term:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if output[state]:
+                found.update(output[state])
+        return found
+
+    def scores(self, query: str) -> Dict[int, int]:
+        """rule index -> number of (term, keyword) hits for the query"""
+        scores: Dict[int, int] = {}
+        for term in query.lower().split():
+            hits = self._keywords_in(term)
+            hits.update(self._substrings.get(term, ()))
+            for keyword in hits:
+                for i in self._keyword_rules[keyword]:
+                    scores[i] = scores.get(i, 0) + 1
+        return scores
+
+    def best(self, query: str) -> Optional[Dict[str, Any]]:
+        """Highest scoring rule (first in file order on ties), with `_score`"""
+        scores = self.scores(query)
+        if not scores:
+            return None
+        i = min(scores, key=lambda idx: (-scores[idx], idx))
+        return {**self.rules[i], "_score": scores[i]}
+
+
+def _build_keyword_matcher(filepath: Path) -> KeywordMatcher:
+    return KeywordMatcher(get_reasoning_rules().get("rules", []))
+
+
+@telemetry.traced("core.match_reasoning_rule")
 def match_reasoning_rule(query: str) -> Optional[Dict[str, Any]]:
     """Match query to best reasoning rule"""
-    rules_data = get_reasoning_rules()
-    if not rules_data:
-        return None
-    
-    query_lower = query.lower()
-    query_terms = query_lower.split()
-    
-    matched_rules = []
-    for rule in rules_data.get("rules", []):
-        trigger_keywords = rule.get("trigger_keywords", [])
-        score = 0
-        for term in query_terms:
-            for keyword in trigger_keywords:
-                if term in keyword.lower() or keyword.lower() in term:
-                    score += 1
-        
-        if score > 0:
-            matched_rules.append({**rule, "_score": score})
-    
-    matched_rules.sort(key=lambda x: x["_score"], reverse=True)
-    
-    return matched_rules[0] if matched_rules else None
+    return _cached_result(("match_reasoning_rule", normalize_query(query)), query,
+                          lambda: _cache.get(DATA_DIR / RULES_FILE, "matcher", _build_keyword_matcher).best(query))
+
+
+# ============ NAME LOOKUP ============
+_ALIAS_STRIP = str.maketrans("", "", " \t-_./")
+
+
+def _alias_key(name: str) -> str:
+    """Loose form of a name: lower case, no "token." prefix, no separators"""
+    key = str(name).strip().lower()
+    if key.startswith("token."):
+        key = key[len("token."):]
+    return key.translate(_ALIAS_STRIP)
+
+
+class LookupTable:
+    """Hash maps from names, ids, paths and aliases to the rows of one domain.
+
+    Keys are tried column by column in `lookup_cols` order (case-insensitive),
+    then as a normalized alias, so "Bubble", "对话气泡", "1", "src/Bubble",
+    "token.colorPrimary" and "colorprimary" all resolve with dict hits. When
+    several rows share a key the first row in the file wins.
+    """
+
+    def __init__(self, rows: RowStore, lookup_cols: List[str]):
+        self.rows = rows
+        self.columns: List[Dict[str, int]] = []
+        self.aliases: Dict[str, int] = {}
+        for col in lookup_cols:
+            table: Dict[str, int] = {}
+            for i, row in enumerate(rows):
+                value = str(row.get(col) or "").strip()
+                if not value:
+                    continue
+                table.setdefault(value.lower(), i)
+                if col == "source_path":
+                    table.setdefault(value.rstrip("/").lower(), i)
+            self.columns.append(table)
+        for table in self.columns:
+            for key, i in table.items():
+                self.aliases.setdefault(_alias_key(key), i)
+
+    def find(self, name: str) -> Optional[int]:
+        """Row index for a name, id, path or alias, or None"""
+        key = str(name).strip().lower()
+        for table in self.columns:
+            i = table.get(key)
+            if i is not None:
+                return i
+        return self.aliases.get(_alias_key(key))
+
+    def get(self, name: str) -> Optional[Dict[str, str]]:
+        i = self.find(name)
+        return self.rows[i].to_dict() if i is not None else None
+
+
+def _lookup_table(domain: str) -> LookupTable:
+    """Lookup maps for a domain, built once per data file version"""
+    config = CSV_CONFIG[domain]
+    filepath = DATA_DIR / config["file"]
+    return _cache.get(filepath, "lookup",
+                      lambda path: LookupTable(_cached_rows(path), config["lookup_cols"]))
+
+
+def get_many(names: Iterable[str], domain: Optional[str] = None) -> Dict[str, Optional[Dict[str, str]]]:
+    """Resolve many names at once: {name: row or None}.
+
+    With domain=None every domain is tried in CSV_CONFIG order and matched
+    rows are tagged with `_domain`.
+    """
+    domains = list(CSV_CONFIG) if domain is None else [domain]
+    tables = [(d, _lookup_table(d)) for d in domains]
+    resolved: Dict[str, Optional[Dict[str, str]]] = {}
+    for name in names:
+        resolved[name] = None
+        for d, table in tables:
+            row = table.get(name)
+            if row is not None:
+                if domain is None:
+                    row["_domain"] = d
+                resolved[name] = row
+                break
+    return resolved
 
 
 def get_component_by_name(name: str) -> Optional[Dict[str, str]]:
-    """Get a specific component by name"""
-    filepath = DATA_DIR / "components.csv"
-    data = _load_csv(filepath)
-    
-    name_lower = name.lower()
-    for row in data:
-        if row.get("name", "").lower() == name_lower or row.get("name_cn", "") == name:
-            return row
-    return None
+    """Get a specific component by name, name_cn, id, source path or alias"""
+    return _lookup_table("component").get(name)
 
 
 def get_plugin_by_name(name: str) -> Optional[Dict[str, str]]:
-    """Get a specific plugin by name"""
-    filepath = DATA_DIR / "plugins.csv"
-    data = _load_csv(filepath)
-    
-    name_lower = name.lower()
-    for row in data:
-        if row.get("name", "").lower() == name_lower:
-            return row
-    return None
+    """Get a specific plugin by name, name_cn, id, source path or alias"""
+    return _lookup_table("plugin").get(name)
 
 
 def get_hook_by_name(name: str) -> Optional[Dict[str, str]]:
-    """Get a specific hook by name"""
-    filepath = DATA_DIR / "hooks.csv"
-    data = _load_csv(filepath)
-    
-    name_lower = name.lower()
-    for row in data:
-        if row.get("name", "").lower() == name_lower:
-            return row
-    return None
+    """Get a specific hook by name, id, source path or alias"""
+    return _lookup_table("hook").get(name)
 
 
 def get_token_by_name(name: str) -> Optional[Dict[str, str]]:
-    """Get a specific token by name"""
-    filepath = DATA_DIR / "tokens.csv"
-    data = _load_csv(filepath)
-    
-    name_lower = name.lower().replace("token.", "")
-    for row in data:
-        if row.get("token", "").lower() == name_lower:
-            return row
-    return None
+    """Get a specific token by name (with or without the "token." prefix)"""
+    return _lookup_table("token").get(name)
+
+
+# ============ COMPLETION ============
+COMPLETE_LIMIT = 10
+COMPLETE_TOP = 32          # candidates kept per node of the ranking tree
+COMPLETE_BLOCK = 64        # sorted keys per leaf of the ranking tree
+NAME_PRIOR = 2.0
+KEYWORD_PRIOR = 0.5
+
+
+def _split_keywords(value: str) -> List[str]:
+    """Keyword cells are comma-separated phrases, or space-separated words when there is no comma"""
+    parts = value.split(",") if "," in value else value.split()
+    return [part.strip() for part in parts if part.strip()]
+
+
+class CompletionIndex:
+    """Sorted array of completion keys with precomputed priors.
+
+    Keys are the lower-cased names, name_cn values, keywords and token names
+    of every domain. A prefix selects a contiguous range with two bisections;
+    candidates are ranked by prior (names referenced by many reasoning rules
+    first, then keywords shared by many rows), shorter keys first on ties.
+
+    That order does not depend on the prefix, so it is fixed at build time:
+    `by_rank` lists the entry ids best first. A segment tree over blocks of
+    COMPLETE_BLOCK keys keeps the best COMPLETE_TOP ranks of every node, once
+    for all domains and once per domain, and a prefix range is answered by
+    merging the lists of O(log n) nodes and scanning at most two partial
+    blocks, whatever the length of the prefix or the size of its range.
+    """
+
+    def __init__(self, keys: List[str], entries: List[Tuple[str, str, str, str, float]],
+                 by_rank: Optional[List[int]] = None, trees: Optional[Dict[str, List[List[int]]]] = None):
+        # entries[i] = (text, domain, field, name, prior) for keys[i]; keys are sorted
+        self.keys = keys
+        self.entries = entries
+        if by_rank is None:
+            by_rank = sorted(range(len(keys)), key=lambda i: (-entries[i][4], len(keys[i]), i))
+        self.by_rank = by_rank
+        self.rank = [0] * len(keys)
+        for r, i in enumerate(by_rank):
+            self.rank[i] = r
+        # "" -> tree over every domain, domain -> tree over that domain's entries
+        self.trees = trees if trees is not None else self._build_trees()
+
+    @classmethod
+    def build(cls, tables: Dict[str, RowStore], rules: Dict[str, Any]) -> "CompletionIndex":
+        """Collect completion candidates from the domain rows and reasoning rules"""
+        # (key, domain) -> [text, prior, field, name]; a name absorbs an equal keyword
+        found: Dict[Tuple[str, str], list] = {}
+        for domain, config in CSV_CONFIG.items():
+            if domain not in tables:
+                continue
+            name_col = config["lookup_cols"][0]
+            refs: Dict[str, int] = defaultdict(int)
+            for rule in rules.get("rules", []):
+                for name in rule.get(config["rule_key"], []):
+                    refs[str(name).lower()] += 1
+            for row in tables[domain]:
+                name = str(row.get(name_col) or "").strip()
+                prior = NAME_PRIOR + refs.get(name.lower(), 0)
+                for col in config["complete_cols"]:
+                    value = str(row.get(col) or "").strip()
+                    if col == "keywords":
+                        for keyword in _split_keywords(value):
+                            item = found.setdefault((keyword.lower(), domain), [keyword, 0.0, col, ""])
+                            item[1] += KEYWORD_PRIOR
+                    elif value:
+                        item = found.get((value.lower(), domain))
+                        if item is None:
+                            found[(value.lower(), domain)] = [value, prior, col, name]
+                        elif not item[3]:
+                            found[(value.lower(), domain)] = [value, prior + item[1], col, name]
+
+        domain_order = list(CSV_CONFIG)
+        ordered = sorted(found.items(), key=lambda x: (x[0][0], domain_order.index(x[0][1])))
+        keys = [key for (key, _), _ in ordered]
+        entries = [(text, domain, field, name, prior)
+                   for (_, domain), (text, prior, field, name) in ordered]
+        return cls(keys, entries)
+
+    def to_state(self) -> Dict[str, Any]:
+        return {"keys": self.keys, "entries": self.entries, "by_rank": self.by_rank, "trees": self.trees}
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> "CompletionIndex":
+        return cls(state["keys"], [tuple(entry) for entry in state["entries"]], state["by_rank"],
+                   state["trees"])
+
+    def _range(self, prefix: str) -> Tuple[int, int]:
+        lo = bisect_left(self.keys, prefix)
+        hi = bisect_left(self.keys, prefix + "\U0010ffff", lo)
+        return lo, hi
+
+    def _rank(self, prefix: str, lo: int, hi: int, k: int,
+              domains: Optional[Sequence[str]] = None) -> List[int]:
+        """Best k entry ids in keys[lo:hi] by a full scan: exact matches, then by prior"""
+        ids = range(lo, hi) if domains is None else [i for i in range(lo, hi) if self.entries[i][1] in domains]
+        keys, rank = self.keys, self.rank
+        return heapq.nsmallest(k, ids, key=lambda i: (keys[i] != prefix, rank[i]))
+
+    # ---- ranking tree ----
+    def _build_trees(self) -> Dict[str, List[List[int]]]:
+        """Bottom-up segment trees: node m + j holds leaf block j, node p merges 2p and 2p + 1"""
+        blocks = (len(self.keys) + COMPLETE_BLOCK - 1) // COMPLETE_BLOCK
+        trees: Dict[str, List[List[int]]] = {}
+        for domain in [""] + list(CSV_CONFIG):
+            tree: List[List[int]] = [[] for _ in range(2 * blocks)]
+            for j in range(blocks):
+                block = range(j * COMPLETE_BLOCK, min((j + 1) * COMPLETE_BLOCK, len(self.keys)))
+                tree[blocks + j] = sorted(self.rank[i] for i in block
+                                          if not domain or self.entries[i][1] == domain)[:COMPLETE_TOP]
+            for node in range(blocks - 1, 0, -1):
+                tree[node] = sorted(tree[2 * node] + tree[2 * node + 1])[:COMPLETE_TOP]
+            trees[domain] = tree
+        return trees
+
+    def _ranked(self, lo: int, hi: int, domains: Optional[Sequence[str]]) -> Iterator[int]:
+        """Ranks of the entries in keys[lo:hi] (of the given domains), best first, at least COMPLETE_TOP"""
+        names = [""] if domains is None else [domain for domain in domains if domain in self.trees]
+        rank, entries = self.rank, self.entries
+        first, last = -(-lo // COMPLETE_BLOCK), hi // COMPLETE_BLOCK   # full blocks [first, last)
+        if first >= last:
+            edges = range(lo, hi)
+        else:
+            edges = [*range(lo, first * COMPLETE_BLOCK), *range(last * COMPLETE_BLOCK, hi)]
+        lists = [sorted(rank[i] for i in edges if domains is None or entries[i][1] in domains)]
+        if first < last:
+            blocks = len(self.trees[""]) // 2
+            for name in names:
+                tree = self.trees[name]
+                left, right = first + blocks, last + blocks
+                while left < right:
+                    if left & 1:
+                        lists.append(tree[left])
+                        left += 1
+                    if right & 1:
+                        right -= 1
+                        lists.append(tree[right])
+                    left //= 2
+                    right //= 2
+        return heapq.merge(*lists)
+
+    def complete(self, prefix: str, domains: Optional[Sequence[str]] = None,
+                 limit: int = COMPLETE_LIMIT) -> List[Dict[str, Any]]:
+        """Ranked completions for a prefix, optionally restricted to some domains"""
+        prefix = prefix.strip().lower()
+        if prefix.startswith("token."):
+            prefix = prefix[len("token."):]
+        if not prefix or limit <= 0:
+            return []
+
+        lo, hi = self._range(prefix)
+        if limit > COMPLETE_TOP:
+            # Deeper than the tree keeps per node
+            ids = self._rank(prefix, lo, hi, limit, domains)
+        else:
+            # Exact matches sort first in the range and come first in the ranking
+            start = lo
+            while start < hi and self.keys[start] == prefix:
+                start += 1
+            ids = sorted((i for i in range(lo, start) if domains is None or self.entries[i][1] in domains),
+                         key=self.rank.__getitem__)
+            if len(ids) < limit:
+                by_rank = self.by_rank
+                ids.extend(by_rank[r] for r in islice(self._ranked(start, hi, domains), limit - len(ids)))
+
+        completions = []
+        for i in ids[:limit]:
+            text, domain, field, name, prior = self.entries[i]
+            completions.append({"text": text, "domain": domain, "field": field,
+                                "name": name or None, "score": prior})
+        return completions
+
+
+def _completion_paths() -> Tuple[Path, ...]:
+    return _federated_paths() + (DATA_DIR / RULES_FILE,)
+
+
+def _build_completion_index(paths: Tuple[Path, ...]) -> CompletionIndex:
+    state = _snapshot_completions(paths)
+    if state is not None:
+        return CompletionIndex.from_state(state)
+    tables = {domain: _cached_rows(path)
+              for domain, path in zip(CSV_CONFIG.keys(), paths) if path.exists()}
+    rules = get_reasoning_rules() if paths[-1].exists() else {}
+    return CompletionIndex.build(tables, rules)
+
+
+def complete(prefix: str, domain: Optional[str] = None, limit: int = COMPLETE_LIMIT) -> List[Dict[str, Any]]:
+    """As-you-type completions for component, plugin and hook names, name_cn
+    values, keywords and token names.
+
+    Returns up to `limit` dicts {"text", "domain", "field", "name", "score"},
+    best first; `name` is the entity a name/name_cn completion belongs to
+    (None for keywords). The index is built once per data version (or loaded
+    from the snapshot), so each call is a bisection plus a short ranking.
+    """
+    if domain is not None and domain not in CSV_CONFIG:
+        raise ValueError(f"Unknown domain: {domain}")
+    index = _cache.get(_completion_paths(), "complete", _build_completion_index)
+    return index.complete(prefix, None if domain is None else (domain,), limit)
@@ -11,22 +11,31 @@ Usage:
     # With persistence (Master + Overrides pattern)
     result = generate_design_system("ai chat assistant", "My AI App", persist=True)
     result = generate_design_system("ai chat assistant", "My AI App", persist=True, page="chat")
+
+    # Many projects and pages from a manifest (一次加载数据，多进程生成)
+    from design_system import generate_from_manifest
+    summary = generate_from_manifest("projects.json", workers=4)
 """
 
-import csv
-import json
-from datetime import datetime
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 
+import telemetry
 from core import (
     search, search_all, match_reasoning_rule, 
-    get_reasoning_rules, DATA_DIR
+    get_reasoning_rules, data_version, DATA_DIR
 )
 
 
 # ============ CONFIGURATION ============
 BOX_WIDTH = 90
+# Per-project record of generation times and content hashes (deterministic mode)
+SIDECAR_NAME = ".generated.json"
+
+
+def _timestamp() -> str:
+    from datetime import datetime  # only persisted output is timestamped
+    return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
 
 # ============ DESIGN SYSTEM GENERATOR ============
@@ -64,6 +73,7 @@ class DesignSystemGenerator:
         tokens = search_results.get("results", {}).get("token", [])
         return tokens[:limit]
 
+    @telemetry.traced("design_system.generate")
     def generate(self, query: str, project_name: Optional[str] = None) -> Dict[str, Any]:
         """Generate complete design system recommendation."""
         # Step 1: Get matched reasoning rule
@@ -128,6 +138,7 @@ class DesignSystemGenerator:
 
 
 # ============ OUTPUT FORMATTERS ============
+@telemetry.traced("design_system.format_ascii_box")
 def format_ascii_box(design_system: Dict[str, Any]) -> str:
     """Format design system as ASCII box."""
     project = design_system.get("project_name", "PROJECT")
@@ -202,6 +213,7 @@ def format_ascii_box(design_system: Dict[str, Any]) -> str:
     return "\n".join(lines)
 
 
+@telemetry.traced("design_system.format_markdown")
 def format_markdown(design_system: Dict[str, Any]) -> str:
     """Format design system as markdown."""
     project = design_system.get("project_name", "PROJECT")
@@ -275,57 +287,146 @@ def format_markdown(design_system: Dict[str, Any]) -> str:
 
 
 # ============ PERSISTENCE FUNCTIONS ============
+@telemetry.traced("design_system.persist")
 def persist_design_system(design_system: Dict[str, Any], page: Optional[str] = None, 
-                          output_dir: Optional[str] = None) -> Dict[str, Any]:
+                          output_dir: Optional[str] = None, deterministic: bool = False) -> Dict[str, Any]:
     """
     Persist design system to design-system/<project>/ folder using Master + Overrides pattern.
     
+    Files whose content is unchanged are left untouched; the others are
+    replaced atomically (temp file + rename).
+
     Args:
         design_system: The generated design system dictionary
         page: Optional page name for page-specific override file
         output_dir: Optional output directory (defaults to current working directory)
+        deterministic: Stamp the files with the data version instead of the time, so
+            they only change with the data; times go to the .generated.json sidecar
     
     Returns:
-        dict with created file paths and status
+        dict with status, all file paths and which of them were written or skipped
     """
     base_dir = Path(output_dir) if output_dir else Path.cwd()
+    if deterministic:
+        design_system = {**design_system, "generated": f"data {data_version()}"}
     
     # Use project name for project-specific folder
-    project_name = design_system.get("project_name", "default")
-    project_slug = project_name.lower().replace(' ', '-')
-    
-    design_system_dir = base_dir / "design-system" / project_slug
-    pages_dir = design_system_dir / "pages"
-    
-    created_files = []
+    project_dir, files = _design_system_files(design_system, [page] if page else [])
+    design_system_dir = _contained(base_dir, project_dir)
+    (design_system_dir / "pages").mkdir(parents=True, exist_ok=True)
     
-    # Create directories
-    design_system_dir.mkdir(parents=True, exist_ok=True)
-    pages_dir.mkdir(parents=True, exist_ok=True)
-    
-    master_file = design_system_dir / "MASTER.md"
-    
-    # Generate and write MASTER.md
-    master_content = format_master_md(design_system)
-    with open(master_file, 'w', encoding='utf-8') as f:
-        f.write(master_content)
-    created_files.append(str(master_file))
-    
-    # If page is specified, create page override file
-    if page:
-        page_file = pages_dir / f"{page.lower().replace(' ', '-')}.md"
-        page_content = format_page_override_md(design_system, page)
-        with open(page_file, 'w', encoding='utf-8') as f:
-            f.write(page_content)
-        created_files.append(str(page_file))
+    report = _persist_files(design_system_dir, files, deterministic)
     
     return {
         "status": "success",
         "design_system_dir": str(design_system_dir),
-        "created_files": created_files
+        "created_files": report["written"] + report["skipped"],
+        "written_files": report["written"],
+        "skipped_files": report["skipped"]
     }
 
 
+def _slug(name: str) -> str:
+    """Folder / file name form of a project or page name.
+
+    Raises:
+        ValueError: if the name could address another directory (separators, "..", leading dot)
+    """
+    slug = name.lower().replace(' ', '-')
+    if not slug or slug.startswith('.') or '..' in slug or any(c in slug for c in '/\\\0'):
+        raise ValueError(f"Unsafe project or page name: {name!r}")
+    return slug
+
+
+def _contained(root: Path, relative: str) -> Path:
+    """root / relative, resolved; ValueError if that leaves root"""
+    root = root.resolve()
+    path = (root / relative).resolve()
+    if path != root and root not in path.parents:
+        raise ValueError(f"{relative} resolves outside {root}")
+    return path
+
+
+def _design_system_files(design_system: Dict[str, Any], pages: List[str]) -> Tuple[str, List[Tuple[str, str]]]:
+    """Project folder (relative to the output directory) and the (name, content) of
+    MASTER.md and each page override within it"""
+    project_dir = f"design-system/{_slug(design_system.get('project_name', 'default'))}"
+    files = [("MASTER.md", format_master_md(design_system))]
+    for page in pages:
+        files.append((f"pages/{_slug(page)}.md", format_page_override_md(design_system, page)))
+    return project_dir, files
+
+
+def _digest(data: bytes) -> str:
+    import hashlib
+    return hashlib.sha256(data).hexdigest()
+
+
+def _file_digest(path: Path) -> Optional[str]:
+    try:
+        return _digest(path.read_bytes())
+    except OSError:
+        return None
+
+
+def _atomic_write(path: Path, data: bytes) -> None:
+    """Write to a sibling temp file and rename, so readers never see a partial file"""
+    import os
+    import threading
+    # Unique per writer: server threads may persist the same file at once
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
+    except OSError:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+def _persist_files(project_dir: Path, files: List[Tuple[str, str]], deterministic: bool) -> Dict[str, List[str]]:
+    """Write each (name, content) below project_dir unless its content hash is unchanged.
+
+    In deterministic mode the sidecar (SIDECAR_NAME) records every file's
+    hash and when that content was first generated.
+    """
+    report: Dict[str, List[str]] = {"written": [], "skipped": []}
+    hashes: Dict[str, str] = {}
+    for name, content in files:
+        path = project_dir / name
+        data = content.encode("utf-8")
+        digest = hashes[name] = _digest(data)
+        if _file_digest(path) == digest:
+            report["skipped"].append(str(path))
+            continue
+        path.parent.mkdir(parents=True, exist_ok=True)
+        _atomic_write(path, data)
+        report["written"].append(str(path))
+    telemetry.count("files_written", len(report["written"]))
+    telemetry.count("files_skipped", len(report["skipped"]))
+    if deterministic:
+        _update_sidecar(project_dir, hashes)
+    return report
+
+
+def _update_sidecar(project_dir: Path, hashes: Dict[str, str]) -> None:
+    """Record hash and generation time per file; the sidecar itself changes only with them"""
+    import json
+    path = project_dir / SIDECAR_NAME
+    try:
+        sidecar = json.loads(path.read_text(encoding="utf-8"))
+        entries = sidecar["files"]
+    except (OSError, ValueError, KeyError, TypeError):
+        entries = {}
+    for name, digest in hashes.items():
+        if (entries.get(name) or {}).get("sha256") != digest:
+            entries[name] = {"sha256": digest, "generated": _timestamp()}
+    data = json.dumps({"data_version": data_version(), "files": entries},
+                      ensure_ascii=False, indent=2, sort_keys=True).encode("utf-8") + b"\n"
+    if _file_digest(path) != _digest(data):
+        _atomic_write(path, data)
+
+
+@telemetry.traced("design_system.format_master_md")
 def format_master_md(design_system: Dict[str, Any]) -> str:
     """Format design system as MASTER.md with hierarchical override logic."""
     project = design_system.get("project_name", "PROJECT")
@@ -340,7 +441,7 @@ def format_master_md(design_system: Dict[str, Any]) -> str:
     global_anti_patterns = design_system.get("global_anti_patterns", [])
     checklist = design_system.get("pre_delivery_checklist", [])
     
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    timestamp = design_system.get("generated") or _timestamp()
     
     lines = []
     
@@ -472,10 +573,11 @@ def format_master_md(design_system: Dict[str, Any]) -> str:
     return "\n".join(lines)
 
 
+@telemetry.traced("design_system.format_page_override_md")
 def format_page_override_md(design_system: Dict[str, Any], page_name: str) -> str:
     """Format a page-specific override file."""
     project = design_system.get("project_name", "PROJECT")
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    timestamp = design_system.get("generated") or _timestamp()
     page_title = page_name.replace("-", " ").replace("_", " ").title()
     
     lines = []
@@ -518,11 +620,184 @@ def format_page_override_md(design_system: Dict[str, Any], page_name: str) -> st
     return "\n".join(lines)
 
 
+# ============ MANIFEST (BULK) GENERATION ============
+# Generator of a manifest worker process, created once per process
+_worker_generator: Optional[DesignSystemGenerator] = None
+
+
+def load_manifest(path: str) -> Dict[str, Any]:
+    """Read a JSON (or, with PyYAML installed, YAML) manifest of projects and pages.
+
+    Accepted shape (a bare list is taken as the projects):
+
+        {"output_dir": "out",
+         "projects": [{"name": "My AI App", "query": "ai chat assistant",
+                       "pages": ["chat", "settings"]}, ...]}
+
+    Returns:
+        {"output_dir": str or None, "projects": [{"name", "query", "pages"}]}
+    """
+    text = Path(path).read_text(encoding="utf-8")
+    if Path(path).suffix.lower() in (".yaml", ".yml"):
+        try:
+            import yaml
+        except ImportError:
+            raise ImportError("YAML manifests need PyYAML (pip install pyyaml); or use a .json manifest")
+        data = yaml.safe_load(text)
+    else:
+        import json
+        data = json.loads(text)
+
+    if isinstance(data, list):
+        data = {"projects": data}
+    if not isinstance(data, dict) or not isinstance(data.get("projects"), list):
+        raise ValueError(f"{path}: expected a list of projects or an object with a \"projects\" list")
+
+    projects = []
+    for i, project in enumerate(data["projects"], 1):
+        if not isinstance(project, dict) or not project.get("query"):
+            raise ValueError(f"{path}: project #{i} needs a \"query\"")
+        pages = project.get("pages") or []
+        if not isinstance(pages, list) or not all(isinstance(page, str) and page for page in pages):
+            raise ValueError(f"{path}: project #{i} \"pages\" must be a list of page names")
+        query = str(project["query"])
+        name = str(project.get("name") or query.upper())
+        for value in [name] + pages:
+            try:
+                _slug(value)
+            except ValueError as e:
+                raise ValueError(f"{path}: project #{i}: {e}") from None
+        projects.append({"name": name, "query": query, "pages": pages})
+    return {"output_dir": data.get("output_dir"), "projects": projects}
+
+
+def _manifest_targets(projects: List[Dict[str, Any]], base_dir: Path) -> List[Path]:
+    """Resolved folder of each manifest project below base_dir.
+
+    Raises:
+        ValueError: if a folder leaves base_dir, or two projects (or two pages of
+            one project) resolve to the same path, so one would overwrite the other
+    """
+    folders: Dict[Path, int] = {}
+    for i, project in enumerate(projects, 1):
+        folder = _contained(base_dir, f"design-system/{_slug(project['name'])}")
+        if folder in folders:
+            raise ValueError(f"projects #{folders[folder]} and #{i} both write {folder}/")
+        folders[folder] = i
+        pages: Dict[Path, str] = {}
+        for page in project["pages"]:
+            target = _contained(folder, f"pages/{_slug(page)}.md")
+            if target in pages:
+                raise ValueError(f"project #{i} pages \"{pages[target]}\" and \"{page}\" both write {target}")
+            pages[target] = page
+    return list(folders)
+
+
+def _init_worker() -> None:
+    global _worker_generator
+    _worker_generator = DesignSystemGenerator()
+
+
+def _render_project(project: Dict[str, Any], generated: Optional[str] = None) -> Tuple[str, List[Tuple[str, str]]]:
+    """Generate one manifest project and render its MASTER.md and page files (worker task)"""
+    if _worker_generator is None:
+        _init_worker()
+    design_system = _worker_generator.generate(project["query"], project["name"])
+    if generated:
+        design_system["generated"] = generated
+    return _design_system_files(design_system, project["pages"])
+
+
+@telemetry.traced("design_system.generate_manifest")
+def generate_from_manifest(manifest_path: str, output_dir: Optional[str] = None,
+                           workers: int = 1, deterministic: bool = False) -> Dict[str, Any]:
+    """Generate and persist the design systems of every project and page in a manifest.
+
+    The data is loaded once (core.warm) before any project is generated;
+    with workers > 1 the projects are rendered in a process pool forked from
+    this warm process where fork is available (elsewhere each worker loads
+    the data once), and the files are written here in one pass.
+
+    Args:
+        manifest_path: JSON or YAML manifest (see load_manifest)
+        output_dir: Overrides the manifest's output_dir (relative to the manifest);
+            defaults to the current working directory
+        workers: Processes rendering projects (1: in this process)
+        deterministic: As for persist_design_system
+
+    Returns:
+        dict with the output directory, per-project written and skipped files, and counts
+    """
+    from core import warm
+
+    manifest = load_manifest(manifest_path)
+    if output_dir:
+        base_dir = Path(output_dir)
+    elif manifest["output_dir"]:
+        base_dir = Path(manifest_path).parent / manifest["output_dir"]
+    else:
+        base_dir = Path.cwd()
+    folders = _manifest_targets(manifest["projects"], base_dir)
+
+    warm()
+    global _worker_generator
+    _worker_generator = None
+    projects = manifest["projects"]
+    generated = [f"data {data_version()}" if deterministic else None] * len(projects)
+    if workers > 1 and len(projects) > 1:
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+        # fork inherits the warm caches; spawn / forkserver workers reload the data themselves
+        context = multiprocessing.get_context("fork") if "fork" in multiprocessing.get_all_start_methods() else None
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=_init_worker) as pool:
+            rendered = list(pool.map(_render_project, projects, generated,
+                                     chunksize=max(1, len(projects) // (4 * workers))))
+    else:
+        rendered = [_render_project(project, stamp) for project, stamp in zip(projects, generated)]
+
+    results = []
+    for project, folder, (_, files) in zip(projects, folders, rendered):
+        report = _persist_files(folder, files, deterministic)
+        results.append({"name": project["name"], "query": project["query"],
+                        "written": report["written"], "skipped": report["skipped"]})
+    return {
+        "status": "success",
+        "output_dir": str(base_dir),
+        "projects": results,
+        "written_count": sum(len(project["written"]) for project in results),
+        "skipped_count": sum(len(project["skipped"]) for project in results),
+    }
+
+
 # ============ MAIN ENTRY POINT ============
+def generate_and_persist(query: str, project_name: Optional[str] = None,
+                         output_format: str = "ascii",
+                         persist: bool = False, page: Optional[str] = None,
+                         output_dir: Optional[str] = None, deterministic: bool = False) -> Dict[str, Any]:
+    """
+    generate_design_system() that also returns the persistence report.
+
+    Returns:
+        dict with the formatted design system ("output") and, when persisting,
+        the persist_design_system() result ("persisted", else None)
+    """
+    generator = DesignSystemGenerator()
+    design_system = generator.generate(query, project_name)
+    
+    # Persist to files if requested
+    persisted = persist_design_system(design_system, page, output_dir, deterministic) if persist else None
+
+    if output_format == "markdown":
+        output = format_markdown(design_system)
+    else:
+        output = format_ascii_box(design_system)
+    return {"output": output, "persisted": persisted}
+
+
 def generate_design_system(query: str, project_name: Optional[str] = None, 
                            output_format: str = "ascii", 
                            persist: bool = False, page: Optional[str] = None, 
-                           output_dir: Optional[str] = None) -> str:
+                           output_dir: Optional[str] = None, deterministic: bool = False) -> str:
     """
     Main entry point for design system generation.
 
@@ -533,20 +808,13 @@ def generate_design_system(query: str, project_name: Optional[str] = None,
         persist: If True, save design system to design-system/ folder
         page: Optional page name for page-specific override file
         output_dir: Optional output directory (defaults to current working directory)
+        deterministic: Persist with the data version in place of the generation time
 
     Returns:
         Formatted design system string
     """
-    generator = DesignSystemGenerator()
-    design_system = generator.generate(query, project_name)
-    
-    # Persist to files if requested
-    if persist:
-        persist_design_system(design_system, page, output_dir)
-
-    if output_format == "markdown":
-        return format_markdown(design_system)
-    return format_ascii_box(design_system)
+    return generate_and_persist(query, project_name, output_format, persist, page,
+                                output_dir, deterministic)["output"]
 
 
 # ============ CLI SUPPORT ============
@@ -560,25 +828,28 @@ if __name__ == "__main__":
     parser.add_argument("--persist", action="store_true", help="Save to design-system/ folder")
     parser.add_argument("--page", type=str, default=None, help="Create page-specific override")
     parser.add_argument("--output-dir", "-o", type=str, default=None, help="Output directory")
+    parser.add_argument("--deterministic", action="store_true",
+                        help="Stamp persisted files with the data version instead of the time")
 
     args = parser.parse_args()
 
-    result = generate_design_system(
+    result = generate_and_persist(
         args.query, 
         args.project_name, 
         args.format,
         args.persist,
         args.page,
-        args.output_dir
+        args.output_dir,
+        args.deterministic
     )
-    print(result)
+    print(result["output"])
     
-    if args.persist:
-        project_slug = args.project_name.lower().replace(' ', '-') if args.project_name else "default"
+    if result["persisted"]:
         print("\n" + "=" * 60)
-        print(f"✅ Design system persisted to design-system/{project_slug}/")
-        print(f"   📄 design-system/{project_slug}/MASTER.md (Global Source of Truth)")
-        if args.page:
-            page_filename = args.page.lower().replace(' ', '-')
-            print(f"   📄 design-system/{project_slug}/pages/{page_filename}.md (Page Overrides)")
+        persisted = result["persisted"]
+        print(f"✅ Design system persisted to {persisted['design_system_dir']}/")
+        for path in persisted["written_files"]:
+            print(f"   📄 {path}")
+        for path in persisted["skipped_files"]:
+            print(f"   ·  {path} (unchanged)")
         print("=" * 60)
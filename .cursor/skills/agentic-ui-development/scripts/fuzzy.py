@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Agentic UI Fuzzy - typo correction over the BM25 vocabulary
+
+SymSpell-style symmetric delete index: every vocabulary term is stored under
+all strings obtained by deleting up to `max_distance` characters from its
+prefix. A misspelled query term generates its own deletes and looks them up,
+so candidate retrieval costs a handful of dict hits instead of an edit
+distance against every term.
+
+    bubbel -> bubble, thougt -> thought, mermiad -> mermaid
+"""
+
+from typing import Container, Dict, Iterable, List, Optional, Set, Tuple
+
+# ============ CONFIGURATION ============
+MAX_DISTANCE = 2
+PREFIX_LENGTH = 7
+MIN_TERM_LENGTH = 3
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """Optimal string alignment distance (adjacent swaps cost 1), or limit + 1 if larger"""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    prev2: List[int] = []
+    prev = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        cur = [i] + [0] * len(b)
+        row_min = i
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            value = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                value = min(value, prev2[j - 2] + 1)
+            cur[j] = value
+            row_min = min(row_min, value)
+        if row_min > limit:
+            return limit + 1
+        prev2, prev = prev, cur
+    return prev[-1] if prev[-1] <= limit else limit + 1
+
+
+def _deletes(word: str, distance: int) -> Set[str]:
+    """`word` plus every string reachable by deleting up to `distance` characters"""
+    found = {word}
+    frontier = {word}
+    for _ in range(distance):
+        nxt = set()
+        for w in frontier:
+            if len(w) <= 1:
+                continue
+            for i in range(len(w)):
+                nxt.add(w[:i] + w[i + 1:])
+        nxt -= found
+        found |= nxt
+        frontier = nxt
+    return found
+
+
+def _correctable(term: str) -> bool:
+    return len(term) >= MIN_TERM_LENGTH and term.isascii() and term.isalpha()
+
+
+class SymSpellIndex:
+    """Symmetric-delete map from vocabulary prefixes to vocabulary terms"""
+
+    def __init__(self, frequencies: Dict[str, int], max_distance: int = MAX_DISTANCE,
+                 prefix_length: int = PREFIX_LENGTH):
+        self.max_distance = max_distance
+        self.prefix_length = prefix_length
+        self.frequencies = {t: f for t, f in frequencies.items() if _correctable(t)}
+        self.deletes: Dict[str, List[str]] = {}
+        for term in self.frequencies:
+            for key in _deletes(term[:prefix_length], max_distance):
+                self.deletes.setdefault(key, []).append(term)
+
+    def _limit(self, term: str) -> int:
+        # One edit for short words, otherwise every short word is "close" to another
+        return min(self.max_distance, 1 if len(term) <= 4 else 2)
+
+    def lookup(self, term: str) -> Optional[Tuple[str, int]]:
+        """Closest vocabulary term and its distance (ties: more frequent, then alphabetical)"""
+        if term in self.frequencies:
+            return term, 0
+        if not _correctable(term):
+            return None
+        limit = self._limit(term)
+        best: Optional[Tuple[int, int, str]] = None
+        seen: Set[str] = set()
+        for key in _deletes(term[:self.prefix_length], limit):
+            for candidate in self.deletes.get(key, ()):
+                if candidate in seen:
+                    continue
+                seen.add(candidate)
+                distance = edit_distance(term, candidate, limit)
+                if distance > limit:
+                    continue
+                rank = (distance, -self.frequencies[candidate], candidate)
+                if best is None or rank < best:
+                    best = rank
+        return (best[2], best[0]) if best else None
+
+    def correct(self, terms: Iterable[str], known: Container[str] = ()) -> Dict[str, str]:
+        """{term: replacement} for every term not in `known` (tested in place) that has a close match"""
+        corrections = {}
+        for term in terms:
+            if term in known or term in corrections:
+                continue
+            match = self.lookup(term)
+            if match is not None and match[1] > 0:
+                corrections[term] = match[0]
+        return corrections
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Agentic UI Postings - compact posting lists and a bounded-memory builder
+
+A PostingList stores a term's doc ids and term frequencies in two packed
+arrays (8 bytes per posting instead of a dict entry and two int objects).
+
+PostingsBuilder consumes analyzed documents one at a time and appends
+their postings to per-term arrays; when the estimated size of that buffer
+passes the memory budget it is written to a temporary file as a run sorted
+by term and cleared. At the end the runs are merged term by term: documents arrive
+in id order, so concatenating a term's postings run after run keeps them
+sorted. Peak memory is the budget plus the finished (packed) index.
+Either way the terms come out in first-seen order, so a build that spilled
+is identical to one that did not.
+
+A parallel build gives each worker a contiguous shard of the documents
+(first_id = the shard's first doc id); merge_shards() concatenates their
+postings in shard order, which reproduces the single-builder result exactly.
+
+    builder = PostingsBuilder(memory_budget=64 << 20)
+    for text in documents:           # any iterable, e.g. rows streamed from a CSV
+        builder.add(analyzer(text))
+    postings = builder.finish()      # {term: PostingList}, sorted runs merged
+"""
+
+import heapq
+import marshal
+import os
+import sys
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+# ============ CONFIGURATION ============
+# Build buffer budget, overridable with $AGENTIC_UI_INDEX_MEMORY_MB
+DEFAULT_MEMORY_BUDGET = int(os.environ.get("AGENTIC_UI_INDEX_MEMORY_MB") or 256) << 20
+# Rough CPython cost of the buffer: a new term (key, dict entry, two arrays) and one posting
+TERM_BYTES = 280
+POSTING_BYTES = 9
+TYPECODE = "i"   # doc ids and term frequencies fit in 32-bit signed ints
+
+
+# ============ POSTING LIST ============
+class PostingList:
+    """Doc ids (ascending) and term frequencies of one term, in packed arrays.
+
+    Supports the read-only mapping operations the scorers use on a
+    {doc_id: tf} dict: len, iteration over doc ids, get, items, keys, values.
+    """
+
+    __slots__ = ("doc_ids", "tfs")
+
+    def __init__(self, doc_ids: array, tfs: array):
+        self.doc_ids = doc_ids
+        self.tfs = tfs
+
+    @classmethod
+    def from_dict(cls, plist: Dict[int, int]) -> "PostingList":
+        return cls(array(TYPECODE, plist.keys()), array(TYPECODE, plist.values()))
+
+    @classmethod
+    def from_bytes(cls, doc_ids: bytes, tfs: bytes) -> "PostingList":
+        ids, freqs = array(TYPECODE), array(TYPECODE)
+        ids.frombytes(doc_ids)
+        freqs.frombytes(tfs)
+        return cls(ids, freqs)
+
+    def to_bytes(self) -> Tuple[bytes, bytes]:
+        return self.doc_ids.tobytes(), self.tfs.tobytes()
+
+    def nbytes(self) -> int:
+        """Resident bytes of this list and its two arrays"""
+        return sys.getsizeof(self) + sys.getsizeof(self.doc_ids) + sys.getsizeof(self.tfs)
+
+    def __len__(self) -> int:
+        return len(self.doc_ids)
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self.doc_ids)
+
+    def __contains__(self, doc_id: int) -> bool:
+        return self.get(doc_id) is not None
+
+    def get(self, doc_id: int, default: Optional[int] = None) -> Optional[int]:
+        i = bisect_left(self.doc_ids, doc_id)
+        if i < len(self.doc_ids) and self.doc_ids[i] == doc_id:
+            return self.tfs[i]
+        return default
+
+    def keys(self) -> array:
+        return self.doc_ids
+
+    def values(self) -> array:
+        return self.tfs
+
+    def items(self) -> Iterator[Tuple[int, int]]:
+        return zip(self.doc_ids, self.tfs)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, PostingList):
+            return self.doc_ids == other.doc_ids and self.tfs == other.tfs
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"PostingList({dict(self.items())!r})"
+
+
+# ============ BUILDER ============
+class PostingsBuilder:
+    """Inverted index construction with a bounded build buffer.
+
+    Args:
+        memory_budget: Estimated buffer bytes before a sorted run is spilled
+        tmp_dir: Directory for run files (system temp directory by default)
+        first_id: Doc id of the first added document (a shard's offset)
+    """
+
+    def __init__(self, memory_budget: int = DEFAULT_MEMORY_BUDGET, tmp_dir: Optional[str] = None,
+                 first_id: int = 0):
+        self.memory_budget = memory_budget
+        self.tmp_dir = tmp_dir
+        self.first_id = first_id
+        self.doc_lengths = array(TYPECODE)
+        self.runs: List[str] = []
+        self._buffer: Dict[str, Tuple[array, array]] = {}
+        # Terms of spilled buffers in first-seen order (buffers keep insertion order)
+        self._order: Dict[str, None] = {}
+        self._cost = 0
+
+    @property
+    def N(self) -> int:
+        return len(self.doc_lengths)
+
+    def add(self, tokens: Sequence[str]) -> int:
+        """Append one analyzed document; returns its doc id"""
+        doc_id = self.first_id + len(self.doc_lengths)
+        self.doc_lengths.append(len(tokens))
+        buffer = self._buffer
+        counts = Counter(tokens)
+        cost = POSTING_BYTES * len(counts)
+        for word, tf in counts.items():
+            plist = buffer.get(word)
+            if plist is None:
+                plist = buffer[word] = (array(TYPECODE), array(TYPECODE))
+                cost += TERM_BYTES
+            plist[0].append(doc_id)
+            plist[1].append(tf)
+        self._cost += cost
+        if self._cost > self.memory_budget:
+            self._spill()
+        return doc_id
+
+    def _spill(self) -> None:
+        """Write the buffer as a run sorted by term and clear it"""
+        if not self._buffer:
+            return
+        import tempfile  # only needed once a build outgrows its budget
+        fd, path = tempfile.mkstemp(prefix="agentic-ui-run-", suffix=".bin", dir=self.tmp_dir)
+        self.runs.append(path)
+        self._order.update(dict.fromkeys(self._buffer))
+        with os.fdopen(fd, "wb") as f:
+            for term in sorted(self._buffer):
+                doc_ids, tfs = self._buffer[term]
+                marshal.dump((term, doc_ids.tobytes(), tfs.tobytes()), f)
+        self._buffer = {}
+        self._cost = 0
+
+    @staticmethod
+    def _read_run(path: str) -> Iterator[Tuple[str, bytes, bytes]]:
+        with open(path, "rb") as f:
+            while True:
+                try:
+                    yield marshal.load(f)
+                except EOFError:
+                    return
+
+    def finish(self) -> Dict[str, PostingList]:
+        """The complete postings as {term: PostingList} in first-seen term order; removes the run files"""
+        try:
+            if not self.runs:
+                buffer, self._buffer = self._buffer, {}
+                return {term: PostingList(doc_ids, tfs) for term, (doc_ids, tfs) in buffer.items()}
+
+            self._spill()
+            postings: Dict[str, PostingList] = {}
+            # heapq.merge is stable, so equal terms come out in run (= doc id) order
+            merged = heapq.merge(*(self._read_run(path) for path in self.runs), key=lambda x: x[0])
+            term, ids, tfs = None, [], []
+            for run_term, run_ids, run_tfs in merged:
+                if run_term != term:
+                    if term is not None:
+                        postings[term] = PostingList.from_bytes(b"".join(ids), b"".join(tfs))
+                    term, ids, tfs = run_term, [], []
+                ids.append(run_ids)
+                tfs.append(run_tfs)
+            if term is not None:
+                postings[term] = PostingList.from_bytes(b"".join(ids), b"".join(tfs))
+            order, self._order = self._order, {}
+            return {term: postings[term] for term in order}
+        finally:
+            self.close()
+
+    def finish_shard(self) -> Tuple[bytes, List[Tuple[str, bytes, bytes]]]:
+        """finish() as picklable builtins for merge_shards(): (doc_lengths, [(term, ids, tfs), ...])"""
+        postings = self.finish()
+        return self.doc_lengths.tobytes(), [(term,) + plist.to_bytes() for term, plist in postings.items()]
+
+    def close(self) -> None:
+        """Delete spilled run files"""
+        for path in self.runs:
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+        self.runs = []
+
+
+def merge_shards(shards: Iterable[Tuple[bytes, List[Tuple[str, bytes, bytes]]]]) -> Tuple[array, Dict[str, PostingList]]:
+    """Combine finish_shard() results, given in shard (= doc id) order.
+
+    Returns:
+        (doc_lengths, postings) exactly as one PostingsBuilder over all the
+        shards' documents would have produced them
+    """
+    doc_lengths = array(TYPECODE)
+    parts: Dict[str, Tuple[List[bytes], List[bytes]]] = {}
+    for lengths, postings in shards:
+        doc_lengths.frombytes(lengths)
+        for term, ids, tfs in postings:
+            part = parts.get(term)
+            if part is None:
+                part = parts[term] = ([], [])
+            part[0].append(ids)
+            part[1].append(tfs)
+    return doc_lengths, {term: PostingList.from_bytes(b"".join(ids), b"".join(tfs))
+                         for term, (ids, tfs) in parts.items()}
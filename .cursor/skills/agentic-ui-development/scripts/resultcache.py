@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Agentic UI Result Cache - bounded LRU/TTL cache of query results
+
+core.search, search_all and match_reasoning_rule look their results up
+here before touching any index. An entry is keyed by the operation and its
+normalized arguments and tagged with the fingerprint of the data files it
+was computed from; once any data file changes, older entries are misses.
+
+Results are stored marshalled, so every hit hands out a fresh copy that the
+caller may modify. The optional disk tier (one file per entry, written with
+a temp file and rename) lets separate CLI processes share hits; it is
+enabled by pointing $AGENTIC_UI_RESULT_CACHE_DIR at a directory.
+
+    cache = ResultCache(max_entries=1024, ttl=600, disk_dir="/tmp/ui-results")
+    value = cache.get(key, fingerprint)        # MISS when absent, expired or stale
+    cache.put(key, fingerprint, value)
+    cache.stats()                              # hits, misses, evictions, ...
+"""
+
+import marshal
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Hashable, Optional, Tuple, Union
+
+# ============ CONFIGURATION ============
+DISK_DIR_ENV = "AGENTIC_UI_RESULT_CACHE_DIR"
+DEFAULT_MAX_ENTRIES = 1024
+DEFAULT_TTL = 600.0            # seconds; None keeps entries until evicted or stale
+DISK_MAX_ENTRIES = 4096
+_DISK_SUFFIX = ".result"
+
+MISS = object()   # get() result when there is no usable entry (None is a valid result)
+
+
+def normalize_query(query: str) -> str:
+    """Cache key form of a query: runs of whitespace collapsed, ASCII queries lower-cased.
+
+    Both changes leave the analyzed terms (and the keyword matches) unchanged,
+    so queries that differ only in them share one entry.
+    """
+    query = " ".join(str(query).split())
+    return query.lower() if query.isascii() else query
+
+
+class ResultCache:
+    """In-memory LRU of marshalled results with a TTL and an optional disk tier.
+
+    Args:
+        max_entries: Entries kept in memory (0 disables caching)
+        ttl: Seconds an entry stays valid (None: no expiry)
+        disk_dir: Directory of the shared on-disk tier (None: memory only)
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, ttl: Optional[float] = DEFAULT_TTL,
+                 disk_dir: Union[str, Path, None] = None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.disk_dir = Path(disk_dir) if disk_dir else None
+        # key -> (fingerprint, expiry on the monotonic clock, marshalled value)
+        self._entries: "OrderedDict[Hashable, Tuple[Any, float, bytes]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.counters = {"hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0, "invalidations": 0}
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self.counters[name] += 1
+
+    # ---- lookups ----
+    def get(self, key: Hashable, fingerprint: Any) -> Any:
+        """Cached value for key computed from data with this fingerprint, else MISS"""
+        if self.max_entries <= 0:
+            return MISS
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] == fingerprint and (self.ttl is None or entry[1] > time.monotonic()):
+                    self._entries.move_to_end(key)
+                    self.counters["hits"] += 1
+                    return marshal.loads(entry[2])
+                del self._entries[key]
+                self.counters["invalidations"] += 1
+
+        if self.disk_dir is not None:
+            blob = self._disk_get(key, fingerprint)
+            if blob is not None:
+                self._count("disk_hits")
+                self._remember(key, fingerprint, blob)
+                return marshal.loads(blob)
+        self._count("misses")
+        return MISS
+
+    def put(self, key: Hashable, fingerprint: Any, value: Any) -> None:
+        """Store value (JSON-like builtins) for key"""
+        if self.max_entries <= 0:
+            return
+        try:
+            blob = marshal.dumps(value)
+        except ValueError:   # not made of builtins; such results are not cached
+            return
+        self._remember(key, fingerprint, blob)
+        if self.disk_dir is not None:
+            self._disk_put(key, fingerprint, blob)
+
+    def _remember(self, key: Hashable, fingerprint: Any, blob: bytes) -> None:
+        expires = time.monotonic() + self.ttl if self.ttl is not None else 0.0
+        with self._lock:
+            self._entries[key] = (fingerprint, expires, blob)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.counters["evictions"] += 1
+
+    def clear(self, disk: bool = True) -> None:
+        """Drop every entry (including the disk tier unless disk=False)"""
+        with self._lock:
+            self._entries.clear()
+        if disk and self.disk_dir is not None:
+            for path in self._disk_files():
+                _unlink(path)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats: Dict[str, Any] = dict(self.counters, entries=len(self._entries))
+        lookups = stats["hits"] + stats["disk_hits"] + stats["misses"]
+        stats["hit_rate"] = (stats["hits"] + stats["disk_hits"]) / lookups if lookups else 0.0
+        stats.update(max_entries=self.max_entries, ttl=self.ttl,
+                     disk_dir=str(self.disk_dir) if self.disk_dir is not None else None)
+        return stats
+
+    # ---- disk tier ----
+    def _disk_path(self, key: Hashable) -> Path:
+        import hashlib  # only the disk tier needs stable key digests
+        return self.disk_dir / (hashlib.sha1(marshal.dumps(key)).hexdigest() + _DISK_SUFFIX)
+
+    def _disk_files(self):
+        try:
+            return [entry.path for entry in os.scandir(self.disk_dir) if entry.name.endswith(_DISK_SUFFIX)]
+        except OSError:
+            return []
+
+    def _disk_get(self, key: Hashable, fingerprint: Any) -> Optional[bytes]:
+        path = self._disk_path(key)
+        try:
+            stored_key, stored_fingerprint, expires, blob = marshal.loads(path.read_bytes())
+        except (OSError, EOFError, ValueError, TypeError):
+            return None
+        if stored_key != key:
+            return None
+        if stored_fingerprint != fingerprint or (expires and expires <= time.time()):
+            self._count("invalidations")
+            _unlink(path)
+            return None
+        return blob
+
+    def _disk_put(self, key: Hashable, fingerprint: Any, blob: bytes) -> None:
+        expires = time.time() + self.ttl if self.ttl is not None else 0.0
+        path = self._disk_path(key)
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            self.disk_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path.write_bytes(marshal.dumps((key, fingerprint, expires, blob)))
+            os.replace(tmp_path, path)
+        except OSError:
+            _unlink(tmp_path)   # the disk tier is best effort
+            return
+        self._disk_prune()
+
+    def _disk_prune(self) -> None:
+        """Delete the least recently written files beyond DISK_MAX_ENTRIES"""
+        files = self._disk_files()
+        if len(files) <= DISK_MAX_ENTRIES:
+            return
+        by_age = []
+        for path in files:
+            try:
+                by_age.append((os.stat(path).st_mtime_ns, path))
+            except OSError:
+                continue
+        by_age.sort()
+        for _, path in by_age[:len(by_age) - DISK_MAX_ENTRIES]:
+            _unlink(path)
+            self._count("evictions")
+
+
+def _unlink(path: Union[str, Path]) -> None:
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
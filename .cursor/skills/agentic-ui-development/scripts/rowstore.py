@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Agentic UI Row Store - columnar storage for the stored fields of a domain
+
+Rows parsed from a CSV are kept one column at a time instead of one dict
+per row. Each column uses whichever of four encodings is smallest:
+
+    plain    one string reference per row; equal strings share one object
+    dict     every distinct value once plus an array of 1-4 byte codes
+             (category, type and other low-cardinality columns)
+    int      decimal strings ("1", "42") kept as one 8-byte array, str() on read
+    prefix   dictionary-encoded directory prefix plus the per-row remainder
+             (source_path: "src/Plugins/" + "Chart/")
+
+store[i] returns a Row, a __slots__ view that decodes a field only when it
+is read, so the dicts handed to callers are materialized for the top-k
+hits alone.
+
+    store = RowStore.from_rows(iter_csv(path))
+    store[3].get("name")                 # decodes one field
+    store.stats()                        # bytes per column
+"""
+
+import sys
+from array import array
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# ============ COLUMNS ============
+ENCODINGS = ("plain", "dict", "int", "prefix")   # in order of decoding cost
+
+
+def _code_array(codes: List[int], distinct: int) -> array:
+    """Codes in the narrowest unsigned array that can hold them"""
+    typecode = "B" if distinct <= 0xFF else "H" if distinct <= 0xFFFF else "I"
+    return array(typecode, codes)
+
+
+def _split_prefix(value: str) -> Tuple[str, str]:
+    """("src/Plugins/", "Chart/") for "src/Plugins/Chart/"; ("", value) without a directory"""
+    cut = value.rfind("/", 0, len(value) - 1) + 1
+    return value[:cut], value[cut:]
+
+
+def _dictionary(raw: List[Any]) -> Tuple[array, List[Any]]:
+    index: Dict[Any, int] = {}
+    codes = [index.setdefault(value, len(index)) for value in raw]
+    return _code_array(codes, len(index)), list(index)
+
+
+class Column:
+    """One stored column in its chosen encoding"""
+
+    __slots__ = ("name", "encoding", "codes", "values", "suffixes")
+
+    def __init__(self, name: str, encoding: str, codes: Optional[array],
+                 values: List[Any], suffixes: Optional[List[str]] = None):
+        if encoding not in ENCODINGS:
+            raise ValueError(f"Unknown column encoding: {encoding}")
+        self.name = name
+        self.encoding = encoding
+        self.codes = codes
+        self.values = values
+        self.suffixes = suffixes
+
+    @classmethod
+    def encode(cls, name: str, raw: List[Any]) -> "Column":
+        """Build every applicable encoding of `raw` and keep the smallest"""
+        pool: Dict[Any, Any] = {}
+        candidates = [cls(name, "plain", None, [pool.setdefault(v, v) for v in raw])]
+        codes, values = _dictionary(raw)
+        candidates.append(cls(name, "dict", codes, values))
+        if raw and all(isinstance(v, str) and "/" in v for v in raw):
+            prefixes, suffixes = zip(*(_split_prefix(v) for v in raw))
+            codes, values = _dictionary(list(prefixes))
+            candidates.append(cls(name, "prefix", codes, values,
+                                  [pool.setdefault(s, s) for s in suffixes]))
+        if raw and all(isinstance(v, str) and v.isdigit() and v.isascii() and str(int(v)) == v
+                       and int(v) < 1 << 63 for v in raw):
+            candidates.append(cls(name, "int", array("q", map(int, raw)), []))
+        # Ties go to the encoding that is cheaper to decode
+        return min(candidates, key=lambda c: (c.nbytes(), ENCODINGS.index(c.encoding)))
+
+    def __len__(self) -> int:
+        return len(self.values) if self.codes is None else len(self.codes)
+
+    def __getitem__(self, i: int) -> Any:
+        if self.encoding == "plain":
+            return self.values[i]
+        if self.encoding == "dict":
+            return self.values[self.codes[i]]
+        if self.encoding == "int":
+            return str(self.codes[i])
+        return self.values[self.codes[i]] + self.suffixes[i]
+
+    def distinct(self) -> int:
+        if self.encoding == "dict":
+            return len(self.values)
+        if self.encoding == "int":
+            return len(set(self.codes))
+        return len({id(v) for v in self.values}) if self.encoding == "plain" else len(set(self))
+
+    def nbytes(self) -> int:
+        """Approximate resident bytes: containers plus every distinct object they reference"""
+        total = sys.getsizeof(self.values)
+        seen = set()
+        for container in (self.values, self.suffixes or ()):
+            for value in container:
+                if id(value) not in seen:
+                    seen.add(id(value))
+                    total += sys.getsizeof(value)
+        if self.codes is not None:
+            total += sys.getsizeof(self.codes)
+        if self.suffixes is not None:
+            total += sys.getsizeof(self.suffixes)
+        return total
+
+    def __iter__(self) -> Iterator[Any]:
+        return (self[i] for i in range(len(self)))
+
+    def to_state(self) -> Tuple[Any, ...]:
+        codes = (self.codes.typecode, self.codes.tobytes()) if self.codes is not None else None
+        return (self.name, self.encoding, codes, self.values, self.suffixes)
+
+    @classmethod
+    def from_state(cls, state: Tuple[Any, ...]) -> "Column":
+        name, encoding, codes, values, suffixes = state
+        if codes is not None:
+            typecode, data = codes
+            codes = array(typecode)
+            codes.frombytes(data)
+        return cls(name, encoding, codes, list(values), list(suffixes) if suffixes is not None else None)
+
+
+# ============ ROW STORE ============
+class Row:
+    """Read-only mapping view of one stored row; fields are decoded on access"""
+
+    __slots__ = ("_store", "_i")
+
+    def __init__(self, store: "RowStore", i: int):
+        self._store = store
+        self._i = i
+
+    def get(self, name: str, default: Any = None) -> Any:
+        column = self._store.by_name.get(name)
+        return default if column is None else column[self._i]
+
+    def __getitem__(self, name: str) -> Any:
+        column = self._store.by_name.get(name)
+        if column is None:
+            raise KeyError(name)
+        return column[self._i]
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._store.by_name
+
+    def keys(self) -> List[str]:
+        return list(self._store.by_name)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._store.by_name)
+
+    def __len__(self) -> int:
+        return len(self._store.by_name)
+
+    def values(self) -> List[Any]:
+        return [column[self._i] for column in self._store.columns]
+
+    def items(self) -> List[Tuple[str, Any]]:
+        return [(column.name, column[self._i]) for column in self._store.columns]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return dict(self.items())
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (Row, dict)):
+            return self.to_dict() == dict(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"Row({self.to_dict()!r})"
+
+
+class RowStore:
+    """Columnar table of CSV rows; store[i] is a lazily decoded Row"""
+
+    __slots__ = ("columns", "by_name", "n")
+
+    def __init__(self, columns: List[Column], n: int):
+        self.columns = columns
+        self.by_name: Dict[str, Column] = {column.name: column for column in columns}
+        self.n = n
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Dict[str, Any]]) -> "RowStore":
+        """Encode rows (e.g. streamed from csv.DictReader); columns follow the first row"""
+        names: List[str] = []
+        raw: List[List[Any]] = []
+        n = 0
+        for row in rows:
+            if not n:
+                names = [name for name in row.keys() if name is not None]
+                raw = [[] for _ in names]
+            for name, values in zip(names, raw):
+                values.append(row.get(name))
+            n += 1
+        return cls([Column.encode(name, values) for name, values in zip(names, raw)], n)
+
+    def __len__(self) -> int:
+        return self.n
+
+    def __getitem__(self, i: int) -> Row:
+        if not 0 <= i < self.n:
+            raise IndexError(i)
+        return Row(self, i)
+
+    def __iter__(self) -> Iterator[Row]:
+        return (Row(self, i) for i in range(self.n))
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """Encoding, distinct values and approximate bytes of every column"""
+        return [{"column": c.name, "encoding": c.encoding, "distinct": c.distinct(),
+                 "bytes": c.nbytes()} for c in self.columns]
+
+    def to_state(self) -> Dict[str, Any]:
+        """Export as plain builtins (code arrays as bytes) for the on-disk snapshot"""
+        return {"n": self.n, "columns": [column.to_state() for column in self.columns]}
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> "RowStore":
+        return cls([Column.from_state(column) for column in state["columns"]], state["n"])
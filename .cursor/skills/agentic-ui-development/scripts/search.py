@@ -12,21 +12,156 @@ Usage:
     python search.py "ai chat" --design-system             # 生成完整设计系统
     python search.py "ai chat" --design-system --project-name "My AI App"  # 指定项目名
     python search.py "ai chat" --design-system --persist --project-name "My AI App"  # 持久化保存
+    python search.py --design-system --manifest projects.json --workers 0  # 按清单批量生成多个项目/页面
+    python search.py "ai chat" -ds --persist --deterministic  # 确定性输出 (内容不变则不重写文件)
+    python search.py --build-index                         # 预编译索引快照 (加速冷启动)
+    python search.py --build-index --workers 0             # 多进程分片构建 (0 表示使用全部 CPU)
+    python search.py --index-stats                         # 各列与索引的内存占用 (配合 --client 查看常驻服务)
+    python search.py "chat bubble" --client                # 通过常驻服务查询 (自动启动)
+    python search.py --serve                               # 前台运行常驻服务
+    python search.py --batch queries.jsonl                 # 批量查询 (每行一个查询，- 表示 stdin)
+    python search.py "bubbel" --fuzzy                      # 容错搜索 (自动纠正拼写错误)
+    python search.py "bub" --complete                      # 前缀补全 (名称、中文名、关键词、令牌)
+    python search.py "ai chat" -ds --timings               # 输出各阶段耗时与计数 (stderr)
+    python search.py "ai chat" -ds --profile out.prof      # cProfile 剖析 (不带文件名时打印前 30 项)
 
 Arguments:
     --project-name, -p   项目名称，用于设计系统输出的标题
     --persist            保存设计系统到 design-system/ 目录
     --page               创建页面特定的覆盖规则文件
+    --manifest           项目清单 (JSON，安装 PyYAML 后支持 YAML)，批量写入各项目 MASTER.md 与页面文件
+    --deterministic      持久化文件以数据版本代替生成时间，生成时间记录在 .generated.json 中
+    --build-index        编译 data/search-index.bin 索引快照
+    --workers            --build-index / --manifest 的并行进程数 (默认 1，0 为 CPU 核数)；索引快照与单进程逐字节一致
+    --index-stats        报告每个领域各列的编码方式与内存占用，BM25 索引大小，以及结果缓存命中计数
+    --client             通过 Unix socket 常驻服务执行查询，服务未运行时自动启动
+    --serve              以常驻服务模式运行 (保持索引在内存中)
+    --batch              批量查询文件 (JSON lines 或纯文本)，每行输出一个 JSON 结果
+    --fuzzy              纠正索引中不存在的查询词 (编辑距离 ≤ 2)
+    --complete           将查询作为前缀，返回补全候选
+    --timings            打印分阶段耗时树与计数器 (--timings json 输出 JSON)，写入 stderr
+    --profile            使用 cProfile 运行，可指定 .prof 输出文件
+
+Environment:
+    AGENTIC_UI_RESULT_CACHE_DIR   查询结果缓存的磁盘目录 (跨进程共享命中；数据文件变化后自动失效)
 """
 
-import json
+import sys
 import argparse
-from typing import Dict, Any, List
+from types import SimpleNamespace
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+
+import telemetry
+
+# Same as core.CSV_CONFIG's domains and core.MAX_RESULTS; core is only imported
+# on the local backend path, so --client runs never load it
+DOMAINS = ("component", "plugin", "hook", "token")
+MAX_RESULTS = 5
+
+# Queries per search_many() call when streaming a --batch file
+BATCH_CHUNK_SIZE = 256
+
+
+# json, design_system (and the datetime it needs) are imported on first use:
+# a plain lookup only pays for core
+def _to_json(value: Any, indent: Optional[int] = 2) -> str:
+    import json
+    return json.dumps(value, ensure_ascii=False, indent=indent)
+
+
+def _from_json(text: str) -> Any:
+    import json
+    return json.loads(text)
+
+
+def generate_design_system(*args, **kwargs) -> str:
+    from design_system import generate_design_system as generate
+    return generate(*args, **kwargs)
+
+
+def generate_and_persist(*args, **kwargs) -> Dict[str, Any]:
+    from design_system import generate_and_persist as generate
+    return generate(*args, **kwargs)
+
+
+def _local_backend() -> SimpleNamespace:
+    """Search entry points executed in this process"""
+    from core import (search, search_all, search_many, match_reasoning_rule, get_reasoning_rules,
+                      complete, index_stats)
+
+    return SimpleNamespace(
+        search=search,
+        search_all=search_all,
+        search_many=search_many,
+        match_reasoning_rule=match_reasoning_rule,
+        get_reasoning_rules=get_reasoning_rules,
+        complete=complete,
+        index_stats=index_stats,
+        generate_design_system=generate_design_system,
+        generate_and_persist=generate_and_persist,
+    )
+
+
+def _read_batch(source: str, default_domain: Optional[str]) -> Iterator[Tuple[str, Optional[str]]]:
+    """Yield (query, domain) pairs from a batch file or stdin ("-").
+
+    Each non-empty line is a JSON string, a JSON object with "query" and an
+    optional "domain", or plain query text.
+    """
+    stream = sys.stdin if source == "-" else open(source, "r", encoding="utf-8")
+    try:
+        for line in stream:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                item = _from_json(line)
+            except ValueError:
+                item = line
+            if isinstance(item, dict):
+                yield str(item.get("query", "")), item.get("domain", default_domain)
+            else:
+                yield str(item), default_domain
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+
+def run_batch(backend: SimpleNamespace, source: str, domain: Optional[str], limit: int,
+              **options) -> None:
+    """Stream one JSON result per input line, in input order"""
+    def flush(chunk: List[Tuple[str, Optional[str]]]) -> None:
+        results: List[Any] = [None] * len(chunk)
+        by_domain: Dict[Optional[str], List[int]] = {}
+        for i, (_, item_domain) in enumerate(chunk):
+            by_domain.setdefault(item_domain, []).append(i)
+        for item_domain, positions in by_domain.items():
+            batch = backend.search_many([chunk[i][0] for i in positions], item_domain, limit, **options)
+            for i, result in zip(positions, batch):
+                results[i] = result
+        for result in results:
+            sys.stdout.write(_to_json(result, indent=None) + "\n")
+        sys.stdout.flush()
+
+    chunk: List[Tuple[str, Optional[str]]] = []
+    for item in _read_batch(source, domain):
+        chunk.append(item)
+        if len(chunk) >= BATCH_CHUNK_SIZE:
+            flush(chunk)
+            chunk = []
+    if chunk:
+        flush(chunk)
+
 
-from core import search, search_all, match_reasoning_rule, get_reasoning_rules, CSV_CONFIG, MAX_RESULTS
-from design_system import generate_design_system
+def format_corrections(result: Dict[str, Any]) -> Optional[str]:
+    """'Corrected: bubbel → bubble' line for fuzzy results, None if nothing was corrected"""
+    fixes = result.get("corrections")
+    if not fixes:
+        return None
+    return "Corrected: " + ", ".join(f"{term} → {fix}" for term, fix in fixes.items())
 
 
+@telemetry.traced("search.format")
 def format_search_output(result: Dict[str, Any]) -> str:
     """Format search results for terminal display (token-optimized)"""
     if "error" in result:
@@ -35,6 +170,9 @@ def format_search_output(result: Dict[str, Any]) -> str:
     output = []
     output.append(f"## Agentic UI Search Results")
     output.append(f"**Domain:** {result['domain']} | **Query:** {result['query']}")
+    corrected = format_corrections(result)
+    if corrected:
+        output.append(f"**{corrected}**")
     output.append(f"**Source:** {result['file']} | **Found:** {result['count']} results\n")
 
     for i, row in enumerate(result['results'], 1):
@@ -65,12 +203,15 @@ def format_component_result(component: Dict[str, str]) -> str:
 └─────────────────────────────────────────────────────────────────┘"""
 
 
-def format_recommendation_result(rec: Dict[str, Any]) -> str:
+@telemetry.traced("search.format")
+def format_recommendation_result(rec: Dict[str, Any], rules_data: Optional[Dict[str, Any]] = None) -> str:
     """格式化推荐结果 (ASCII box)"""
     if not rec:
         return "\n[Warning] No matching rule found. Try more specific keywords.\n"
     
-    rules_data = get_reasoning_rules()
+    if rules_data is None:
+        from core import get_reasoning_rules
+        rules_data = get_reasoning_rules()
     checklist = rules_data.get("pre_delivery_checklist", [])
     
     components = ", ".join(rec.get("recommended_components", [])) or "N/A"
@@ -115,15 +256,19 @@ def format_recommendation_result(rec: Dict[str, Any]) -> str:
 """
 
 
+@telemetry.traced("search.format")
 def format_all_results(results: Dict[str, Any], query: str, output_format: str, limit: int) -> str:
     """Format all domain results"""
     all_results = results.get("results", {})
     
     if output_format == "json":
-        return json.dumps(results, ensure_ascii=False, indent=2)
+        return _to_json(results)
     
     elif output_format == "markdown":
         lines = [f"# Search Results: {query}\n"]
+        corrected = format_corrections(results)
+        if corrected:
+            lines.append(f"_{corrected}_\n")
         
         if all_results.get("component"):
             lines.append("## Components\n")
@@ -159,6 +304,9 @@ def format_all_results(results: Dict[str, Any], query: str, output_format: str,
         # ASCII format
         total = results.get("total_count", 0)
         lines = [f"\n[Search] Results for: '{query}' ({total} found)\n"]
+        corrected = format_corrections(results)
+        if corrected:
+            lines.insert(1, f"  {corrected}\n")
         
         if all_results.get("component"):
             lines.append("=" * 70)
@@ -200,6 +348,68 @@ def format_all_results(results: Dict[str, Any], query: str, output_format: str,
         return "\n".join(lines)
 
 
+def _kb(nbytes: int) -> str:
+    return f"{nbytes / 1024:,.1f} KB"
+
+
+def format_index_stats(stats: Dict[str, Any]) -> str:
+    """Text report of index_stats(): one table of columns per domain"""
+    lines = []
+    for domain, info in stats["domains"].items():
+        index = info["index"]
+        lines.append(f"{domain} ({info['file']}): {info['rows']} rows | stored rows {_kb(info['rows_bytes'])} | "
+                     f"index {_kb(index['bytes'])} ({index['terms']} terms, {index['postings']} postings)")
+        lines.append(f"  {'column':<18}{'encoding':<10}{'distinct':>10}{'bytes':>14}")
+        for column in info["columns"]:
+            lines.append(f"  {column['column']:<18}{column['encoding']:<10}"
+                         f"{column['distinct']:>10}{column['bytes']:>14,}")
+        lines.append("")
+    federated = stats["federated"]
+    lines.append(f"federated index: {_kb(federated['bytes'])} ({federated['terms']} terms, "
+                 f"{federated['postings']} postings)")
+    lines.append(f"total: {_kb(stats['total_bytes'])}")
+    cache = stats.get("result_cache")
+    if cache:
+        lines.append(f"result cache: {cache['entries']}/{cache['max_entries']} entries | hits {cache['hits']} "
+                     f"(disk {cache['disk_hits']}) | misses {cache['misses']} | evictions {cache['evictions']} | "
+                     f"invalidations {cache['invalidations']}")
+    return "\n".join(lines)
+
+
+def format_persist_report(persisted: Dict[str, Any]) -> str:
+    """Which files of a persisted design system were written or left unchanged"""
+    lines = [f"✅ Design system persisted to {persisted['design_system_dir']}/ "
+             f"({len(persisted['written_files'])} written, {len(persisted['skipped_files'])} unchanged)"]
+    for path in persisted["written_files"]:
+        lines.append(f"   📄 {path}")
+    for path in persisted["skipped_files"]:
+        lines.append(f"   ·  {path} (unchanged)")
+    return "\n".join(lines)
+
+
+def run_manifest(args: argparse.Namespace) -> None:
+    """--design-system --manifest: bulk generation in this process (never through --client)"""
+    import os
+    from design_system import generate_from_manifest
+    try:
+        summary = generate_from_manifest(args.manifest, args.output_dir, args.workers or os.cpu_count() or 1,
+                                         args.deterministic)
+    except (OSError, ValueError, ImportError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    if args.format == "json":
+        print(_to_json(summary))
+        return
+    for project in summary["projects"]:
+        print(f"✅ {project['name']}: {len(project['written'])} written, {len(project['skipped'])} unchanged")
+        for path in project["written"]:
+            print(f"   📄 {path}")
+        for path in project["skipped"]:
+            print(f"   ·  {path} (unchanged)")
+    print(f"{len(summary['projects'])} projects in {summary['output_dir']}: "
+          f"{summary['written_count']} files written, {summary['skipped_count']} unchanged")
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Agentic UI Search Tool"
@@ -207,13 +417,14 @@ def main():
     parser.add_argument(
         "query",
         type=str,
+        nargs="?",
         help="Search query"
     )
     parser.add_argument(
         "--domain",
         "-d",
         type=str,
-        choices=list(CSV_CONFIG.keys()) + ["all"],
+        choices=list(DOMAINS) + ["all"],
         default="all",
         help="Search domain (default: all)"
     )
@@ -264,6 +475,17 @@ def main():
         default=None,
         help="Create page-specific override file in design-system/pages/"
     )
+    parser.add_argument(
+        "--manifest",
+        type=str,
+        default=None,
+        help="With --design-system: JSON (or YAML) list of projects and pages to generate and persist in bulk"
+    )
+    parser.add_argument(
+        "--deterministic",
+        action="store_true",
+        help="Stamp persisted files with the data version instead of the time (time goes to .generated.json)"
+    )
     parser.add_argument(
         "--output-dir",
         "-o",
@@ -271,31 +493,183 @@ def main():
         default=None,
         help="Output directory for persisted files (default: current directory)"
     )
+    # Index snapshot
+    parser.add_argument(
+        "--build-index",
+        action="store_true",
+        help="Compile data files into data/search-index.bin for fast cold starts"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Processes for a sharded --build-index or a --manifest run (0: one per CPU); output is identical"
+    )
+    parser.add_argument(
+        "--index-stats",
+        action="store_true",
+        help="Report memory per stored column and per BM25 index (of the server with --client)"
+    )
+    # Batch mode
+    parser.add_argument(
+        "--batch",
+        type=str,
+        default=None,
+        metavar="FILE",
+        help="Run every query in FILE (JSON lines or plain text, '-' for stdin); prints one JSON result per line"
+    )
+    parser.add_argument(
+        "--fuzzy",
+        action="store_true",
+        help="Correct query terms that are not in the index (edit distance <= 2)"
+    )
+    parser.add_argument(
+        "--complete",
+        action="store_true",
+        help="Treat the query as a prefix and list completions (names, name_cn, keywords, tokens)"
+    )
+    # Instrumentation
+    parser.add_argument(
+        "--timings",
+        nargs="?",
+        const="text",
+        choices=["text", "json"],
+        default=None,
+        help="Print per-stage timings and counters to stderr (text or json); in-process work only"
+    )
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="-",
+        default=None,
+        metavar="FILE",
+        help="Run under cProfile; write stats to FILE or print the top entries to stderr"
+    )
+    # Resident server
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        help="Run the search server on a Unix socket (keeps indexes in memory)"
+    )
+    parser.add_argument(
+        "--client",
+        action="store_true",
+        help="Send the query to the search server, starting it if it is not running"
+    )
+    parser.add_argument(
+        "--socket",
+        type=str,
+        default=None,
+        help="Unix socket path for --serve/--client (default: per-user temp path)"
+    )
     
     args = parser.parse_args()
+
+    if args.timings:
+        telemetry.enable()
+    profiler = None
+    if args.profile:
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+    try:
+        with telemetry.span("search.main"):
+            run(args, parser)
+    finally:
+        if profiler is not None:
+            profiler.disable()
+            if args.profile == "-":
+                import pstats
+                pstats.Stats(profiler, stream=sys.stderr).sort_stats("cumulative").print_stats(30)
+            else:
+                profiler.dump_stats(args.profile)
+        if args.timings == "json":
+            print(_to_json(telemetry.report()), file=sys.stderr)
+        elif args.timings:
+            print(telemetry.format_report(), file=sys.stderr)
+
+
+def run(args: argparse.Namespace, parser: argparse.ArgumentParser) -> None:
+    """Execute the parsed command line"""
+    if args.serve:
+        from server import serve
+        serve(args.socket)
+        return
+
+    if args.build_index:
+        import os
+        from core import build_snapshot
+        info = build_snapshot(workers=args.workers or os.cpu_count() or 1)
+        if args.format == "json":
+            print(_to_json(info))
+        else:
+            print(f"Index snapshot written: {info['path']} ({info['bytes']} bytes)")
+            for name, count in info["tables"].items():
+                print(f"  {name}: {count} rows")
+        if args.query is None and args.batch is None:
+            return
+
+    if args.manifest is not None:
+        if not args.design_system:
+            parser.error("--manifest requires --design-system")
+        run_manifest(args)
+        return
+
+    if args.query is None and args.batch is None and not args.index_stats:
+        parser.error("the following arguments are required: query")
+
+    if args.client:
+        from server import RemoteBackend
+        backend = RemoteBackend(args.socket)
+    else:
+        backend = _local_backend()
+
+    if args.index_stats:
+        stats = backend.index_stats()
+        print(_to_json(stats) if args.format == "json" else format_index_stats(stats))
+        return
+
+    # Only pass options that were set, so older servers keep accepting requests
+    options = {"fuzzy": True} if args.fuzzy else {}
+
+    if args.batch is not None:
+        run_batch(backend, args.batch, args.domain, args.limit, **options)
+        return
     
+    if args.complete:
+        domain = None if args.domain == "all" else args.domain
+        completions = backend.complete(args.query, domain, args.limit)
+        if args.format == "json":
+            print(_to_json(completions))
+        else:
+            for c in completions:
+                target = f" → {c['name']}" if c["name"] and c["name"] != c["text"] else ""
+                print(f"{c['text']}{target}  [{c['domain']}/{c['field']}]")
+        return
+
     # Design system takes priority
     if args.design_system:
         ds_format = "markdown" if args.format == "markdown" else "ascii"
-        result = generate_design_system(
-            args.query,
-            args.project_name,
-            ds_format,
-            persist=args.persist,
-            page=args.page,
-            output_dir=args.output_dir
-        )
-        print(result)
+        try:
+            result = backend.generate_and_persist(
+                args.query,
+                args.project_name,
+                ds_format,
+                persist=args.persist,
+                page=args.page,
+                output_dir=args.output_dir,
+                deterministic=args.deterministic
+            )
+        except ValueError as e:   # unsafe project or page name
+            print(f"Error: {e}", file=sys.stderr)
+            sys.exit(1)
+        print(result["output"])
         
-        # Print persistence confirmation
-        if args.persist:
+        # Print persistence report (which files were written, which were unchanged)
+        if result["persisted"]:
             project_slug = args.project_name.lower().replace(' ', '-') if args.project_name else "default"
             print("\n" + "=" * 60)
-            print(f"✅ Design system persisted to design-system/{project_slug}/")
-            print(f"   📄 design-system/{project_slug}/MASTER.md (Global Source of Truth)")
-            if args.page:
-                page_filename = args.page.lower().replace(' ', '-')
-                print(f"   📄 design-system/{project_slug}/pages/{page_filename}.md (Page Overrides)")
+            print(format_persist_report(result["persisted"]))
             print("")
             print(f"📖 Usage: When building a page, check design-system/{project_slug}/pages/[page].md first.")
             print(f"   If exists, its rules override MASTER.md. Otherwise, use MASTER.md.")
@@ -304,9 +678,9 @@ def main():
     
     # Get recommendation
     if args.recommend:
-        rule = match_reasoning_rule(args.query)
+        rule = backend.match_reasoning_rule(args.query)
         if args.format == "json":
-            print(json.dumps(rule or {}, ensure_ascii=False, indent=2))
+            print(_to_json(rule or {}))
         elif args.format == "markdown":
             if rule:
                 print(f"## Recommendations for: {args.query}\n")
@@ -323,17 +697,17 @@ def main():
             else:
                 print("No matching rule found.")
         else:
-            print(format_recommendation_result(rule))
+            print(format_recommendation_result(rule, backend.get_reasoning_rules() if rule else None))
         return
     
     # Domain-specific or all-domain search
     if args.domain == "all":
-        results = search_all(args.query, args.limit)
+        results = backend.search_all(args.query, args.limit, **options)
         print(format_all_results(results, args.query, args.format, args.limit))
     else:
-        result = search(args.query, args.domain, args.limit)
+        result = backend.search(args.query, args.domain, args.limit, **options)
         if args.format == "json":
-            print(json.dumps(result, ensure_ascii=False, indent=2))
+            print(_to_json(result))
         else:
             print(format_search_output(result))
 
@@ -0,0 +1,356 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Agentic UI Segments - incremental BM25 updates over immutable segments
+
+A SegmentedBM25 keeps its postings in a list of segments, each covering a
+contiguous range of doc ids: the base segment of the original fit followed
+by one delta segment per update. An update adds a small segment for the
+new or edited documents and tombstones the deleted ones, so its cost is
+proportional to the change, not to the corpus.
+
+Global statistics are maintained incrementally: N and the total document
+length are adjusted per added or deleted document, and document frequencies
+per term of those documents. IDF, the MaxScore bounds and a term's live
+posting list (segments concatenated, tombstones dropped) are derived on
+first use after an update. Scores are therefore identical to a fresh fit
+over the live documents.
+
+Segments are merged in a background thread once the newer segments reach
+MERGE_RATIO of the size of an older one, once MERGE_RATIO of a segment's
+documents are deleted, or when there are more than MAX_SEGMENTS. A merge
+drops the postings of deleted documents and keeps doc ids unchanged. It
+publishes the new segment list and tombstone set together as one view with
+a new generation; a live posting list is only cached by a reader whose
+computation started on the current generation.
+
+    index = SegmentedBM25.from_bm25(bm25)
+    index, new_ids = index.updated(added=[tokens, ...], deleted=[(doc_id, old_tokens), ...])
+"""
+
+import sys
+import threading
+from array import array
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Set, Tuple
+
+from core import BM25
+from postings import PostingList, PostingsBuilder, TYPECODE
+
+# ============ CONFIGURATION ============
+# Merge the newest segments into an older one once they hold this share of its postings
+MERGE_RATIO = 0.25
+MAX_SEGMENTS = 8
+# Run merges on a daemon thread (False: merge synchronously inside updated())
+MERGE_IN_BACKGROUND = True
+
+
+class Segment:
+    """Immutable postings for doc ids start <= doc_id < end"""
+
+    __slots__ = ("postings", "start", "end", "size")
+
+    def __init__(self, postings: Dict[str, PostingList], start: int, end: int):
+        self.postings = postings
+        self.start = start
+        self.end = end
+        self.size = sum(len(plist) for plist in postings.values())
+
+
+class _LiveTable:
+    """Read-only mapping over the live vocabulary, values computed on first access.
+
+    Values are only cached while `current()` still returns the generation
+    the table was bound to, so a computation that overlaps a merge is used
+    once but never kept.
+    """
+
+    __slots__ = ("_terms", "_compute", "_values", "_generation", "_current")
+
+    def __init__(self, terms: Dict[str, int], compute: Callable[[str], Any],
+                 generation: int = 0, current: Optional[Callable[[], int]] = None):
+        self._terms = terms
+        self._compute = compute
+        self._values: Dict[str, Any] = {}
+        self._generation = generation
+        self._current = current
+
+    def get(self, term: str, default: Any = None) -> Any:
+        value = self._values.get(term)
+        if value is None:
+            if term not in self._terms:
+                return default
+            value = self._compute(term)
+            if self._current is None or self._current() == self._generation:
+                self._values[term] = value
+        return value
+
+    def __getitem__(self, term: str) -> Any:
+        value = self.get(term)
+        if value is None:
+            raise KeyError(term)
+        return value
+
+    def __contains__(self, term: object) -> bool:
+        return term in self._terms
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._terms)
+
+    def __len__(self) -> int:
+        return len(self._terms)
+
+    def keys(self):
+        return self._terms.keys()
+
+    def values(self) -> Iterator[Any]:
+        return (self[term] for term in self._terms)
+
+    def items(self) -> Iterator[Tuple[str, Any]]:
+        return ((term, self[term]) for term in self._terms)
+
+    def clear(self) -> None:
+        self._values.clear()
+
+
+# ============ SEGMENTED INDEX ============
+class SegmentedBM25(BM25):
+    """BM25 index that accepts added and deleted documents without a refit.
+
+    Instances are never modified by updates: updated() returns a new index
+    sharing the immutable segments, so readers holding the old one keep a
+    consistent view. A merge replaces the (segments, tombstones, generation)
+    view of a published index as a whole, under its lock; readers take the
+    view once per computation. Only the python scoring engine is used.
+    """
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75, analyzer=None, query_analyzer=None):
+        super().__init__(k1, b, "python", analyzer, query_analyzer)
+        # (segments, deleted doc ids, generation); never modified once published
+        self._view: Tuple[List[Segment], Set[int], int] = ([], set(), 0)
+        self.total_length = 0
+        self._norms: Optional[List[float]] = None
+        self._lock = threading.Lock()
+        self._merger: Optional[threading.Thread] = None
+        self.doc_freqs: Dict[str, int] = {}
+        self._bind_views()
+
+    def _bind_views(self) -> None:
+        """Fresh derived tables for the current view (old tables stay valid for their readers)"""
+        view = self._view
+        current = self._generation
+        postings = _LiveTable(self.doc_freqs, lambda term: self._live_postings(term, view), view[2], current)
+        self.postings = postings
+        self.idf = _LiveTable(self.doc_freqs, lambda term: self._idf_of(self.doc_freqs[term]))
+        self.term_max = _LiveTable(self.doc_freqs, lambda term: self._term_bound(term, postings[term]),
+                                   view[2], current)
+
+    def _generation(self) -> int:
+        return self._view[2]
+
+    @property
+    def segments(self) -> List[Segment]:
+        return self._view[0]
+
+    @property
+    def dead(self) -> Set[int]:
+        return self._view[1]
+
+    @classmethod
+    def from_bm25(cls, bm25: BM25) -> "SegmentedBM25":
+        """Wrap a fitted index as the base segment (its postings are shared, not copied)"""
+        index = cls(bm25.k1, bm25.b, bm25.analyzer, bm25.query_analyzer)
+        index._view = ([Segment(bm25.postings, 0, len(bm25.doc_lengths))], set(), 0)
+        index._bind_views()
+        index.doc_lengths = array(TYPECODE, bm25.doc_lengths)
+        index.doc_freqs.update((term, len(plist)) for term, plist in bm25.postings.items())
+        index.N = len(index.doc_lengths)
+        index.total_length = sum(index.doc_lengths)
+        index.avgdl = index.total_length / index.N if index.N else 0
+        return index
+
+    # ---- derived statistics ----
+    @property
+    def doc_norms(self) -> List[float]:
+        """Length norms under the current avgdl, recomputed once per update"""
+        norms = self._norms
+        if norms is None:
+            k1, b, avgdl = self.k1, self.b, self.avgdl
+            norms = self._norms = [k1 * (1 - b + b * dl / avgdl) if avgdl else 0.0
+                                   for dl in self.doc_lengths]
+        return norms
+
+    @doc_norms.setter
+    def doc_norms(self, value: List[float]) -> None:
+        self._norms = value or None
+
+    @staticmethod
+    def _has_deleted(segment: Segment, dead: Set[int]) -> bool:
+        return any(segment.start <= doc_id < segment.end for doc_id in dead)
+
+    def _live_postings(self, term: str, view: Tuple[List[Segment], Set[int], int]) -> PostingList:
+        """A term's postings across the view's segments (ascending doc ids), tombstones removed"""
+        segments, dead, _ = view
+        lists = [(segment.postings[term], self._has_deleted(segment, dead))
+                 for segment in segments if term in segment.postings]
+        if len(lists) == 1 and not lists[0][1]:
+            return lists[0][0]
+        doc_ids, tfs = array(TYPECODE), array(TYPECODE)
+        for plist, filtered in lists:
+            if filtered:
+                for doc_id, tf in plist.items():
+                    if doc_id not in dead:
+                        doc_ids.append(doc_id)
+                        tfs.append(tf)
+            else:
+                doc_ids.extend(plist.doc_ids)
+                tfs.extend(plist.tfs)
+        return PostingList(doc_ids, tfs)
+
+    def _uses_numpy(self) -> bool:
+        return False
+
+    # ---- updates ----
+    def _copy(self) -> "SegmentedBM25":
+        index = SegmentedBM25(self.k1, self.b, self.analyzer, self.query_analyzer)
+        segments, dead, _ = self._view
+        # The copy is not shared until returned, so updated() may fill these in place
+        index._view = (list(segments), set(dead), 0)
+        index.doc_lengths = array(TYPECODE, self.doc_lengths)
+        index.doc_freqs.update(self.doc_freqs)
+        index.N = self.N
+        index.total_length = self.total_length
+        return index
+
+    def updated(self, added: Sequence[Sequence[str]] = (),
+                deleted: Sequence[Tuple[int, Sequence[str]]] = ()) -> Tuple["SegmentedBM25", List[int]]:
+        """A new index with documents added and deleted; this one is left unchanged.
+
+        Args:
+            added: Analyzed documents to append (they get the next doc ids)
+            deleted: (doc_id, analyzed document) pairs; the tokens are needed to
+                lower the document frequencies of the document's terms
+
+        Returns:
+            (new index, doc ids assigned to `added`)
+        """
+        index = self._copy()
+        segments, dead, _ = index._view
+        doc_freqs = index.doc_freqs
+        for doc_id, tokens in deleted:
+            if doc_id in dead or not 0 <= doc_id < len(index.doc_lengths):
+                continue
+            dead.add(doc_id)
+            index.N -= 1
+            index.total_length -= index.doc_lengths[doc_id]
+            for term in set(tokens):
+                freq = doc_freqs.get(term, 0) - 1
+                if freq > 0:
+                    doc_freqs[term] = freq
+                else:
+                    doc_freqs.pop(term, None)
+
+        start = len(index.doc_lengths)
+        new_ids = list(range(start, start + len(added)))
+        if added:
+            builder = PostingsBuilder(first_id=start)
+            for tokens in added:
+                builder.add(tokens)
+            postings = builder.finish()
+            for term, plist in postings.items():
+                doc_freqs[term] = doc_freqs.get(term, 0) + len(plist)
+            segments.append(Segment(postings, start, start + len(added)))
+            index.doc_lengths.extend(builder.doc_lengths)
+            index.N += len(added)
+            index.total_length += sum(builder.doc_lengths)
+
+        index.avgdl = index.total_length / index.N if index.N else 0
+        index._bind_views()
+        index._schedule_merge()
+        return index, new_ids
+
+    # ---- merging ----
+    @staticmethod
+    def _merge_plan(segments: List[Segment], dead: Set[int]) -> Optional[int]:
+        """Index of the oldest segment to merge with everything after it, or None"""
+        first = None
+        newer = 0
+        for i in range(len(segments) - 1, 0, -1):
+            newer += segments[i].size
+            if newer >= MERGE_RATIO * segments[i - 1].size:
+                first = i - 1
+                break
+        for i, segment in enumerate(segments[:first]):
+            deleted = sum(1 for doc_id in dead if segment.start <= doc_id < segment.end)
+            if deleted and deleted >= MERGE_RATIO * (segment.end - segment.start):
+                first = i
+                break
+        if first is None and len(segments) > MAX_SEGMENTS:
+            first = 1
+        return first
+
+    def _schedule_merge(self) -> None:
+        segments, dead, _ = self._view
+        if self._merge_plan(segments, dead) is None:
+            return
+        if not MERGE_IN_BACKGROUND:
+            self.merge()
+            return
+        with self._lock:
+            if self._merger is not None and self._merger.is_alive():
+                return
+            self._merger = threading.Thread(target=self.merge, name="agentic-ui-segment-merge", daemon=True)
+            self._merger.start()
+
+    def merge(self, force: bool = False) -> bool:
+        """Merge segments by the size-ratio policy (all into one when force); True if merged"""
+        segments, dead, generation = self._view
+        first = 0 if force else self._merge_plan(segments, dead)
+        if first is None or not segments:
+            return False
+
+        merging = segments[first:]
+        terms: Dict[str, List[PostingList]] = {}
+        for segment in merging:
+            for term, plist in segment.postings.items():
+                terms.setdefault(term, []).append(plist)
+        postings: Dict[str, PostingList] = {}
+        for term, lists in terms.items():
+            doc_ids, tfs = array(TYPECODE), array(TYPECODE)
+            for plist in lists:
+                for doc_id, tf in plist.items():
+                    if doc_id not in dead:
+                        doc_ids.append(doc_id)
+                        tfs.append(tf)
+            if doc_ids:
+                postings[term] = PostingList(doc_ids, tfs)
+        merged = Segment(postings, merging[0].start, merging[-1].end)
+
+        purged = {doc_id for doc_id in dead if merged.start <= doc_id < merged.end}
+        with self._lock:
+            if self._view[2] != generation:   # another merge published first
+                return False
+            # New objects: readers may still be iterating the previous view
+            self._view = (segments[:first] + [merged], dead - purged, generation + 1)
+            self._bind_views()
+        return True
+
+    def wait(self) -> None:
+        """Block until a background merge (if any) has finished"""
+        merger = self._merger
+        if merger is not None:
+            merger.join()
+
+    def memory_stats(self) -> Dict[str, int]:
+        segments, dead, _ = self._view
+        postings_bytes = sum(plist.nbytes() for segment in segments for plist in segment.postings.values())
+        stats = {
+            "docs": self.N,
+            "terms": len(self.doc_freqs),
+            "postings": sum(segment.size for segment in segments),
+            "postings_bytes": postings_bytes,
+            "segments": len(segments),
+            "deleted": len(dead),
+        }
+        stats["bytes"] = (postings_bytes + sys.getsizeof(self.doc_freqs) + sys.getsizeof(self.doc_lengths)
+                          + sum(sys.getsizeof(term) for term in self.doc_freqs))
+        return stats
@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Agentic UI Search Server - keeps indexes warm behind a Unix domain socket
+
+The server answers newline-delimited JSON requests of the form
+``{"op": "search", "args": {...}}`` with ``{"ok": true, "result": ...}`` or
+``{"ok": false, "error": "..."}``. The client side only needs ``socket`` and
+``json``, so a lookup costs an interpreter start plus one round trip instead
+of loading and fitting every data file.
+
+Usage:
+    python server.py                          # 前台运行守护进程
+    python server.py --socket /tmp/ui.sock    # 指定 socket 路径
+    python search.py "chat bubble" --client   # 通过守护进程查询 (未运行时自动启动)
+"""
+
+import json
+import os
+import socket
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+# ============ CONFIGURATION ============
+SOCKET_ENV = "AGENTIC_UI_SEARCH_SOCKET"
+DATA_DIR_ENV = "AGENTIC_UI_DATA_DIR"
+IDLE_TIMEOUT = 30 * 60   # auto-spawned servers exit after 30 minutes without requests
+SPAWN_TIMEOUT = 10.0
+BUFFER_SIZE = 65536
+
+
+def _instance_key() -> str:
+    """Short hash of the catalog directory and of these scripts"""
+    import zlib
+    # Same default as core.DATA_DIR (the client does not import core)
+    data_dir = os.environ.get(DATA_DIR_ENV) or Path(__file__).parent.parent / "data"
+    ident = f"{Path(data_dir).resolve()}\0{Path(__file__).resolve().parent}"
+    return f"{zlib.crc32(ident.encode('utf-8')):08x}"
+
+
+def default_socket_path() -> str:
+    """Socket path per user, catalog and checkout, overridable with $AGENTIC_UI_SEARCH_SOCKET.
+
+    A client with another $AGENTIC_UI_DATA_DIR, or run from another copy of
+    the scripts, gets its own server instead of answers from the wrong data.
+    """
+    env_path = os.environ.get(SOCKET_ENV)
+    if env_path:
+        return env_path
+    import tempfile
+    uid = os.getuid() if hasattr(os, "getuid") else os.getpid()
+    return str(Path(tempfile.gettempdir()) / f"agentic-ui-search-{uid}-{_instance_key()}.sock")
+
+
+class ServerError(RuntimeError):
+    """Raised on the client side when the server rejects a request"""
+
+
+# ============ SERVER ============
+def _operations() -> Dict[str, Callable[..., Any]]:
+    """Request handlers, resolved lazily so the client never imports core"""
+    from core import (search, search_all, search_many, match_reasoning_rule, get_reasoning_rules,
+                      get_many, complete, index_stats)
+    from design_system import generate_design_system, generate_and_persist
+
+    return {
+        "ping": lambda: "pong",
+        "search": search,
+        "search_all": search_all,
+        "search_many": search_many,
+        "match_reasoning_rule": match_reasoning_rule,
+        "get_reasoning_rules": get_reasoning_rules,
+        "get_many": get_many,
+        "complete": complete,
+        "index_stats": index_stats,
+        "generate_design_system": generate_design_system,
+        "generate_and_persist": generate_and_persist,
+    }
+
+
+def _socket_in_use(path: str) -> bool:
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(path)
+        return True
+    except OSError:
+        return False
+    finally:
+        sock.close()
+
+
+def serve(socket_path: Optional[str] = None, idle_timeout: float = 0) -> None:
+    """Serve requests on a Unix domain socket until shutdown or idle timeout.
+
+    Args:
+        socket_path: Socket to listen on (defaults to default_socket_path())
+        idle_timeout: Seconds without requests before exiting; 0 disables it
+    """
+    import socketserver
+    import threading
+    from core import warm
+
+    path = socket_path or default_socket_path()
+    if os.path.exists(path):
+        if _socket_in_use(path):
+            print(f"Server already running on {path}", file=sys.stderr)
+            return
+        os.unlink(path)
+
+    operations = _operations()
+    warm()
+    last_request = [time.monotonic()]
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            for line in self.rfile:
+                if not line.strip():
+                    continue
+                last_request[0] = time.monotonic()
+                response = self._dispatch(line)
+                self.wfile.write(json.dumps(response, ensure_ascii=False).encode("utf-8") + b"\n")
+                self.wfile.flush()
+                if response.get("result") == "shutdown":
+                    threading.Thread(target=self.server.shutdown, daemon=True).start()
+                    return
+
+        def _dispatch(self, line: bytes) -> Dict[str, Any]:
+            try:
+                request = json.loads(line)
+                op = request.get("op")
+                if op == "shutdown":
+                    return {"ok": True, "result": "shutdown"}
+                handler = operations.get(op)
+                if handler is None:
+                    return {"ok": False, "error": f"Unknown op: {op}"}
+                return {"ok": True, "result": handler(**request.get("args", {}))}
+            except Exception as exc:  # report to the client instead of killing the connection
+                return {"ok": False, "error": f"{type(exc).__name__}: {exc}"}
+
+    class Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+        daemon_threads = True
+
+    server = Server(path, Handler)
+    os.chmod(path, 0o600)
+
+    if idle_timeout > 0:
+        def watch_idle():
+            while True:
+                time.sleep(min(idle_timeout, 5.0))
+                if time.monotonic() - last_request[0] > idle_timeout:
+                    server.shutdown()
+                    return
+        threading.Thread(target=watch_idle, daemon=True).start()
+
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        if os.path.exists(path):
+            os.unlink(path)
+
+
+# ============ CLIENT ============
+def _spawn_server(path: str) -> None:
+    """Start a detached server process for `path`"""
+    import subprocess
+    subprocess.Popen(
+        [sys.executable, str(Path(__file__).resolve()), "--socket", path,
+         "--idle-timeout", str(IDLE_TIMEOUT)],
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+        close_fds=True,
+    )
+
+
+def _connect(path: str, spawn: bool) -> socket.socket:
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(path)
+        return sock
+    except OSError:
+        if not spawn:
+            sock.close()
+            raise
+
+    _spawn_server(path)
+    deadline = time.monotonic() + SPAWN_TIMEOUT
+    while True:
+        try:
+            sock.connect(path)
+            return sock
+        except OSError:
+            if time.monotonic() > deadline:
+                sock.close()
+                raise
+            time.sleep(0.02)
+
+
+def call(op: str, socket_path: Optional[str] = None, spawn: bool = True, **kwargs) -> Any:
+    """Run one operation on the server, starting it first if needed.
+
+    Raises:
+        ServerError: if the server reports an error for the request
+        OSError: if no server is reachable (and spawning is disabled or failed)
+    """
+    path = socket_path or default_socket_path()
+    sock = _connect(path, spawn and op != "shutdown")
+    try:
+        sock.sendall(json.dumps({"op": op, "args": kwargs}, ensure_ascii=False).encode("utf-8") + b"\n")
+        chunks = []
+        while True:
+            chunk = sock.recv(BUFFER_SIZE)
+            if not chunk:
+                break
+            chunks.append(chunk)
+            if chunk.endswith(b"\n"):
+                break
+    finally:
+        sock.close()
+
+    response = json.loads(b"".join(chunks))
+    if not response.get("ok"):
+        raise ServerError(response.get("error", "unknown error"))
+    return response["result"]
+
+
+class RemoteBackend:
+    """Drop-in for the core/design_system entry points used by search.py"""
+
+    def __init__(self, socket_path: Optional[str] = None):
+        self.socket_path = socket_path
+
+    def search(self, query: str, domain: Optional[str] = None, max_results: Optional[int] = None,
+               **options):
+        kwargs = {} if max_results is None else {"max_results": max_results}
+        return call("search", self.socket_path, query=query, domain=domain, **kwargs, **options)
+
+    def search_all(self, query: str, max_results: Optional[int] = None, **options):
+        kwargs = {} if max_results is None else {"max_results": max_results}
+        return call("search_all", self.socket_path, query=query, **kwargs, **options)
+
+    def search_many(self, queries, domain: Optional[str] = None, max_results: Optional[int] = None,
+                    **options):
+        kwargs = {} if max_results is None else {"max_results": max_results}
+        return call("search_many", self.socket_path, queries=list(queries), domain=domain,
+                    **kwargs, **options)
+
+    def complete(self, prefix: str, domain: Optional[str] = None, limit: Optional[int] = None):
+        kwargs = {} if limit is None else {"limit": limit}
+        return call("complete", self.socket_path, prefix=prefix, domain=domain, **kwargs)
+
+    def index_stats(self):
+        return call("index_stats", self.socket_path)
+
+    def match_reasoning_rule(self, query: str):
+        return call("match_reasoning_rule", self.socket_path, query=query)
+
+    def get_reasoning_rules(self):
+        return call("get_reasoning_rules", self.socket_path)
+
+    def generate_design_system(self, query: str, project_name: Optional[str] = None,
+                               output_format: str = "ascii", persist: bool = False,
+                               page: Optional[str] = None, output_dir: Optional[str] = None,
+                               deterministic: bool = False):
+        return self._design_system("generate_design_system", query, project_name, output_format,
+                                   persist, page, output_dir, deterministic)
+
+    def generate_and_persist(self, query: str, project_name: Optional[str] = None,
+                             output_format: str = "ascii", persist: bool = False,
+                             page: Optional[str] = None, output_dir: Optional[str] = None,
+                             deterministic: bool = False):
+        return self._design_system("generate_and_persist", query, project_name, output_format,
+                                   persist, page, output_dir, deterministic)
+
+    def _design_system(self, op: str, query: str, project_name: Optional[str], output_format: str,
+                       persist: bool, page: Optional[str], output_dir: Optional[str], deterministic: bool):
+        # Relative output paths must resolve against the client's working directory
+        output_dir = str(Path(output_dir or os.getcwd()).resolve()) if persist else output_dir
+        # Only sent when set, so older servers keep accepting the request
+        options = {"deterministic": True} if deterministic else {}
+        return call(op, self.socket_path, query=query, project_name=project_name,
+                    output_format=output_format, persist=persist, page=page,
+                    output_dir=output_dir, **options)
+
+
+# ============ CLI SUPPORT ============
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Agentic UI Search Server")
+    parser.add_argument("--socket", "-s", type=str, default=None, help="Unix socket path")
+    parser.add_argument("--idle-timeout", type=float, default=0,
+                        help="Exit after this many idle seconds (default: never)")
+    parser.add_argument("--stop", action="store_true", help="Stop a running server")
+
+    args = parser.parse_args()
+
+    if args.stop:
+        try:
+            call("shutdown", args.socket, spawn=False)
+        except OSError:
+            print("No server running")
+    else:
+        serve(args.socket, args.idle_timeout)
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Agentic UI Telemetry - named spans and counters for the search pipeline
+
+core, design_system and search.py wrap their stages in spans (csv/json/
+snapshot loading, BM25.fit, BM25 scoring, rule matching, generation,
+formatting) and count the work they do (documents scored, postings
+touched, bytes read). Nothing is recorded until telemetry is enabled, so
+the disabled cost is one flag check per instrumented call.
+
+Usage:
+    import telemetry
+    telemetry.enable()
+    search("chat bubble")
+    print(telemetry.format_report())        # 或 telemetry.report() 获取 dict
+
+    # Forward finished spans to the host's own telemetry
+    telemetry.add_hook(lambda span: tracer.record(span.name, span.start, span.duration, span.attrs))
+"""
+
+import threading
+import time
+from functools import wraps
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# ============ STATE ============
+enabled = False
+
+_lock = threading.Lock()
+_local = threading.local()
+_hooks: List[Callable[["Span"], None]] = []
+# path (tuple of span names) -> [calls, total seconds, max seconds]
+_spans: Dict[Tuple[str, ...], List[float]] = {}
+_counters: Dict[str, int] = {}
+_started = time.perf_counter()
+
+
+class Span:
+    """A timed stage; hooks receive it once it has finished"""
+
+    __slots__ = ("name", "path", "attrs", "start", "duration", "thread")
+
+    def __init__(self, name: str, attrs: Dict[str, Any]):
+        self.name = name
+        self.attrs = attrs
+        self.path: Tuple[str, ...] = ()
+        self.start = 0.0
+        self.duration = 0.0
+        self.thread = threading.get_ident()
+
+    def __enter__(self) -> "Span":
+        stack = getattr(_local, "stack", None)
+        if stack is None:
+            stack = _local.stack = []
+        stack.append(self.name)
+        self.path = tuple(stack)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.duration = time.perf_counter() - self.start
+        _local.stack.pop()
+        with _lock:
+            record = _spans.get(self.path)
+            if record is None:
+                _spans[self.path] = [1, self.duration, self.duration]
+            else:
+                record[0] += 1
+                record[1] += self.duration
+                if self.duration > record[2]:
+                    record[2] = self.duration
+            hooks = list(_hooks)
+        for hook in hooks:
+            hook(self)
+
+
+class _NullSpan:
+    """Returned by span() while telemetry is disabled"""
+
+    __slots__ = ()
+
+    def __enter__(self) -> "_NullSpan":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        return None
+
+
+_NULL_SPAN = _NullSpan()
+
+
+# ============ RECORDING ============
+def span(name: str, **attrs) -> Any:
+    """Context manager timing one stage: `with telemetry.span("bm25.fit", docs=n): ...`"""
+    return Span(name, attrs) if enabled else _NULL_SPAN
+
+
+def traced(name: str) -> Callable:
+    """Decorator recording every call of a function as a span"""
+    def decorate(fn: Callable) -> Callable:
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not enabled:
+                return fn(*args, **kwargs)
+            with Span(name, {}):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def count(name: str, n: int = 1) -> None:
+    """Add n to a counter (no-op while disabled)"""
+    if enabled:
+        with _lock:
+            _counters[name] = _counters.get(name, 0) + n
+
+
+# ============ CONTROL ============
+def enable() -> None:
+    """Start recording spans and counters (keeps what was recorded so far)"""
+    global enabled
+    enabled = True
+
+
+def disable() -> None:
+    global enabled
+    enabled = False
+
+
+def reset() -> None:
+    """Forget recorded spans and counters and restart the wall clock"""
+    global _started
+    with _lock:
+        _spans.clear()
+        _counters.clear()
+        _started = time.perf_counter()
+
+
+def add_hook(hook: Callable[[Span], None]) -> None:
+    """Call hook(span) for every finished span; enables telemetry.
+
+    Hooks run synchronously on the thread that closed the span, so they
+    should hand the span off rather than do slow work themselves.
+    """
+    with _lock:
+        _hooks.append(hook)
+    enable()
+
+
+def remove_hook(hook: Callable[[Span], None]) -> None:
+    with _lock:
+        if hook in _hooks:
+            _hooks.remove(hook)
+
+
+# ============ REPORTING ============
+def report() -> Dict[str, Any]:
+    """Recorded spans (as a call tree, in first-seen order) and counters.
+
+    Returns:
+        {"wall_ms", "spans": [{"path", "name", "depth", "calls", "total_ms",
+        "self_ms", "max_ms"}], "counters": {name: value}}; wall_ms is the
+        time since this module was imported (or last reset), imports included
+    """
+    with _lock:
+        spans = {path: list(record) for path, record in _spans.items()}
+        counters = dict(_counters)
+        wall = time.perf_counter() - _started
+
+    child_time: Dict[Tuple[str, ...], float] = {}
+    for path, record in spans.items():
+        if len(path) > 1:
+            child_time[path[:-1]] = child_time.get(path[:-1], 0.0) + record[1]
+
+    # Depth-first order so that children follow their parent
+    children: Dict[Tuple[str, ...], List[Tuple[str, ...]]] = {}
+    for path in spans:
+        children.setdefault(path[:-1], []).append(path)
+    ordered: List[Tuple[str, ...]] = []
+    pending = list(reversed(children.get((), [])))
+    while pending:
+        path = pending.pop()
+        ordered.append(path)
+        pending.extend(reversed(children.get(path, [])))
+    # Spans whose parent never finished (still open) are listed last
+    seen = set(ordered)
+    ordered += [path for path in spans if path not in seen]
+
+    return {
+        "wall_ms": wall * 1000,
+        "spans": [{
+            "path": "/".join(path),
+            "name": path[-1],
+            "depth": len(path) - 1,
+            "calls": int(spans[path][0]),
+            "total_ms": spans[path][1] * 1000,
+            "self_ms": (spans[path][1] - child_time.get(path, 0.0)) * 1000,
+            "max_ms": spans[path][2] * 1000,
+        } for path in ordered],
+        "counters": counters,
+    }
+
+
+def format_report(data: Optional[Dict[str, Any]] = None) -> str:
+    """Text breakdown of report(): an indented span tree plus counters"""
+    data = data or report()
+    lines = [f"Timings (wall {data['wall_ms']:.1f} ms)",
+             f"  {'span':<44}{'calls':>7}{'total ms':>11}{'self ms':>10}{'max ms':>10}"]
+    for s in data["spans"]:
+        label = "  " * s["depth"] + s["name"]
+        lines.append(f"  {label:<44}{s['calls']:>7}{s['total_ms']:>11.2f}{s['self_ms']:>10.2f}{s['max_ms']:>10.2f}")
+    if data["counters"]:
+        lines.append("Counters: " + ", ".join(f"{k}={v}" for k, v in sorted(data["counters"].items())))
+    return "\n".join(lines)
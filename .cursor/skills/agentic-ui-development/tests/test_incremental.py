@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Incremental index updates must rank exactly like a fresh build of the same CSV.
+
+Usage:
+    python -m pytest .cursor/skills/agentic-ui-development/tests   # 回归测试
+"""
+
+import csv
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+import core
+import segments
+from segments import SegmentedBM25
+
+CONFIG = core.CSV_CONFIG["component"]
+QUERIES = ["对话气泡", "chat bubble", "bubble", "editor", "思维链 thinking", "markdown editor"]
+
+
+def _write(path: Path, rows):
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=CONFIG["output_cols"])
+        writer.writeheader()
+        writer.writerows(rows)
+    # Distinct mtimes even within one filesystem tick
+    stamp = getattr(_write, "stamp", 1_700_000_000_000_000_000) + 10 ** 9
+    _write.stamp = stamp
+    os.utime(path, ns=(stamp, stamp))
+
+
+def _row(i: int, name: str, keywords: str, description: str):
+    return {"id": f"c{i}", "name": name, "name_cn": "对话气泡" if "bubble" in keywords else "编辑器",
+            "category": "chat", "keywords": keywords, "source_path": f"src/{name}",
+            "description": description, "props_summary": ""}
+
+
+def _catalog():
+    # Many rows share their searchable text, so most queries end in tied scores
+    rows = []
+    for i in range(120):
+        if i % 3 == 0:
+            rows.append(_row(i, "Bubble", "chat, bubble", "Chat bubble for messages"))
+        elif i % 3 == 1:
+            rows.append(_row(i, "Editor", "markdown, editor", "Markdown editor"))
+        else:
+            rows.append(_row(i, "Thought", "thinking, chain", "思维链 thinking chain"))
+    return rows
+
+
+def _search(path: Path, query: str):
+    return core._search_csv(path, CONFIG["search_cols"], CONFIG["output_cols"], query, 10)
+
+
+def test_update_matches_fresh_build(tmp_path, monkeypatch):
+    monkeypatch.setattr(segments, "MERGE_IN_BACKGROUND", False)
+    path = tmp_path / CONFIG["file"]
+    rows = _catalog()
+    _write(path, rows)
+    core.invalidate()
+    for query in QUERIES:
+        _search(path, query)
+
+    # Edit early tied rows (they get doc ids after every other row), delete some, append some
+    rows[0] = dict(rows[0], description="Chat bubble for streamed messages")
+    rows[3] = dict(rows[3], keywords="chat, bubble, avatar")
+    del rows[6:9]
+    rows.insert(1, _row(500, "Bubble", "chat, bubble", "Chat bubble for messages"))
+    rows.append(_row(501, "Editor", "markdown, editor", "Markdown editor"))
+    _write(path, rows)
+
+    updated = {query: _search(path, query) for query in QUERIES}
+    batched = core._search_csv_many(path, CONFIG["search_cols"], CONFIG["output_cols"], QUERIES, 10)
+    index = core._domain_index(path, CONFIG["search_cols"])
+    assert isinstance(index.bm25, SegmentedBM25), "expected an incremental update, not a rebuild"
+
+    core.invalidate()
+    for query, batch in zip(QUERIES, batched):
+        fresh = [(r["id"], round(r["_score"], 9)) for r in _search(path, query)]
+        assert [(r["id"], round(r["_score"], 9)) for r in updated[query]] == fresh, query
+        assert [(r["id"], round(r["_score"], 9)) for r in batch] == fresh, query